@@ -5,6 +5,7 @@ import pulumi_aws as aws
 import pulumi_aws.ec2 as ec2
 import pulumi_aws.lb as lb
 from strongmind_deployment import vpc
+from strongmind_deployment.invoke_cache import cached_invoke
 from strongmind_deployment.util import qualify_component_name
 
 
@@ -70,7 +71,8 @@ class Alb(pulumi.ComponentResource):
         if args.subnets:
             self.subnet_ids = args.subnets
         else:
-            self.subnet_ids: Sequence[str] = vpc.VpcComponent.get_subnets(vpc_id=args.vpc_id, placement=args.placement)
+            self.subnet_ids: pulumi.Output[Sequence[str]] = vpc.VpcComponent.get_subnets(vpc_id=args.vpc_id,
+                                                                                      placement=self.subnet_placement)
         stack = pulumi.get_stack()
         project = pulumi.get_project()[:18]
         self.namespace = args.namespace or f"{project}-{stack}"
@@ -112,7 +114,7 @@ class Alb(pulumi.ComponentResource):
 
         self.add_ingress_rules_to_security_group(security_group=alb_security_group)
 
-        current = aws.get_caller_identity()
+        current = cached_invoke(aws.get_caller_identity)
 
         alb = lb.LoadBalancer(
             self.namespace,
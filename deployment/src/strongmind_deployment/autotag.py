@@ -1,10 +1,10 @@
 # thanks to joeduffy: https://github.com/joeduffy/aws-tags-example/tree/master/autotag-py
 
 import os
-from strongmind_deployment.taggable import is_taggable
+from strongmind_deployment.taggable import TagShape, tag_shape
 import pulumi
-import subprocess
 
+from strongmind_deployment.context import get_project_context
 from strongmind_deployment.operations import get_code_owner_team_name
 
 
@@ -43,7 +43,7 @@ class StandardTags:
 def get_standard_tags(extra_tags:dict):
     """
     Use this entrypoint if you need the tags, and auto-tagging isn't working for you.
-    This is useful for resources that need a different tagging format, like AutoScalingGroups
+    This is useful for resources that need a different tagging format, like launch template tag specifications
     merges the dictionary of tags and sets standard tags here
     """
     standard_tags = StandardTags(extra_tags)
@@ -94,13 +94,7 @@ def get_repo_name():
     Get the repository name from the current git repository.
     """
     try:
-        result = subprocess.run(
-            ["basename $(git rev-parse --show-toplevel)"],
-            capture_output=True,
-            text=True,
-            shell=True,
-        )
-        return f"{result.stdout.strip()}"
+        return os.path.basename(get_project_context().repo_root)
     except Exception as e:
         print(
             f"ERROR fetching git repository. Please set this in 'add_standard_billing_tags': {e}"
@@ -108,29 +102,64 @@ def get_repo_name():
         return "notset"
 
 
-# registerAutoTags registers a global stack transformation that merges a set
+# registerAutoTags registers a global resource transform that merges a set
 # of tags with whatever was also explicitly added to the resource definition.
 def register_auto_tags(auto_tags: dict):
     pulumi.log.info(f"Resources will be tagged with: {auto_tags}")
-    pulumi.runtime.register_stack_transformation(lambda args: auto_tag(args, auto_tags))
-
+    pulumi.runtime.register_resource_transform(lambda args: auto_tag(args, auto_tags))
 
-def auto_tag(args, auto_tags):
-    if is_taggable(args.type_):
-        # Ensure that the "tags" property is set in args.props
-        existing_tags = args.props.get("tags", {}) or {}
 
-        # Check if auto_tags is not None and is a dictionary before processing
-        if auto_tags and isinstance(auto_tags, dict):
-            # Check if any of the auto_tags already exist in the resource's tags
-            new_tags = {k: v for k, v in auto_tags.items() if k not in existing_tags}
+def auto_tag(args: pulumi.ResourceTransformArgs, auto_tags: dict):
+    shape = tag_shape(args.type_)
+    if shape is None:
+        # If resources aren't in the taggable index they will be skipped.
+        # If you want to know if there are resources that are not being tagged,
+        # you can enable this environment variable and you will see a list of resources that this process isn't tagging.
+        if os.getenv("DEBUG_LOG_UNTAGGED_RESOURCES", False):
+            print(f"Skipping auto-tagging for {args.type_}")
+        return None
 
-            args.props["tags"] = {**(existing_tags), **new_tags}
+    # Check if auto_tags is not None and is a dictionary before processing
+    if not auto_tags or not isinstance(auto_tags, dict):
+        return None
 
-        return pulumi.ResourceTransformationResult(args.props, args.opts)
-    # If resources aren't in the taggable list they will be skipped. 
-    # If you want to know if there are resources that are not being tagged, 
-    # you can enable this environment variable and you will see a list of resources that this process isn't tagging.
+    existing_tags = args.props.get("tags")
+    if shape == TagShape.KEY_VALUE_LIST:
+        tags = merge_key_value_list_tags(existing_tags or [], auto_tags)
     else:
-       if os.getenv("DEBUG_LOG_UNTAGGED_RESOURCES", False):
-            print(f"Skipping auto-tagging for {args.type_}")
+        tags = merge_map_tags(existing_tags or {}, auto_tags)
+
+    # Leave the resource alone when it already has every tag, so we don't copy its properties for nothing.
+    if tags is None:
+        return None
+    return pulumi.ResourceTransformResult({**args.props, "tags": tags}, args.opts)
+
+
+def merge_map_tags(existing_tags, auto_tags: dict):
+    """
+    Add the auto tags that aren't already set. Tags set on the resource win.
+    Returns None when nothing needs to change.
+    """
+    if not isinstance(existing_tags, dict):
+        # the tags are still unknown, so there is nothing we can safely merge into
+        return None
+    if not existing_tags:
+        return dict(auto_tags)
+    if auto_tags.keys() <= existing_tags.keys():
+        return None
+    return {**auto_tags, **existing_tags}
+
+
+def merge_key_value_list_tags(existing_tags, auto_tags: dict):
+    """
+    Add the auto tags that aren't already set to a list of `{key, value, propagateAtLaunch}` tags,
+    propagating them to launched instances. Returns None when nothing needs to change.
+    """
+    if not isinstance(existing_tags, list):
+        return None
+    existing_keys = {tag.get("key") for tag in existing_tags if isinstance(tag, dict)}
+    new_tags = [{"key": key, "value": value, "propagateAtLaunch": True}
+                for key, value in auto_tags.items() if key not in existing_keys]
+    if not new_tags:
+        return None
+    return existing_tags + new_tags
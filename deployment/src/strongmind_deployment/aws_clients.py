@@ -0,0 +1,30 @@
+import threading
+
+import boto3
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client(service_name: str, region_name: str = None):
+    """
+    Returns a boto3 client for the service and region, shared across the program. Without a region the client
+    follows the session's, as `boto3.client` does.
+
+    Building a client loads the service model and credential chain, which is slow enough to show up
+    when several components each create their own. boto3 clients are thread safe once built, so one
+    per service and region is enough.
+    """
+    key = (service_name, region_name)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = boto3.client(service_name, region_name=region_name)
+        return _clients[key]
+
+
+def reset_clients():
+    """
+    Forgets every pooled client, e.g. after credentials or mocks change.
+    """
+    with _lock:
+        _clients.clear()
@@ -2,10 +2,11 @@ import pulumi
 import pulumi_aws as aws
 import json
 import os
-import subprocess
 from pulumi_aws import cloudwatch
 import sys
+from strongmind_deployment.context import get_project_context
 from strongmind_deployment.secrets import SecretsComponent
+from strongmind_deployment.util import CpuArchitecture
 
 class BatchComponent(pulumi.ComponentResource):
     def __init__(self, name, **kwargs):
@@ -19,6 +20,7 @@ class BatchComponent(pulumi.ComponentResource):
         self.command = self.kwargs.get('command', ["echo", "hello world"])
         self.cron = self.kwargs.get('cron', 'cron(0 0 * * ? *)')
         self.secrets = self.kwargs.get('secrets', [])
+        self.cpu_architecture = CpuArchitecture(self.kwargs.get('cpu_architecture', CpuArchitecture.X86_64))
 
 
         stack = pulumi.get_stack()
@@ -27,25 +29,12 @@ class BatchComponent(pulumi.ComponentResource):
         project = pulumi.get_project()
         self.project_stack = f"{project}-{stack}"
 
-        git_root = subprocess.check_output(['git', 'rev-parse', '--show-toplevel'], cwd=".").decode('utf-8').strip()
-        with open(f'{git_root}/CODEOWNERS', 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
+        tags = get_project_context().tags
 
-        tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
-
-        default_vpc = aws.ec2.get_vpc(default="true")
-
-        default_vpc = aws.ec2.get_vpc(default=True)
-        security_group  = aws.ec2.get_security_group(name="default", vpc_id=default_vpc.id)
-        default_sec_group = []
-        default_sec_group.append(security_group.id) 
-        default_subnets = aws.ec2.get_subnets(filters=[aws.ec2.GetSubnetsFilterArgs(
+        default_vpc = aws.ec2.get_vpc_output(default=True)
+        security_group = aws.ec2.get_security_group_output(name="default", vpc_id=default_vpc.id)
+        default_sec_group = [security_group.id]
+        default_subnets = aws.ec2.get_subnets_output(filters=[aws.ec2.GetSubnetsFilterArgs(
             name="vpc-id",
             values=[default_vpc.id]
         )])
@@ -158,7 +147,8 @@ class BatchComponent(pulumi.ComponentResource):
             execution_role=self.execution_role.arn,
             secretsList=secretsList,
             logGroup=self.logGroup.id,
-            region=region
+            region=region,
+            cpu_architecture=self.cpu_architecture.value,
         ).apply(lambda args: json.dumps( {
             "command": args["command"],
             "image": args["CONTAINER_IMAGE"],
@@ -170,6 +160,10 @@ class BatchComponent(pulumi.ComponentResource):
             "jobRoleArn": args["execution_role"],
             "networkConfiguration":
                 {"assignPublicIp": "ENABLED"},
+            "runtimePlatform": {
+                "cpuArchitecture": args["cpu_architecture"],
+                "operatingSystemFamily": "LINUX"
+            },
             "logConfiguration": {
                 "logDriver": "awslogs",
                 "options": {
@@ -0,0 +1,84 @@
+import math
+from typing import Optional
+
+DEFAULT_HEADROOM = 0.25
+# Each scale-out step adds this share of the maximum, so big services don't crawl up one task at a time
+SMALL_STEP_SHARE = 0.05
+LARGE_STEP_SHARE = 0.15
+
+
+class CapacityPlan:
+    """
+    Scaling limits worked out from measured throughput instead of fixed numbers.
+
+    :param per_task: The throughput one task sustains, e.g. from a load test.
+    :param peak: The throughput expected at the busiest time.
+    :param baseline: The throughput that is always there, which sets the minimum capacity. Defaults to None
+        (the component's own minimum).
+    :param headroom: Spare capacity to plan for on top of the throughput, as a fraction. Defaults to 0.25.
+    :param unit: What the throughput is measured in, for the summary.
+    """
+    def __init__(self, per_task: float, peak: float, baseline: float = None, headroom: float = DEFAULT_HEADROOM,
+                 unit: str = "requests/sec"):
+        if not per_task or per_task <= 0:
+            raise ValueError("A capacity plan needs a positive per-task throughput")
+        if not peak or peak <= 0:
+            raise ValueError("A capacity plan needs a positive peak throughput")
+        if baseline is not None and baseline > peak:
+            raise ValueError("A capacity plan's baseline throughput cannot be above its peak")
+        if headroom < 0:
+            raise ValueError("A capacity plan's headroom cannot be negative")
+        self.per_task = per_task
+        self.peak = peak
+        self.baseline = baseline
+        self.headroom = headroom
+        self.unit = unit
+
+    @classmethod
+    def for_web(cls, plan: Optional[dict]) -> Optional["CapacityPlan"]:
+        """
+        Reads `{"per_task_rps", "peak_rps", "baseline_rps", "headroom"}`.
+        """
+        if not plan:
+            return None
+        return cls(plan.get("per_task_rps"), plan.get("peak_rps"), plan.get("baseline_rps"),
+                   plan.get("headroom", DEFAULT_HEADROOM), unit="requests/sec")
+
+    @classmethod
+    def for_worker(cls, plan: Optional[dict]) -> Optional["CapacityPlan"]:
+        """
+        Reads `{"per_task_jobs_per_second", "peak_jobs_per_second", "baseline_jobs_per_second", "headroom"}`.
+        """
+        if not plan:
+            return None
+        return cls(plan.get("per_task_jobs_per_second"), plan.get("peak_jobs_per_second"),
+                   plan.get("baseline_jobs_per_second"), plan.get("headroom", DEFAULT_HEADROOM), unit="jobs/sec")
+
+    def tasks_for(self, throughput: float) -> int:
+        return math.ceil(throughput * (1 + self.headroom) / self.per_task)
+
+    def min_capacity(self, floor: int) -> int:
+        if self.baseline is None:
+            return floor
+        return max(floor, self.tasks_for(self.baseline))
+
+    def max_capacity(self, floor: int) -> int:
+        return max(self.tasks_for(self.peak), self.min_capacity(floor))
+
+    def scale_out_steps(self, floor: int):
+        """
+        :return: The small and large scale-out adjustments, as a share of the maximum capacity.
+        """
+        max_capacity = self.max_capacity(floor)
+        small = max(1, math.ceil(max_capacity * SMALL_STEP_SHARE))
+        large = max(small, math.ceil(max_capacity * LARGE_STEP_SHARE))
+        return small, large
+
+    def summary(self, name: str, floor: int) -> str:
+        small, large = self.scale_out_steps(floor)
+        min_capacity = self.min_capacity(floor)
+        max_capacity = self.max_capacity(floor)
+        return (f"{name} capacity plan: {min_capacity}-{max_capacity} tasks at {self.per_task:g} {self.unit} each "
+                f"for a {self.peak:g} {self.unit} peak with {self.headroom:.0%} headroom "
+                f"(serves up to {max_capacity * self.per_task:g} {self.unit}); "
+                f"scales out by {small} or {large} tasks")
@@ -0,0 +1,86 @@
+from typing import List, Optional
+
+import pulumi
+import pulumi_aws as aws
+
+from strongmind_deployment.util import qualify_component_name
+
+FARGATE = "FARGATE"
+FARGATE_SPOT = "FARGATE_SPOT"
+FARGATE_CAPACITY_PROVIDERS = [FARGATE, FARGATE_SPOT]
+
+# One on-demand task always runs so the queue keeps draining through a Spot reclaim; burst capacity above that
+# is three parts Spot to one part on-demand. A preset to pass as worker_capacity_provider_strategy; workers stay
+# on-demand unless they opt in.
+WORKER_CAPACITY_PROVIDER_STRATEGY = [
+    {"capacity_provider": FARGATE, "base": 1, "weight": 1},
+    {"capacity_provider": FARGATE_SPOT, "weight": 3},
+]
+
+
+def create_cluster_capacity_providers(parent_component, cluster: aws.ecs.Cluster, kwargs):
+    """
+    Registers FARGATE and FARGATE_SPOT with the cluster. Services without their own strategy keep running on
+    on-demand Fargate.
+    """
+    return aws.ecs.ClusterCapacityProviders(
+        qualify_component_name("cluster-capacity-providers", kwargs),
+        cluster_name=cluster.name,
+        capacity_providers=FARGATE_CAPACITY_PROVIDERS,
+        default_capacity_provider_strategies=[
+            aws.ecs.ClusterCapacityProvidersDefaultCapacityProviderStrategyArgs(
+                capacity_provider=FARGATE,
+                weight=1,
+            ),
+        ],
+        opts=pulumi.ResourceOptions(parent=parent_component),
+    )
+
+
+def capacity_provider_strategy(strategy) -> Optional[List[dict]]:
+    """
+    Validates a `capacity_provider_strategy` kwarg: a list of `{"capacity_provider", "base", "weight"}` entries.
+
+    :return: The strategy with `base` and `weight` filled in, or None to run on the FARGATE launch type.
+    """
+    if not strategy:
+        return None
+    normalized = []
+    for entry in strategy:
+        if entry.get("capacity_provider") not in FARGATE_CAPACITY_PROVIDERS:
+            raise ValueError(f"Capacity provider must be one of {', '.join(FARGATE_CAPACITY_PROVIDERS)}, "
+                             f"not {entry.get('capacity_provider')!r}")
+        normalized.append({
+            "capacity_provider": entry["capacity_provider"],
+            "base": entry.get("base", 0),
+            "weight": entry.get("weight", 0),
+        })
+    if len([entry for entry in normalized if entry["base"]]) > 1:
+        raise ValueError("Only one capacity provider in a strategy can have a base")
+    if not any(entry["weight"] for entry in normalized):
+        raise ValueError("A capacity provider strategy needs at least one provider with a weight")
+    return normalized
+
+
+def use_capacity_provider_strategy(strategy: List[dict]):
+    """
+    A resource transform that moves the ECS service inside an awsx FargateService from the FARGATE launch type
+    onto `strategy`, since FargateService always sets a launch type and has no strategy argument.
+
+    ECS cannot switch an existing service between a launch type and a strategy in place, so the service is
+    replaced, deleting the old one first because the name is fixed. Until the new service's tasks start, none
+    run, and the new service starts at its desired_count rather than wherever autoscaling had it.
+    """
+    def transform(args: pulumi.ResourceTransformArgs):
+        if args.type_ != "aws:ecs/service:Service":
+            return None
+        props = {key: value for key, value in args.props.items() if key != "launchType"}
+        props["capacityProviderStrategies"] = [
+            {"capacityProvider": entry["capacity_provider"], "base": entry["base"], "weight": entry["weight"]}
+            for entry in strategy
+        ]
+        props["forceNewDeployment"] = True
+        opts = pulumi.ResourceOptions.merge(args.opts, pulumi.ResourceOptions(delete_before_replace=True))
+        return pulumi.ResourceTransformResult(props, opts)
+
+    return transform
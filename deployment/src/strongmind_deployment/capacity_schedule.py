@@ -0,0 +1,200 @@
+import json
+from typing import List, Optional, Tuple
+
+import pulumi
+import pulumi_aws as aws
+
+from strongmind_deployment.util import qualify_component_name
+
+DEFAULT_TIMEZONE = "UTC"
+SCALABLE_KEYS = ("web", "worker", "database")
+
+
+class CapacityWindow:
+    """
+    A recurring window where capacity is raised ahead of expected traffic, such as the school day.
+
+    Each window is a dictionary in the `capacity_schedule` kwarg:
+
+        {
+            "name": "school-day",
+            "start": "cron(0 7 ? * MON-FRI *)",
+            "end": "cron(0 16 ? * MON-FRI *)",
+            "timezone": "America/Phoenix",
+            "from": "2025-08-01T00:00:00Z",     # optional, e.g. the start of term
+            "until": "2026-05-29T00:00:00Z",    # optional, e.g. the end of term
+            "web": {"min": 6, "max": 100},
+            "worker": {"min": 3},
+            "database": {"min": 4},             # Aurora Serverless v2 ACU floor
+            "worker-critical": {"min": 4},      # a worker pool, see worker_pools.WorkerPool
+        }
+
+    At `start` the listed targets move to the window's capacity, and at `end` they go back to the component's
+    normal capacity. Targets that are not listed are left alone.
+    """
+    def __init__(self, name: str, start: str, end: str, timezone: str = DEFAULT_TIMEZONE,
+                 starts_on: Optional[str] = None, ends_on: Optional[str] = None, capacities: dict = None):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.timezone = timezone
+        self.starts_on = starts_on
+        self.ends_on = ends_on
+        self.capacities = capacities or {}
+
+    @classmethod
+    def from_dict(cls, window: dict) -> "CapacityWindow":
+        for key in ("name", "start", "end"):
+            if not window.get(key):
+                raise ValueError(f"Capacity window {window} needs a '{key}'")
+        capacities = {key: capacity for key, capacity in window.items()
+                      if key in SCALABLE_KEYS or key.startswith("worker-")}
+        for key, capacity in capacities.items():
+            if not {"min", "max"} & set(capacity):
+                raise ValueError(f"Capacity window '{window['name']}' needs a min or max for {key}")
+            if capacity.get("max") is not None and capacity.get("min", 0) > capacity["max"]:
+                raise ValueError(f"Capacity window '{window['name']}' has a {key} min above its max")
+        return cls(window["name"], window["start"], window["end"],
+                   timezone=window.get("timezone", DEFAULT_TIMEZONE),
+                   starts_on=window.get("from"),
+                   ends_on=window.get("until"),
+                   capacities=capacities)
+
+    def capacity_for(self, key: str) -> Optional[dict]:
+        return self.capacities.get(key)
+
+    def capacity_range(self, key: str, base_min, base_max) -> Tuple:
+        """
+        The min and max `key` moves to at the start of the window, falling back to the component's own for a
+        bound the window leaves out.
+        """
+        capacity = self.capacity_for(key)
+        min_capacity, max_capacity = capacity.get("min", base_min), capacity.get("max", base_max)
+        if min_capacity > max_capacity:
+            raise ValueError(f"Capacity window '{self.name}' would set the {key} min to {min_capacity}, "
+                             f"above its max of {max_capacity}")
+        return min_capacity, max_capacity
+
+
+def capacity_windows(kwargs) -> List[CapacityWindow]:
+    return [CapacityWindow.from_dict(window) for window in kwargs.get("capacity_schedule") or []]
+
+
+def database_capacity_windows(kwargs) -> List[CapacityWindow]:
+    return [window for window in capacity_windows(kwargs) if window.capacity_for("database")]
+
+
+def create_scheduled_actions(key: str,
+                             target: aws.appautoscaling.Target,
+                             base_min: int,
+                             base_max: int,
+                             namespace: str,
+                             kwargs: dict,
+                             parent: pulumi.Resource) -> List[aws.appautoscaling.ScheduledAction]:
+    """
+    Create a pair of scheduled actions on `target` for every window in `capacity_schedule` that mentions `key`:
+    one that raises capacity at the start of the window and one that restores `base_min`/`base_max` at the end.
+    """
+    actions = []
+    for window in capacity_windows(kwargs):
+        if not window.capacity_for(key):
+            continue
+        for edge, schedule, (min_capacity, max_capacity) in (
+                ("start", window.start, window.capacity_range(key, base_min, base_max)),
+                ("end", window.end, (base_min, base_max))):
+            actions.append(aws.appautoscaling.ScheduledAction(
+                qualify_component_name(f"{key}-{window.name}-{edge}-scheduled-action", kwargs),
+                name=f"{namespace}-{key}-{window.name}-{edge}",
+                resource_id=target.resource_id,
+                scalable_dimension=target.scalable_dimension,
+                service_namespace=target.service_namespace,
+                schedule=schedule,
+                timezone=window.timezone,
+                start_time=window.starts_on,
+                end_time=window.ends_on,
+                scalable_target_action=aws.appautoscaling.ScheduledActionScalableTargetActionArgs(
+                    min_capacity=min_capacity,
+                    max_capacity=max_capacity,
+                ),
+                opts=pulumi.ResourceOptions(parent=parent, depends_on=[target]),
+            ))
+    return actions
+
+
+def create_database_schedules(cluster: aws.rds.Cluster,
+                              base_min: float,
+                              base_max: float,
+                              namespace: str,
+                              kwargs: dict,
+                              tags: dict,
+                              parent: pulumi.Resource) -> List[aws.scheduler.Schedule]:
+    """
+    Raise the Aurora Serverless v2 ACU floor for every window in `capacity_schedule` that mentions the database.
+
+    Application Auto Scaling cannot schedule serverless v2 capacity, so EventBridge Scheduler calls
+    rds:ModifyDBCluster directly at the start and end of each window. The cluster must ignore changes to its
+    serverlessv2ScalingConfiguration, or the next deploy inside a window would put the floor back down; `base_min`
+    and `base_max` then reach the cluster at the end of the next window rather than on deploy.
+    """
+    windows = database_capacity_windows(kwargs)
+    if not windows:
+        return []
+    ranges = [window.capacity_range("database", base_min, base_max) for window in windows]
+
+    role = aws.iam.Role(
+        qualify_component_name("database-capacity-schedule-role", kwargs),
+        name=f"{namespace}-db-capacity-schedule",
+        assume_role_policy=json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Effect": "Allow",
+                "Principal": {"Service": "scheduler.amazonaws.com"},
+                "Action": "sts:AssumeRole",
+            }],
+        }),
+        tags=tags,
+        opts=pulumi.ResourceOptions(parent=parent),
+    )
+    aws.iam.RolePolicy(
+        qualify_component_name("database-capacity-schedule-policy", kwargs),
+        role=role.id,
+        policy=cluster.arn.apply(lambda arn: json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Effect": "Allow",
+                "Action": "rds:ModifyDBCluster",
+                "Resource": arn,
+            }],
+        })),
+        opts=pulumi.ResourceOptions(parent=parent),
+    )
+
+    schedules = []
+    for window, window_range in zip(windows, ranges):
+        for edge, expression, (min_capacity, max_capacity) in (
+                ("start", window.start, window_range),
+                ("end", window.end, (base_min, base_max))):
+            schedules.append(aws.scheduler.Schedule(
+                qualify_component_name(f"database-{window.name}-{edge}-schedule", kwargs),
+                name=f"{namespace}-db-{window.name}-{edge}",
+                schedule_expression=expression,
+                schedule_expression_timezone=window.timezone,
+                start_date=window.starts_on,
+                end_date=window.ends_on,
+                flexible_time_window=aws.scheduler.ScheduleFlexibleTimeWindowArgs(mode="OFF"),
+                target=aws.scheduler.ScheduleTargetArgs(
+                    arn="arn:aws:scheduler:::aws-sdk:rds:modifyDBCluster",
+                    role_arn=role.arn,
+                    input=cluster.cluster_identifier.apply(
+                        lambda identifier, min_capacity=min_capacity, max_capacity=max_capacity: json.dumps({
+                            "DbClusterIdentifier": identifier,
+                            "ApplyImmediately": True,
+                            "ServerlessV2ScalingConfiguration": {
+                                "MinCapacity": min_capacity,
+                                "MaxCapacity": max_capacity,
+                            },
+                        })),
+                ),
+                opts=pulumi.ResourceOptions(parent=parent, depends_on=[cluster]),
+            ))
+    return schedules
@@ -3,6 +3,8 @@ import pulumi_aws as aws
 from pulumi_cloudflare import get_zone, Record
 from pulumi import Output
 from strongmind_deployment.storage import StorageComponent
+from strongmind_deployment.context import get_project_context
+from strongmind_deployment.invoke_cache import cached_invoke
 import re
 import os
 
@@ -68,19 +70,10 @@ class DistributionComponent(pulumi.ComponentResource):
         self.env_name = os.environ.get('ENVIRONMENT_NAME', 'stage')
         project = pulumi.get_project()
         stack = pulumi.get_stack()
-        with open('../CODEOWNERS', 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        self.tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+        self.tags = get_project_context().tags
 
         self.dns()
-        cache_policy = aws.cloudfront.get_cache_policy(name="Managed-CachingOptimized")
+        cache_policy = cached_invoke(aws.cloudfront.get_cache_policy, name="Managed-CachingOptimized")
         self.distribution = aws.cloudfront.Distribution(f"{fqdn_prefix}-distribution",
           opts=pulumi.ResourceOptions(parent=self),
           enabled=True,
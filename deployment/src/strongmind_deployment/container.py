@@ -1,7 +1,7 @@
 import json
 import os
 import re
-import subprocess
+from enum import Enum
 
 import pulumi
 import pulumi_aws as aws
@@ -12,10 +12,82 @@ from pulumi_cloudflare import Record
 
 from strongmind_deployment import alb
 from strongmind_deployment import operations
-from strongmind_deployment.util import create_ecs_cluster, qualify_component_name
+from strongmind_deployment.capacity_plan import CapacityPlan
+from strongmind_deployment.capacity_providers import capacity_provider_strategy, \
+    create_cluster_capacity_providers, use_capacity_provider_strategy
+from strongmind_deployment.capacity_schedule import create_scheduled_actions
+from strongmind_deployment.context import get_project_context
+from strongmind_deployment.invoke_cache import cached_invoke
+from strongmind_deployment.predictive_scaling import PredictiveScalingConfiguration, create_predictive_scaling_policy
+from strongmind_deployment.util import CpuArchitecture, create_ecs_cluster, qualify_component_name
 from strongmind_deployment.worker_autoscale import WorkerAutoscaleComponent
 
 
+class AutoscaleMode(str, Enum):
+    """
+    How the web service scales with load.
+    """
+
+    STEP = "step"
+    """
+    Step scaling on the ALB p95 TargetResponseTime, out and in.
+    """
+    TARGET_TRACKING = "target_tracking"
+    """
+    Target tracking on request count per task and/or ECS CPU utilization.
+    """
+    TARGET_TRACKING_WITH_STEP = "target_tracking_with_step"
+    """
+    Target tracking, with the response time scale-out step policy kept as a safety net.
+    """
+
+    def __str__(self):
+        return self.value
+
+
+class RolloutProfile(str, Enum):
+    """
+    How quickly the load balancer moves traffic onto new tasks during a deploy.
+    """
+
+    STANDARD = "standard"
+    """
+    The target group defaults: a 300s drain, health checks every 30s and a 600s grace period.
+    """
+    FAST = "fast"
+    """
+    A 30s drain, health checks every 10s, a 60s slow start for new tasks and a 120s grace period.
+    """
+
+    def __str__(self):
+        return self.value
+
+
+ROLLOUT_SETTINGS = {
+    RolloutProfile.STANDARD: {
+        "deregistration_delay": 300,
+        "slow_start": 0,
+        "health_check_interval": 30,
+        "healthy_threshold": 2,
+        "unhealthy_threshold": 2,
+        "health_check_grace_period_seconds": 600,
+    },
+    RolloutProfile.FAST: {
+        "deregistration_delay": 30,
+        "slow_start": 60,
+        "health_check_interval": 10,
+        "healthy_threshold": 2,
+        "unhealthy_threshold": 3,
+        "health_check_grace_period_seconds": 120,
+    },
+}
+LOAD_BALANCING_ALGORITHMS = ["round_robin", "least_outstanding_requests"]
+# Target groups take a slow start of 0 (off) or 30 to 900 seconds
+MIN_SLOW_START = 30
+MAX_SLOW_START = 900
+CONTAINER_HEALTH_CHECK_DEFAULTS = {"interval": 10, "timeout": 5, "retries": 3, "start_period": 60}
+
+
 class ContainerComponent(pulumi.ComponentResource):
     def __init__(self, name, opts=None, **kwargs):
         """
@@ -37,6 +109,46 @@ class ContainerComponent(pulumi.ComponentResource):
         - value_from: The ARN of the secret.
         :key custom_health_check_path: The path to use for the health check. Defaults to `/up`.
         :key autoscale_threshold The amount of allowable TargetResponseTime before we scale.
+        :key autoscale_mode: An AutoscaleMode (or its value) choosing step scaling on response time, target tracking,
+            or target tracking with the response time scale-out policy as a safety net. Defaults to step.
+        :key target_requests_per_task: The ALBRequestCountPerTarget value to track. Defaults to None (not tracked).
+        :key target_cpu_utilization: The ECS average CPU utilization percentage to track. Defaults to 60, or None
+            when target_requests_per_task is set.
+        :key target_tracking_disable_scale_in: Whether target tracking should only scale out. Defaults to False.
+        :key target_tracking_scale_out_cooldown: Seconds new tasks have to warm up before target tracking scales out
+            again. Defaults to 60.
+        :key target_tracking_scale_in_cooldown: Seconds to wait after a scale-in. Defaults to 300.
+        :key capacity_schedule: A list of capacity windows that raise the "web" min/max ahead of known traffic.
+            See capacity_schedule.CapacityWindow. Defaults to `[]`.
+        :key predictive_scaling: A dictionary (or PredictiveScalingConfiguration) that adds a predictive scaling policy
+            on top of the reactive ones, e.g. `{"metric": "requests", "target_value": 1000, "mode": "ForecastAndScale"}`.
+            See predictive_scaling.PredictiveScalingConfiguration. Defaults to None.
+        :key capacity_provider_strategy: A list of `{"capacity_provider": "FARGATE" | "FARGATE_SPOT", "base": n,
+            "weight": n}` entries spreading the service's tasks across on-demand and Spot Fargate. Defaults to None
+            (on-demand only). Changing to or from a strategy replaces the ECS service.
+        :key cpu_architecture: A CpuArchitecture (or its value), "X86_64" or "ARM64" for Graviton. The container image
+            must be built for it. Defaults to X86_64.
+        :key capacity_plan: Measured throughput to derive the web min/max capacity, scale-out step sizes and the running
+            tasks alarm from, instead of the 2-100 task defaults: `{"per_task_rps": 40, "peak_rps": 1200,
+            "baseline_rps": 100, "headroom": 0.25}`. See capacity_plan.CapacityPlan. Defaults to None.
+        :key rollout_profile: A RolloutProfile (or its value) for the target group's drain, health check cadence and slow
+            start, and the service's health check grace period. Defaults to standard.
+        :key deregistration_delay: Seconds to drain a task before it is deregistered. Defaults to the rollout profile's.
+        :key slow_start: Seconds to ramp a new task up to its full share of traffic, 0 or 30 to 900. Capped at the
+            grace period, and turned off when that leaves less than 30. Defaults to the rollout profile's.
+        :key health_check_grace_period_seconds: Seconds ECS ignores failing load balancer health checks on a new task.
+            Defaults to the rollout profile's.
+        :key load_balancing_algorithm: "round_robin" or "least_outstanding_requests". The ALB cannot slow start targets
+            with least outstanding requests, so slow start is turned off with it. Defaults to "round_robin".
+        :key container_health_check: A dictionary turning on the ECS container health check, with `command`, `interval`,
+            `timeout`, `retries` and `start_period` (seconds, at most 300). Behind a load balancer `command` defaults to
+            curling the health check path, which needs curl in the image. Defaults to None (no container health check).
+            With a health check, the grace period defaults to its start_period so failing tasks are replaced quickly.
+        :key deployment_minimum_healthy_percent: The share of desired tasks kept running during a deploy. Defaults to 100.
+        :key deployment_circuit_breaker: Whether ECS stops a deploy whose tasks keep failing and rolls back to the last
+            working one. Defaults to True.
+        :key wait_for_steady_state: Whether the deploy waits for the service to reach a steady state, so that a
+            rolled-back deploy fails the update. Defaults to False.
         :key use_cloudfront: Whether to create a CloudFront distribution in front of the ALB. Defaults to False.
         """
         super().__init__('strongmind:global_build:commons:container', name, None, opts)
@@ -56,11 +168,14 @@ class ContainerComponent(pulumi.ComponentResource):
         self.cname_record = None
         self.worker_autoscaling = None
         self.ecs_cluster = kwargs.get('ecs_cluster')
+        self.cluster_capacity_providers = kwargs.get('cluster_capacity_providers')
+        self.capacity_provider_strategy = capacity_provider_strategy(kwargs.get('capacity_provider_strategy'))
         self.need_load_balancer = kwargs.get('need_load_balancer', True)
         self.container_image = kwargs.get('container_image')
         self.container_port = kwargs.get('container_port', 3000)
         self.cpu = kwargs.get('cpu', 2048)
         self.memory = kwargs.get("memory", 4096)
+        self.cpu_architecture = CpuArchitecture(kwargs.get('cpu_architecture', CpuArchitecture.X86_64))
         self.entry_point = kwargs.get('entry_point')
         self.command = kwargs.get('command')
         self.env_vars = kwargs.get('env_vars', {})
@@ -70,36 +185,51 @@ class ContainerComponent(pulumi.ComponentResource):
         self.autoscaling_target = None
         self.autoscaling_out_policy = None
         self.autoscale_threshold = kwargs.get('autoscale_threshold', 5)
+        self.autoscale_mode = AutoscaleMode(kwargs.get('autoscale_mode', AutoscaleMode.STEP))
+        self.target_requests_per_task = kwargs.get('target_requests_per_task')
+        self.target_cpu_utilization = kwargs.get('target_cpu_utilization',
+                                                 None if self.target_requests_per_task else 60)
+        self.request_count_policy = None
+        self.cpu_policy = None
+        self.autoscaling_in_policy = None
+        self.autoscaling_in_alarm = None
+        self.scheduled_actions = []
+        self.predictive_scaling = PredictiveScalingConfiguration.from_kwarg(kwargs.get('predictive_scaling'))
+        self.predictive_scaling_policy = None
         self.desired_count = kwargs.get('desired_count', 2)
         self.max_capacity = 100
         self.min_capacity = kwargs.get('desired_web_count', 2)
+        self.scale_out_steps = (1, 3)
+        self.capacity_plan = CapacityPlan.for_web(kwargs.get('capacity_plan'))
+        self.capacity_summary = None
+        if self.capacity_plan:
+            floor = self.min_capacity
+            self.capacity_summary = self.capacity_plan.summary("web", floor)
+            self.min_capacity = self.capacity_plan.min_capacity(floor)
+            self.max_capacity = self.capacity_plan.max_capacity(floor)
+            self.scale_out_steps = self.capacity_plan.scale_out_steps(floor)
         self.sns_topic_arn = kwargs.get('sns_topic_arn')
         self.binary_sns_topic_arn = os.environ.get('BINARY_SNS_TOPIC_ARN')
         self.strongmind_service_updates_topic_arn = os.environ.get('STRONGMIND_SERVICE_UPDATES_TOPIC_ARN')
         self.deployment_maximum_percent = kwargs.get('deployment_maximum_percent', 200)
         self.cloudfront_distribution = None
+        self.rollout_profile = RolloutProfile(kwargs.get('rollout_profile', RolloutProfile.STANDARD))
+        self.container_health_check = self.container_health_check_settings(kwargs)
+        self.rollout = self.rollout_settings(kwargs)
+        self.deployment_minimum_healthy_percent = kwargs.get('deployment_minimum_healthy_percent', 100)
+        self.deployment_circuit_breaker = kwargs.get('deployment_circuit_breaker', True)
 
         project = pulumi.get_project()
         self.namespace = kwargs.get('namespace', f"{project}-{stack}")
         if name != 'container':
             self.namespace = f"{self.namespace}-{name}"
 
-        path = subprocess.check_output(['git', 'rev-parse', '--show-toplevel']).decode('utf-8').strip()
-        file_path = f"{path}/CODEOWNERS"
-        with open(file_path, 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        self.tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+        self.tags = get_project_context().tags
         self.ecs_cluster_arn = kwargs.get('ecs_cluster_arn')
 
         if not self.ecs_cluster:
             self.ecs_cluster = create_ecs_cluster(self, self.namespace, self.kwargs)
+            self.cluster_capacity_providers = create_cluster_capacity_providers(self, self.ecs_cluster, self.kwargs)
 
         self.ecs_cluster_arn = self.ecs_cluster.arn
 
@@ -281,6 +411,10 @@ class ContainerComponent(pulumi.ComponentResource):
             task_role=DefaultRoleWithPolicyArgs(role_arn=self.task_role.arn),
             skip_destroy=True,
             family=self.namespace,
+            runtime_platform=aws.ecs.TaskDefinitionRuntimePlatformArgs(
+                cpu_architecture=self.cpu_architecture.value,
+                operating_system_family="LINUX",
+            ),
             container=awsx.ecs.TaskDefinitionContainerDefinitionArgs(
                 name=self.namespace,
                 log_configuration=awsx.ecs.TaskDefinitionLogConfigurationArgs(
@@ -299,7 +433,8 @@ class ContainerComponent(pulumi.ComponentResource):
                 essential=True,
                 port_mappings=port_mappings,
                 secrets=self.secrets,
-                environment=[{"name": k, "value": v} for k, v in self.env_vars.items()]
+                environment=[{"name": k, "value": v} for k, v in self.env_vars.items()],
+                health_check=self.container_health_check_args(),
             )
         )
         service_name = 'service'
@@ -310,22 +445,32 @@ class ContainerComponent(pulumi.ComponentResource):
             name=self.namespace,
             desired_count=self.desired_count,
             cluster=self.ecs_cluster_arn,
-            continue_before_steady_state=True,
+            continue_before_steady_state=not self.kwargs.get('wait_for_steady_state', False),
             assign_public_ip=True,
-            health_check_grace_period_seconds=600 if self.need_load_balancer else None,
+            health_check_grace_period_seconds=self.rollout["health_check_grace_period_seconds"]
+            if self.need_load_balancer else None,
             propagate_tags="SERVICE",
             enable_execute_command=True,
             task_definition_args=self.task_definition_args,
             deployment_maximum_percent=self.deployment_maximum_percent,
+            deployment_minimum_healthy_percent=self.deployment_minimum_healthy_percent,
+            deployment_circuit_breaker=aws.ecs.ServiceDeploymentCircuitBreakerArgs(
+                enable=self.deployment_circuit_breaker,
+                rollback=self.deployment_circuit_breaker,
+            ),
             tags=self.tags,
-            opts=pulumi.ResourceOptions(parent=self, ignore_changes=["desired_count"]),
+            opts=self.fargate_service_options(),
         )
 
         if self.kwargs.get('autoscale'):
             self.autoscaling()
         if self.kwargs.get('worker_autoscale'):
-            self.worker_autoscaling = WorkerAutoscaleComponent(qualify_component_name("worker-autoscale", self.kwargs),
+            autoscale_name = f"worker-{self.kwargs['worker_pool']}-autoscale" if self.kwargs.get('worker_pool') \
+                else "worker-autoscale"
+            self.worker_autoscaling = WorkerAutoscaleComponent(qualify_component_name(autoscale_name, self.kwargs),
                                                                fargate_service=self.fargate_service,
+                                                               ecs_cluster_name=self.ecs_cluster.name,
+                                                               ecs_service_name=self.namespace,
                                                                opts=pulumi.ResourceOptions(
                                                                    parent=self,
                                                                    depends_on=[self.fargate_service]
@@ -334,10 +479,77 @@ class ContainerComponent(pulumi.ComponentResource):
 
         self.register_outputs({})
 
+    def container_health_check_settings(self, kwargs):
+        health_check = kwargs.get('container_health_check')
+        if not health_check:
+            return None
+        settings = {**CONTAINER_HEALTH_CHECK_DEFAULTS, **health_check}
+        if not settings.get("command"):
+            if not self.need_load_balancer:
+                raise ValueError("container_health_check needs a command when there is no load balancer")
+            path = kwargs.get('custom_health_check_path', '/up')
+            settings["command"] = ["CMD-SHELL", f"curl -f http://localhost:{self.container_port}{path} || exit 1"]
+        if not 0 <= settings["start_period"] <= 300:
+            raise ValueError("container_health_check start_period must be between 0 and 300 seconds")
+        return settings
+
+    def container_health_check_args(self):
+        if not self.container_health_check:
+            return None
+        return awsx.ecs.TaskDefinitionHealthCheckArgs(
+            command=self.container_health_check["command"],
+            interval=self.container_health_check["interval"],
+            timeout=self.container_health_check["timeout"],
+            retries=self.container_health_check["retries"],
+            start_period=self.container_health_check["start_period"],
+        )
+
+    def rollout_settings(self, kwargs):
+        settings = dict(ROLLOUT_SETTINGS[self.rollout_profile])
+        if self.container_health_check:
+            # The container health check replaces bad tasks itself, so the load balancer only needs to wait
+            # for the app to start
+            settings["health_check_grace_period_seconds"] = self.container_health_check["start_period"]
+        for key in ("deregistration_delay", "slow_start", "health_check_grace_period_seconds"):
+            if kwargs.get(key) is not None:
+                settings[key] = kwargs[key]
+        if settings["slow_start"] and not MIN_SLOW_START <= settings["slow_start"] <= MAX_SLOW_START:
+            raise ValueError(f"slow_start must be 0 or between {MIN_SLOW_START} and {MAX_SLOW_START} seconds")
+
+        settings["load_balancing_algorithm"] = kwargs.get('load_balancing_algorithm', "round_robin")
+        if settings["load_balancing_algorithm"] not in LOAD_BALANCING_ALGORITHMS:
+            raise ValueError(f"load_balancing_algorithm must be one of {', '.join(LOAD_BALANCING_ALGORITHMS)}")
+        if settings["load_balancing_algorithm"] == "least_outstanding_requests":
+            settings["slow_start"] = 0
+
+        grace_period = settings["health_check_grace_period_seconds"]
+        time_to_healthy = settings["health_check_interval"] * settings["healthy_threshold"]
+        if grace_period < time_to_healthy:
+            raise ValueError(f"health_check_grace_period_seconds ({grace_period}s) is shorter than the "
+                             f"{time_to_healthy}s a new task needs to pass its health checks")
+        # A task still warming up when the grace period ends would be judged on partial traffic
+        settings["slow_start"] = min(settings["slow_start"], grace_period)
+        if settings["slow_start"] < MIN_SLOW_START:
+            settings["slow_start"] = 0
+        return settings
+
+    def fargate_service_options(self):
+        if not self.capacity_provider_strategy:
+            return pulumi.ResourceOptions(parent=self, ignore_changes=["desired_count"])
+        return pulumi.ResourceOptions(
+            parent=self,
+            ignore_changes=["desired_count"],
+            depends_on=[self.cluster_capacity_providers] if self.cluster_capacity_providers else None,
+            transforms=[use_capacity_provider_strategy(self.capacity_provider_strategy)],
+        )
+
     def autoscaling(self):
 
         fargate_service_id = self.fargate_service.service.id.apply(lambda x: x.split(":")[-1])
 
+        if self.capacity_summary:
+            pulumi.log.info(self.capacity_summary, resource=self)
+
         self.autoscaling_target = aws.appautoscaling.Target(
             qualify_component_name("autoscaling_target", self.kwargs),
             max_capacity=self.max_capacity,
@@ -350,6 +562,102 @@ class ContainerComponent(pulumi.ComponentResource):
                 depends_on=[self.fargate_service]
             ),
         )
+
+        self.scheduled_actions = create_scheduled_actions("web", self.autoscaling_target,
+                                                          self.min_capacity, self.max_capacity,
+                                                          self.namespace, self.kwargs, self)
+        self.predictive_scaling_policy = create_predictive_scaling_policy(
+            "web", self.autoscaling_target, self.predictive_scaling, self.namespace, self.kwargs, self,
+            resource_label=self.alb_resource_label() if self.need_load_balancer else None,
+        )
+
+        if self.autoscale_mode == AutoscaleMode.STEP:
+            self.step_scaling(scale_in=True)
+        else:
+            self.target_tracking_scaling()
+            if self.autoscale_mode == AutoscaleMode.TARGET_TRACKING_WITH_STEP:
+                # Only the scale-out half: scale-in is left to target tracking so the two don't fight.
+                self.step_scaling(scale_in=False)
+
+        self.running_tasks_alarm = aws.cloudwatch.MetricAlarm(
+            qualify_component_name("running_tasks_alarm", self.kwargs),
+            name=f"{self.namespace}-running-tasks-alarm",
+            comparison_operator="GreaterThanOrEqualToThreshold",
+            evaluation_periods=1,
+            metric_name="RunningTaskCount",
+            namespace="ECS/ContainerInsights",
+            dimensions={
+                "ClusterName": self.ecs_cluster.name.apply(lambda name: name),
+                "ServiceName": self.namespace
+            },
+            period=60,
+            statistic="Maximum",
+            threshold=self.max_capacity,
+            alarm_actions=[self.sns_topic_arn, self.binary_sns_topic_arn],
+            ok_actions=[self.sns_topic_arn, self.binary_sns_topic_arn],
+            alarm_description=f"Alarm when ECS service running tasks are at Max of {self.max_capacity}",
+            tags=self.tags
+        )
+
+    def alb_resource_label(self):
+        return pulumi.Output.all(self.load_balancer.arn, self.target_group.arn).apply(
+            lambda arns: f"{arns[0].split('/', 1)[1]}/{arns[1].split(':')[-1]}"
+        )
+
+    def target_tracking_scaling(self):
+        if not self.target_requests_per_task and not self.target_cpu_utilization:
+            raise ValueError("Target tracking needs target_requests_per_task or target_cpu_utilization")
+
+        def configuration(target_value, **metric):
+            return aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationArgs(
+                target_value=target_value,
+                disable_scale_in=self.kwargs.get('target_tracking_disable_scale_in', False),
+                scale_out_cooldown=self.kwargs.get('target_tracking_scale_out_cooldown', 60),
+                scale_in_cooldown=self.kwargs.get('target_tracking_scale_in_cooldown', 300),
+                predefined_metric_specification=aws.appautoscaling.
+                PolicyTargetTrackingScalingPolicyConfigurationPredefinedMetricSpecificationArgs(**metric),
+            )
+
+        if self.target_requests_per_task:
+            if not self.need_load_balancer:
+                raise ValueError("target_requests_per_task needs a load balancer")
+            self.request_count_policy = aws.appautoscaling.Policy(
+                qualify_component_name("autoscaling_request_count_policy", self.kwargs),
+                name=f"{self.namespace}-autoscaling-request-count-policy",
+                policy_type="TargetTrackingScaling",
+                resource_id=self.autoscaling_target.resource_id,
+                scalable_dimension=self.autoscaling_target.scalable_dimension,
+                service_namespace=self.autoscaling_target.service_namespace,
+                target_tracking_scaling_policy_configuration=configuration(
+                    self.target_requests_per_task,
+                    predefined_metric_type="ALBRequestCountPerTarget",
+                    resource_label=self.alb_resource_label(),
+                ),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    depends_on=[self.fargate_service]
+                )
+            )
+
+        if self.target_cpu_utilization:
+            self.cpu_policy = aws.appautoscaling.Policy(
+                qualify_component_name("autoscaling_cpu_policy", self.kwargs),
+                name=f"{self.namespace}-autoscaling-cpu-policy",
+                policy_type="TargetTrackingScaling",
+                resource_id=self.autoscaling_target.resource_id,
+                scalable_dimension=self.autoscaling_target.scalable_dimension,
+                service_namespace=self.autoscaling_target.service_namespace,
+                target_tracking_scaling_policy_configuration=configuration(
+                    self.target_cpu_utilization,
+                    predefined_metric_type="ECSServiceAverageCPUUtilization",
+                ),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    depends_on=[self.fargate_service]
+                )
+            )
+
+    def step_scaling(self, scale_in: bool):
         self.autoscaling_out_policy = aws.appautoscaling.Policy(
             qualify_component_name("autoscaling_out_policy", self.kwargs),
             name=f"{self.namespace}-autoscaling-out-policy",
@@ -365,11 +673,11 @@ class ContainerComponent(pulumi.ComponentResource):
                     aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
                         metric_interval_upper_bound="10",
                         metric_interval_lower_bound="0",
-                        scaling_adjustment=1,
+                        scaling_adjustment=self.scale_out_steps[0],
                     ),
                     aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
                         metric_interval_lower_bound="10",
-                        scaling_adjustment=3,
+                        scaling_adjustment=self.scale_out_steps[1],
                     )
                 ],
             ),
@@ -410,6 +718,9 @@ class ContainerComponent(pulumi.ComponentResource):
             )
         )
 
+        if not scale_in:
+            return
+
         self.autoscaling_in_policy = aws.appautoscaling.Policy(
             qualify_component_name("autoscaling_in_policy", self.kwargs),
             name=f"{self.namespace}-autoscaling-in-policy",
@@ -459,26 +770,6 @@ class ContainerComponent(pulumi.ComponentResource):
             )
         )
 
-        self.running_tasks_alarm = aws.cloudwatch.MetricAlarm(
-            qualify_component_name("running_tasks_alarm", self.kwargs),
-            name=f"{self.namespace}-running-tasks-alarm",
-            comparison_operator="GreaterThanOrEqualToThreshold",
-            evaluation_periods=1,
-            metric_name="RunningTaskCount",
-            namespace="ECS/ContainerInsights",
-            dimensions={
-                "ClusterName": self.ecs_cluster.name.apply(lambda name: name),
-                "ServiceName": self.namespace
-            },
-            period=60,
-            statistic="Maximum",
-            threshold=100,
-            alarm_actions=[self.sns_topic_arn, self.binary_sns_topic_arn],
-            ok_actions=[self.sns_topic_arn, self.binary_sns_topic_arn],
-            alarm_description="Alarm when ECS service running tasks are at Max of 100",
-            tags=self.tags
-        )
-
     def setup_load_balancer(self, kwargs, project, namespace, stack):
         self.certificate(project, stack)
 
@@ -492,16 +783,19 @@ class ContainerComponent(pulumi.ComponentResource):
             protocol="HTTP",
             target_type="ip",
             vpc_id=default_vpc.vpc_id,
+            deregistration_delay=self.rollout["deregistration_delay"],
+            slow_start=self.rollout["slow_start"],
+            load_balancing_algorithm_type=self.rollout["load_balancing_algorithm"],
             health_check=aws.lb.TargetGroupHealthCheckArgs(
                 enabled=True,
                 path=health_check_path,
                 port=str(self.container_port),
                 protocol="HTTP",
                 matcher="200",
-                interval=30,
+                interval=self.rollout["health_check_interval"],
                 timeout=5,
-                healthy_threshold=2,
-                unhealthy_threshold=2,
+                healthy_threshold=self.rollout["healthy_threshold"],
+                unhealthy_threshold=self.rollout["unhealthy_threshold"],
             ),
         )
         alb_args = alb.AlbArgs(
@@ -660,10 +954,12 @@ class ContainerComponent(pulumi.ComponentResource):
                                         depends_on=[self.cloudfront_cert_validation_record], delete_before_replace=True)
         )
 
-        cache_policy = aws.cloudfront.get_cache_policy(name="UseOriginCacheControlHeaders-QueryStrings")
-        error_page_policy = aws.cloudfront.get_cache_policy(name="Managed-CachingOptimized")
-        origin_request_policy = aws.cloudfront.get_origin_request_policy(name="Managed-AllViewer")
-        response_header_policy = aws.cloudfront.get_response_headers_policy("5cc3b908-e619-4b99-88e5-2cf7f45965bd")
+        cache_policy = cached_invoke(aws.cloudfront.get_cache_policy,
+                                     name="UseOriginCacheControlHeaders-QueryStrings")
+        error_page_policy = cached_invoke(aws.cloudfront.get_cache_policy, name="Managed-CachingOptimized")
+        origin_request_policy = cached_invoke(aws.cloudfront.get_origin_request_policy, name="Managed-AllViewer")
+        response_header_policy = cached_invoke(aws.cloudfront.get_response_headers_policy,
+                                               id="5cc3b908-e619-4b99-88e5-2cf7f45965bd")
 
         self.cloudfront_distribution = aws.cloudfront.Distribution(
             qualify_component_name("cloudfront", self.kwargs),
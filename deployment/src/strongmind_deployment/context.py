@@ -0,0 +1,113 @@
+import os
+import subprocess
+from typing import Optional
+
+import pulumi
+
+
+class ProjectContext:
+    """
+    The project-wide facts every component needs to name and tag its resources.
+
+    Resolving the owning team means shelling out to git and reading CODEOWNERS, so the
+    context is built lazily, once per project/stack/environment, and shared by every
+    component in the program. Use `get_project_context()` rather than constructing one.
+    """
+
+    def __init__(self, project: str, stack: str, environment: str, repo_root: str = None, owning_team: str = None):
+        self.project = project
+        self.stack = stack
+        self.environment = environment
+        self._repo_root = repo_root
+        self._owning_team = owning_team
+
+    @property
+    def repo_root(self) -> str:
+        if self._repo_root is None:
+            self._repo_root = get_repo_root()
+        return self._repo_root
+
+    @property
+    def owning_team(self) -> str:
+        if self._owning_team is None:
+            self._owning_team = get_owning_team(self.repo_root)
+        return self._owning_team
+
+    @property
+    def namespace(self) -> str:
+        return f"{self.project}-{self.stack}"
+
+    @property
+    def tags(self) -> dict:
+        """
+        The standard tags applied to every resource. A fresh dict is returned each time so
+        callers can add to it without affecting other components.
+        """
+        return {
+            "product": self.project,
+            "repository": self.project,
+            "service": self.project,
+            "environment": self.environment,
+            "owner": self.owning_team,
+        }
+
+
+_repo_roots = {}
+_owning_teams = {}
+_contexts = {}
+_override: Optional[ProjectContext] = None
+
+
+def get_repo_root() -> str:
+    """
+    The top level of the git repository the program runs from, cached per working directory.
+    """
+    cwd = os.getcwd()
+    if cwd not in _repo_roots:
+        _repo_roots[cwd] = subprocess.check_output(['git', 'rev-parse', '--show-toplevel']).decode('utf-8').strip()
+    return _repo_roots[cwd]
+
+
+def get_owning_team(repo_root: str = None) -> str:
+    """
+    Gets the owning team from the last owner entry in the repository's CODEOWNERS file.
+    """
+    repo_root = repo_root or get_repo_root()
+    if repo_root not in _owning_teams:
+        with open(f"{repo_root}/CODEOWNERS", 'r') as file:
+            owners = [line.strip().split('@')[-1] for line in file if '@' in line]
+        _owning_teams[repo_root] = owners[-1].split('/')[1]
+    return _owning_teams[repo_root]
+
+
+def get_project_context() -> ProjectContext:
+    """
+    Returns the shared context for the current Pulumi project and stack.
+
+    The environment comes from ENVIRONMENT_NAME and defaults to `stage`.
+    """
+    if _override is not None:
+        return _override
+    key = (pulumi.get_project(), pulumi.get_stack(), os.environ.get('ENVIRONMENT_NAME', 'stage'))
+    if key not in _contexts:
+        _contexts[key] = ProjectContext(*key)
+    return _contexts[key]
+
+
+def set_project_context(context: Optional[ProjectContext]):
+    """
+    Forces `get_project_context()` to return the given context. Pass None to go back to
+    resolving it from the running program. Intended for tests.
+    """
+    global _override
+    _override = context
+
+
+def reset_project_context():
+    """
+    Drops every cached value so the next lookup re-reads git and CODEOWNERS.
+    """
+    set_project_context(None)
+    _repo_roots.clear()
+    _owning_teams.clear()
+    _contexts.clear()
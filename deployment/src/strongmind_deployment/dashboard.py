@@ -10,6 +10,9 @@ class DashboardComponent(pulumi.ComponentResource):
         self.web_container = kwargs['web_container']
         self.ecs_cluster = kwargs['ecs_cluster']
         self.rds_serverless_cluster_instance = kwargs['rds_serverless_cluster_instance']
+        self.rds_reader_instances = kwargs.get('rds_reader_instances', [])
+        self.performance_insights = kwargs.get('performance_insights', False)
+        self.dashboard = None
         self.autoscale = kwargs.get('autoscale', False)
         self.kwargs = kwargs
         self.log_metric_filter_definitions = []
@@ -258,8 +261,56 @@ class DashboardComponent(pulumi.ComponentResource):
             }
         }))
 
+        widgets.extend(self.rds_query_performance_widgets())
+
         dashboard_body = pulumi.Output.all(*widgets).apply(lambda ws: json.dumps({"widgets": ws}))
 
-        dashboard = aws.cloudwatch.Dashboard(f"{self.namespace}-dashboard",
-                                             dashboard_body=dashboard_body,
-                                             dashboard_name=f"{self.namespace}")
+        self.dashboard = aws.cloudwatch.Dashboard(f"{self.namespace}-dashboard",
+                                                  dashboard_body=dashboard_body,
+                                                  dashboard_name=f"{self.namespace}")
+
+    def rds_query_performance_widgets(self):
+        """
+        Widgets for finding slow queries: where the database spends its time, how long reads, writes and commits
+        take, and how often reads are served from memory.
+        """
+        writer = self.rds_serverless_cluster_instance.identifier
+        instances = pulumi.Output.all(writer, *[reader.identifier for reader in self.rds_reader_instances])
+
+        def rds_widget(x, y, title, metrics, stat="Average"):
+            return {
+                "type": "metric",
+                "x": x,
+                "y": y,
+                "width": 12,
+                "height": 6,
+                "properties": {
+                    "metrics": metrics,
+                    "period": 60,
+                    "stat": stat,
+                    "region": "us-west-2",
+                    "title": title
+                }
+            }
+
+        widgets = []
+        # DB load is only published with Performance Insights; split by wait type it shows whether sessions are
+        # on CPU or waiting on I/O, locks and the like. The per-event breakdown is in Performance Insights.
+        if self.performance_insights:
+            widgets.append(writer.apply(lambda identifier: rds_widget(0, 36, "RDS DB Load by Wait Type", [
+                ["AWS/RDS", "DBLoad", "DBInstanceIdentifier", identifier, {"label": "All sessions"}],
+                ["AWS/RDS", "DBLoadCPU", "DBInstanceIdentifier", identifier, {"label": "On CPU"}],
+                ["AWS/RDS", "DBLoadNonCPU", "DBInstanceIdentifier", identifier, {"label": "Waiting"}],
+            ])))
+        widgets.append(instances.apply(lambda identifiers: rds_widget(0, 42, "RDS Read/Write Latency", [
+            ["AWS/RDS", metric, "DBInstanceIdentifier", identifier, {"label": f"{identifier} {label}"}]
+            for identifier in identifiers
+            for metric, label in (("ReadLatency", "read"), ("WriteLatency", "write"))
+        ])))
+        widgets.append(writer.apply(lambda identifier: rds_widget(0, 48, "RDS Commit Latency", [
+            ["AWS/RDS", "CommitLatency", "DBInstanceIdentifier", identifier],
+        ])))
+        widgets.append(instances.apply(lambda identifiers: rds_widget(12, 48, "RDS Buffer Cache Hit Ratio", [
+            ["AWS/RDS", "BufferCacheHitRatio", "DBInstanceIdentifier", identifier] for identifier in identifiers
+        ], stat="Minimum")))
+        return widgets
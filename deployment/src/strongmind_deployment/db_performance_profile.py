@@ -0,0 +1,124 @@
+from typing import Optional, Tuple
+
+import pulumi
+import pulumi_aws as aws
+
+from strongmind_deployment.util import qualify_component_name
+
+# Settings for many short transactions on SSD-backed storage, with enough logging to find the slow ones
+DEFAULT_CLUSTER_PARAMETERS = {
+    "shared_preload_libraries": "pg_stat_statements,auto_explain",
+    "pg_stat_statements.track": "top",
+    "auto_explain.log_min_duration": 1000,
+    "auto_explain.log_format": "json",
+    "log_min_duration_statement": 1000,
+    "log_lock_waits": 1,
+    "track_io_timing": 1,
+}
+DEFAULT_INSTANCE_PARAMETERS = {
+    "work_mem": 16384,
+    "random_page_cost": 1.1,
+    "effective_io_concurrency": 200,
+}
+# These only take effect after a reboot; everything else is applied immediately
+STATIC_PARAMETERS = {"shared_preload_libraries", "pg_stat_statements.max", "max_connections"}
+STORAGE_TYPES = ("aurora", "aurora-iopt1")
+
+
+class DbPerformanceProfile:
+    """
+    Database tuning that is versioned with the stack instead of clicked into the console.
+
+    The `db_performance_profile` kwarg is True for the defaults, or a dictionary:
+
+        {
+            "cluster_parameters": {"log_min_duration_statement": 500},
+            "instance_parameters": {"work_mem": 65536, "effective_io_concurrency": None},  # None drops a default
+            "storage_type": "aurora-iopt1",
+        }
+
+    Parameters are merged over DEFAULT_CLUSTER_PARAMETERS and DEFAULT_INSTANCE_PARAMETERS. Memory parameters are
+    in kB and durations in ms, as PostgreSQL reads them.
+
+    :param storage_type: "aurora-iopt1" (I/O-Optimized) for I/O-heavy workloads, where I/O would be over a
+        quarter of the database bill, or "aurora" to switch back to standard storage. Defaults to None (leave the
+        storage alone).
+    """
+    def __init__(self, cluster_parameters: dict = None, instance_parameters: dict = None,
+                 storage_type: Optional[str] = None):
+        if storage_type is not None and storage_type not in STORAGE_TYPES:
+            raise ValueError(f"storage_type must be one of {', '.join(STORAGE_TYPES)}")
+        self.cluster_parameters = self.merge(DEFAULT_CLUSTER_PARAMETERS, cluster_parameters)
+        self.instance_parameters = self.merge(DEFAULT_INSTANCE_PARAMETERS, instance_parameters)
+        self.storage_type = storage_type
+
+    @classmethod
+    def from_kwarg(cls, profile) -> Optional["DbPerformanceProfile"]:
+        if not profile:
+            return None
+        if profile is True:
+            return cls()
+        if isinstance(profile, DbPerformanceProfile):
+            return profile
+        return cls(profile.get("cluster_parameters"), profile.get("instance_parameters"),
+                   profile.get("storage_type"))
+
+    @staticmethod
+    def merge(defaults: dict, overrides: Optional[dict]) -> dict:
+        merged = {**defaults, **(overrides or {})}
+        return {name: value for name, value in merged.items() if value is not None}
+
+    @property
+    def cluster_storage_type(self) -> Optional[str]:
+        """
+        The storage type as the cluster takes it, where standard Aurora storage is an empty string.
+        """
+        if self.storage_type is None:
+            return None
+        return "" if self.storage_type == "aurora" else self.storage_type
+
+    @staticmethod
+    def parameter_group_family(engine_version: str) -> str:
+        return f"aurora-postgresql{engine_version.split('.')[0]}"
+
+
+def parameter_args(parameters: dict, args_type):
+    return [
+        args_type(
+            name=name,
+            value=str(value),
+            apply_method="pending-reboot" if name in STATIC_PARAMETERS else "immediate",
+        )
+        for name, value in sorted(parameters.items())
+    ]
+
+
+def create_parameter_groups(profile: DbPerformanceProfile,
+                            engine_version: str,
+                            namespace: str,
+                            kwargs: dict,
+                            tags: dict,
+                            parent: pulumi.Resource) -> Tuple[aws.rds.ClusterParameterGroup, aws.rds.ParameterGroup]:
+    """
+    Create the cluster and instance parameter groups for `profile`, in the family of `engine_version`.
+    """
+    family = DbPerformanceProfile.parameter_group_family(engine_version)
+    cluster_parameter_group = aws.rds.ClusterParameterGroup(
+        qualify_component_name("rds_cluster_parameter_group", kwargs),
+        name=f"{namespace}-{family}-cluster",
+        family=family,
+        description=f"{namespace} cluster performance profile",
+        parameters=parameter_args(profile.cluster_parameters, aws.rds.ClusterParameterGroupParameterArgs),
+        tags=tags,
+        opts=pulumi.ResourceOptions(parent=parent),
+    )
+    instance_parameter_group = aws.rds.ParameterGroup(
+        qualify_component_name("rds_instance_parameter_group", kwargs),
+        name=f"{namespace}-{family}-instance",
+        family=family,
+        description=f"{namespace} instance performance profile",
+        parameters=parameter_args(profile.instance_parameters, aws.rds.ParameterGroupParameterArgs),
+        tags=tags,
+        opts=pulumi.ResourceOptions(parent=parent),
+    )
+    return cluster_parameter_group, instance_parameter_group
@@ -1,24 +1,76 @@
+import hashlib
+import json
+import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Optional
 
 import boto3
 import pulumi
+from botocore.exceptions import ClientError
 from pulumi import ResourceOptions
+from pulumi.runtime import rpc
+
+from strongmind_deployment.aws_clients import get_client
+
+
+FINGERPRINT_INPUTS = ['image', 'command', 'revision', 'content_hash', 'steps']
+ECR_IMAGE = re.compile(r"^(?P<registry>\d+)\.dkr\.ecr\.(?P<region>[a-z0-9-]+)\.amazonaws\.com/"
+                       r"(?P<repository>[^:@]+):(?P<tag>[^:@/]+)$")
+DEFAULT_MAX_CONCURRENCY = 4
 
 
 class ExecutionResourceInputs:
+    """
+    :param image: The container image the task runs. Its digest is part of the fingerprint: pinned with `@sha256:`,
+                  or looked up in ECR for a tag. Unchanged runs are only skipped when the digest is known.
+    :param command: The command the task runs. Part of the fingerprint.
+    :param revision: The task definition revision. Part of the fingerprint.
+    :param content_hash: Any caller-supplied hash, e.g. of db/migrate. Part of the fingerprint.
+    :param skip_unchanged: Only run the task when the fingerprint differs from the last run. Defaults to False.
+    :param force: Run the task even when the fingerprint is unchanged. Defaults to False.
+    :param steps: Named commands to run as separate tasks instead of the task definition's command. Each step is a
+                  dictionary with the following keys:
+    - name: The name of the step, used in logs and durations.
+    - command: The command to run, overriding the container's command.
+    - depends_on: Names of steps that must succeed before this one starts. Defaults to `[]`.
+    :param max_concurrency: The most steps to run at once. Defaults to 4.
+    """
     cluster: pulumi.Input[str]
     family: pulumi.Input[str]
     subnets: pulumi.Input[str]
     security_groups: pulumi.Input[str]
-    ecs_client: pulumi.Input[boto3.client]
+    image: pulumi.Input[str]
+    command: pulumi.Input[list]
+    revision: pulumi.Input[int]
+    content_hash: pulumi.Input[str]
+    skip_unchanged: bool
+    force: bool
+    steps: list
+    max_concurrency: int
 
-    def __init__(self, cluster, family, subnets, security_groups, ecs_client=None):
+    def __init__(self, cluster, family, subnets, security_groups, image=None, command=None, revision=None,
+                 content_hash=None, skip_unchanged=False, force=False, steps=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
         self.cluster = cluster
         self.family = family
         self.subnets = subnets
         self.security_groups = security_groups
-        self.ecs_client = ecs_client
+        self.image = image
+        self.command = command
+        self.revision = revision
+        self.content_hash = content_hash
+        self.skip_unchanged = skip_unchanged
+        self.force = force
+        self.steps = steps
+        self.max_concurrency = max_concurrency
+
+        if self.steps is not None:
+            validate_steps(self.steps)
+        if not isinstance(self.max_concurrency, int) or self.max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer")
 
 
 class _ExecutionResourceProviderInputs:
@@ -26,36 +78,315 @@ class _ExecutionResourceProviderInputs:
     family: str
     subnets: str
     security_groups: str
-    ecs_client: boto3.client
+    image: str
+    command: list
+    revision: int
+    content_hash: str
+    skip_unchanged: bool
+    force: bool
+    steps: list
+    max_concurrency: int
 
-    def __init__(self, cluster, family, subnets, security_groups, ecs_client=None):
+    def __init__(self, cluster, family, subnets, security_groups, image=None, command=None, revision=None,
+                 content_hash=None, skip_unchanged=False, force=False, steps=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
         self.cluster = cluster
         self.family = family
         self.subnets = subnets
         self.security_groups = security_groups
+        self.image = image
+        self.command = command
+        self.revision = revision
+        self.content_hash = content_hash
+        self.skip_unchanged = skip_unchanged
+        self.force = force
+        self.steps = steps
+        self.max_concurrency = max_concurrency
+
+
+def validate_steps(steps):
+    """
+    Raises ValueError unless every step has a unique name and a command, and the dependencies name
+    other steps without forming a cycle.
+    """
+    names = [step.get('name') for step in steps]
+    if not all(isinstance(name, str) and name for name in names):
+        raise ValueError("Every execution step needs a name")
+    if len(set(names)) != len(names):
+        raise ValueError("Execution step names must be unique")
+    for step in steps:
+        if not step.get('command'):
+            raise ValueError(f"Execution step {step['name']} needs a command")
+        for dependency in step.get('depends_on', []):
+            if dependency not in names:
+                raise ValueError(f"Execution step {step['name']} depends on unknown step {dependency}")
+
+    remaining = {step['name']: set(step.get('depends_on', [])) for step in steps}
+    while remaining:
+        ready = [name for name, dependencies in remaining.items() if not dependencies & remaining.keys()]
+        if not ready:
+            raise ValueError(f"Execution steps have a dependency cycle: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+
+
+def execution_fingerprint(props) -> str:
+    """
+    A stable hash of everything that decides what the execution task would do.
+    """
+    values = {key: props.get(key) for key in FINGERPRINT_INPUTS}
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def image_digest(image: str, ecr_client=None) -> Optional[str]:
+    """
+    The digest `image` points at now. A tag such as `latest` can be pushed again with new code, so the
+    reference alone does not say whether the image changed.
+
+    :return: The digest, or None when it cannot be found, e.g. for a tag outside ECR.
+    """
+    if not image:
+        return None
+    if '@' in image:
+        return image.split('@', 1)[1]
+    match = ECR_IMAGE.match(image)
+    if not match:
+        return None
+    ecr_client = ecr_client or get_client('ecr', match['region'])
+    try:
+        response = ecr_client.describe_images(registryId=match['registry'],
+                                              repositoryName=match['repository'],
+                                              imageIds=[{'imageTag': match['tag']}])
+    except ClientError as e:
+        pulumi.log.warn(f"Could not find the digest of {image}: {e}")
+        return None
+    return response['imageDetails'][0]['imageDigest']
+
+
+def hash_directory(path: str) -> str:
+    """
+    Hashes the names and contents of every file under `path`, for use as a `content_hash`.
+
+    Example:
+        content_hash=hash_directory('../db/migrate')
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            digest.update(os.path.relpath(file_path, path).encode('utf-8'))
+            with open(file_path, 'rb') as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+class TaskWaiter:
+    """
+    Polls an ECS task until its essential container exits.
+
+    Polling starts fast so that a task which fails on boot is reported within seconds, then backs off
+    while the task keeps running so that long migrations make few describe_tasks calls. The delay is
+    reset whenever the task changes status.
+    """
+
+    def __init__(self, ecs_client, initial_delay=1, max_delay=15, backoff=1.5, sleep=time.sleep):
         self.ecs_client = ecs_client
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.sleep = sleep
+
+    def wait(self, cluster, task_id):
+        delay = self.initial_delay
+        last_status = None
+        while True:
+            task = self.ecs_client.describe_tasks(cluster=cluster, tasks=[task_id])['tasks'][0]
+            if self.has_finished(task):
+                return task
+            if task.get('lastStatus') != last_status:
+                last_status = task.get('lastStatus')
+                delay = self.initial_delay
+            self.sleep(delay)
+            delay = min(delay * self.backoff, self.max_delay)
+
+    @staticmethod
+    def has_finished(task):
+        if task.get('lastStatus') == 'STOPPED':
+            return True
+        # The container's exit code is known well before ECS finishes deprovisioning the task
+        containers = task.get('containers', [])
+        return bool(containers) and containers[0].get('exitCode') is not None
+
+
+class LogTail(threading.Thread):
+    """
+    Follows a CloudWatch log stream in the background, printing each event as it arrives.
+
+    The stream only exists once the container has started, so missing streams are retried until
+    `stop()` is called. Stopping drains whatever the task wrote after the last poll. Any other error
+    reading the stream is warned about and ends the tail; the logs are a convenience and must not fail
+    the execution step.
+    """
+
+    def __init__(self, logs_client, log_group_name, log_stream_name, interval=2, output=print):
+        super().__init__(daemon=True)
+        self.logs_client = logs_client
+        self.log_group_name = log_group_name
+        self.log_stream_name = log_stream_name
+        self.interval = interval
+        self.output = output
+        self.next_token = None
+        self._stopped = threading.Event()
+        self._failed = False
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.poll()
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+        if not self._failed:
+            self.poll()
+
+    def poll(self):
+        while not self._failed:
+            kwargs = {
+                'logGroupName': self.log_group_name,
+                'logStreamName': self.log_stream_name,
+                'startFromHead': True,
+            }
+            if self.next_token:
+                kwargs['nextToken'] = self.next_token
+            try:
+                response = self.logs_client.get_log_events(**kwargs)
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                    return
+                pulumi.log.warn(f"Stopped streaming {self.log_group_name} {self.log_stream_name}: {e}")
+                self._failed = True
+                self._stopped.set()
+                return
+            for event in response['events']:
+                self.output(event['message'])
+            # The forward token stops changing once we've reached the end of the stream
+            if response['nextForwardToken'] == self.next_token:
+                return
+            self.next_token = response['nextForwardToken']
 
 
 class ExecutionResourceProvider(pulumi.dynamic.ResourceProvider):
+    """
+    Runs a one-off Fargate task and fails the deployment if it exits unsuccessfully.
+
+    Clients are never part of the resource props, so they are not serialized into the stack state.
+    Pass them to the constructor only to substitute stubs in tests.
+    """
     ecs_client: boto3.client
 
+    def __init__(self, ecs_client=None, logs_client=None, waiter=None, ecr_client=None):
+        super().__init__()
+        self.ecs_client = ecs_client
+        self.logs_client = logs_client
+        self.waiter = waiter
+        self.ecr_client = ecr_client
+
     def create(self, props):
-        self.ecs_client = props.get('ecs_client', boto3.client('ecs'))
-        output = self.run_task(props)
-        return pulumi.dynamic.CreateResult(id_="0", outs={"output": output})
+        return pulumi.dynamic.CreateResult(id_="0", outs=self.execute(props))
 
     def update(self, id, _olds, props):
-        self.ecs_client = props.get('ecs_client', boto3.client('ecs'))
-        output = self.run_task(props)
-        return pulumi.dynamic.UpdateResult(outs={"output": output})
+        return pulumi.dynamic.UpdateResult(outs=self.execute(props))
+
+    def execute(self, props):
+        outs = {"fingerprint": self.fingerprint(props)}
+        if props.get('steps'):
+            outs["durations"] = self.run_steps(props)
+            outs["output"] = True
+        else:
+            outs["output"] = self.run_task(props)
+        return outs
 
-    def diff(self, _id: str, _olds, _news):
-        # Show that this has "changed" so that it runs every time
-        return pulumi.dynamic.DiffResult(changes=True)
+    def diff(self, _id: str, olds, news):
+        # Unless asked to skip unchanged runs, show that this has "changed" so that it runs every time
+        if not news.get('skip_unchanged') or news.get('force'):
+            return pulumi.dynamic.DiffResult(changes=True)
+        if any(news.get(key) == rpc.UNKNOWN for key in FINGERPRINT_INPUTS):
+            return pulumi.dynamic.DiffResult(changes=True)
+        fingerprint = self.fingerprint(news)
+        if fingerprint is None:
+            pulumi.log.warn(f"Running the execution task because the digest of {news.get('image')} is unknown; "
+                            f"pin the image with @sha256: or use an ECR tag to skip unchanged runs")
+            return pulumi.dynamic.DiffResult(changes=True)
+        return pulumi.dynamic.DiffResult(changes=olds.get('fingerprint') != fingerprint)
 
-    #
-    def run_task(self, inputs):
-        response = self.ecs_client.run_task(
+    def fingerprint(self, props) -> Optional[str]:
+        """
+        The execution fingerprint with the image's current digest in place of its reference, or None when the
+        digest cannot be found.
+        """
+        digest = image_digest(props.get('image'), self.ecr_client)
+        if digest is None:
+            return None
+        return execution_fingerprint({**props, 'image': digest})
+
+    def run_steps(self, inputs):
+        """
+        Runs each step as its own task, starting a step as soon as everything it depends on has succeeded.
+        Returns the number of seconds each step took, and raises once all runnable steps have finished if
+        any of them failed.
+        """
+        steps = {step['name']: step for step in inputs['steps']}
+        durations = {}
+        failures = {}
+        skipped = []
+        running = {}
+
+        def timed(step):
+            started = time.monotonic()
+            self.run_task(inputs, command=step['command'], label=step['name'])
+            return time.monotonic() - started
+
+        with ThreadPoolExecutor(max_workers=inputs.get('max_concurrency') or DEFAULT_MAX_CONCURRENCY) as executor:
+            while steps or running:
+                for name, step in list(steps.items()):
+                    dependencies = step.get('depends_on', [])
+                    if any(dependency in failures or dependency in skipped for dependency in dependencies):
+                        skipped.append(name)
+                        del steps[name]
+                    elif all(dependency in durations for dependency in dependencies):
+                        print(f"Starting execution step {name}")
+                        running[executor.submit(timed, step)] = name
+                        del steps[name]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        durations[name] = future.result()
+                    except Exception as e:
+                        failures[name] = e
+
+        for name, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True):
+            print(f"Execution step {name} took {duration:.1f}s")
+        if failures:
+            details = '; '.join(f"{name}: {error}" for name, error in failures.items())
+            skipped_note = f" (skipped {', '.join(skipped)})" if skipped else ""
+            raise Exception(f"Execution steps failed: {details}{skipped_note}")
+        return durations
+
+    def run_task(self, inputs, command=None, label=None):
+        ecs_client = self.ecs_client or get_client('ecs')
+        logs_client = self.logs_client or get_client('logs')
+        waiter = self.waiter or TaskWaiter(ecs_client)
+        family = str(inputs['family'])
+
+        run_task_args = {}
+        if command:
+            run_task_args['overrides'] = {'containerOverrides': [{'name': family, 'command': command}]}
+        response = ecs_client.run_task(
             taskDefinition=inputs['family'],
             cluster=inputs['cluster'],
             launchType='FARGATE',
@@ -66,36 +397,30 @@ class ExecutionResourceProvider(pulumi.dynamic.ResourceProvider):
                     'assignPublicIp': 'ENABLED'
                 }
             },
-            startedBy='rails-component'
+            startedBy='rails-component',
+            **run_task_args
         )
         task_arn = response['tasks'][0]['taskArn']
         task_id = task_arn.split('/')[-1]
-        task = self.ecs_client.describe_tasks(
-            cluster=inputs['cluster'],
-            tasks=[task_id]
-        )
-        while task['tasks'][0]['lastStatus'] != 'STOPPED':
-            time.sleep(5)
-            task = self.ecs_client.describe_tasks(
-                cluster=inputs['cluster'],
-                tasks=[task_id]
-            )
-        exit_code = task['tasks'][0]['containers'][0]['exitCode']
-        if exit_code:
-            logs = boto3.client('logs')
-            family = str(inputs['family'])
-            log_group_name = f'/aws/ecs/{family}'
-            print(f"Log group name: {log_group_name}")
-            log_stream_name = f'container/{family}/{format(task_id)}'
-            print(f"Log stream name: {log_stream_name}")
-            response = logs.get_log_events(
-                logGroupName=log_group_name,
-                logStreamName=log_stream_name,
-                startFromHead=True
-            )
-            for each in response['events']:
-                print(each['message'])
 
+        log_group_name = f'/aws/ecs/{family}'
+        log_stream_name = f'container/{family}/{task_id}'
+        print(f"Streaming {log_group_name} {log_stream_name}")
+        output = print
+        if label:
+            output = lambda message: print(f"[{label}] {message}")
+        tail = LogTail(logs_client, log_group_name, log_stream_name, output=output)
+        tail.start()
+        try:
+            task = waiter.wait(inputs['cluster'], task_id)
+        finally:
+            tail.stop()
+
+        container = task['containers'][0]
+        exit_code = container.get('exitCode')
+        if exit_code is None:
+            raise Exception(f"Task stopped without exiting: {task.get('stoppedReason', 'unknown reason')}")
+        if exit_code:
             raise Exception(f"Task exited with code {exit_code}")
         return True
 
@@ -0,0 +1,120 @@
+import os
+import pickle
+import threading
+import time
+
+import pulumi
+
+from strongmind_deployment.local_cache import aws_scope, read_private, user_cache_path, write_private
+
+DEFAULT_CACHE_PATH = user_cache_path('invokes.pickle')
+
+_results = {}
+_lock = threading.Lock()
+_settings = {
+    'ttl': None,
+    'path': None,
+    'warned_ttl': False,
+}
+
+
+def cached_invoke(function, **kwargs):
+    """
+    Calls a blocking Pulumi data source such as `aws.get_region` once per distinct set of arguments.
+
+    Repeated lookups of the same managed policy or account detail return the first answer instead of
+    making another round trip through the engine. When a disk TTL is configured (see
+    `configure_invoke_cache`), answers are also shared between runs until they expire.
+
+    Example:
+        cache_policy = cached_invoke(aws.cloudfront.get_cache_policy, name="Managed-CachingOptimized")
+    """
+    key = _cache_key(function, kwargs)
+    with _lock:
+        if key in _results:
+            return _results[key]
+
+    ttl = _disk_ttl()
+    if ttl:
+        entry = _read_disk().get(key)
+        if entry and entry['expires_at'] > time.time():
+            with _lock:
+                _results[key] = entry['result']
+            return entry['result']
+
+    result = function(**kwargs)
+    with _lock:
+        _results[key] = result
+    if ttl:
+        _write_disk(key, {'result': result, 'expires_at': time.time() + ttl})
+    return result
+
+
+def configure_invoke_cache(ttl: int = None, path: str = None):
+    """
+    Turns on sharing invoke results between runs through a file on disk.
+
+    :param ttl: Seconds a result stays valid on disk. Defaults to the STRONGMIND_INVOKE_CACHE_TTL environment
+                variable, and disk caching is off when neither is set.
+    :param path: The file to keep results in. Defaults to a per-user file in the system temp directory. The file is
+                 only read when it belongs to the current user and nobody else can read or write it.
+    """
+    _settings['ttl'] = ttl
+    _settings['path'] = path
+
+
+def clear_invoke_cache():
+    """
+    Forgets every result held in memory. Results on disk are left to expire.
+    """
+    with _lock:
+        _results.clear()
+
+
+def _disk_ttl():
+    if _settings['ttl'] is not None:
+        return _settings['ttl']
+    try:
+        return int(os.environ.get('STRONGMIND_INVOKE_CACHE_TTL', 0))
+    except ValueError:
+        if not _settings['warned_ttl']:
+            _settings['warned_ttl'] = True
+            pulumi.log.warn("STRONGMIND_INVOKE_CACHE_TTL must be a number of seconds; not caching invokes on disk")
+        return 0
+
+
+def _disk_path():
+    return _settings['path'] or DEFAULT_CACHE_PATH
+
+
+def _cache_key(function, kwargs):
+    # Answers such as the caller identity depend on which account and stack we are deploying to,
+    # so those are part of the key for results shared on disk.
+    scope = (pulumi.get_project(), pulumi.get_stack(), *aws_scope())
+    return repr((f"{function.__module__}.{function.__qualname__}", _freeze(kwargs), scope))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return type(value).__name__, _freeze(vars(value))
+    return value
+
+
+def _read_disk():
+    try:
+        return read_private(_disk_path(), pickle.load) or {}
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return {}
+
+
+def _write_disk(key, entry):
+    cache = {k: v for k, v in _read_disk().items() if v['expires_at'] > time.time()}
+    cache[key] = entry
+    try:
+        write_private(_disk_path(), lambda file: pickle.dump(cache, file))
+    except (OSError, pickle.PicklingError) as e:
+        pulumi.log.warn(f"Could not write invoke cache {_disk_path()}: {e}")
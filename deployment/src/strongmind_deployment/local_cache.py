@@ -0,0 +1,53 @@
+import getpass
+import os
+import stat
+import tempfile
+
+import pulumi
+
+# Cached answers decide what gets deployed, so they live in a directory only the current user can write to
+CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), f'strongmind_deployment-{getpass.getuser()}')
+
+
+def user_cache_path(filename: str) -> str:
+    return os.path.join(CACHE_DIRECTORY, filename)
+
+
+def aws_scope() -> tuple:
+    """
+    The credentials and region an AWS answer was given for, to key answers shared between runs.
+    """
+    return (
+        os.environ.get('AWS_PROFILE'),
+        os.environ.get('AWS_ACCESS_KEY_ID'),
+        os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION')),
+    )
+
+
+def is_private(status: os.stat_result) -> bool:
+    owned = not hasattr(os, 'getuid') or status.st_uid == os.getuid()
+    return owned and not status.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+
+
+def read_private(path: str, load, mode: str = 'rb'):
+    """
+    Loads `path` with `load(file)`, but only when the file belongs to the current user and nobody else can read or
+    write it. Returns None for a file that is not private; a missing file raises OSError.
+    """
+    with open(path, mode) as file:
+        if not is_private(os.fstat(file.fileno())):
+            pulumi.log.warn(f"Ignoring cache {path}: it must belong to the current user with mode 0600")
+            return None
+        return load(file)
+
+
+def write_private(path: str, dump, mode: str = 'wb'):
+    """
+    Writes `path` with `dump(file)` as a 0600 file in a 0700 directory, replacing any previous file in one step.
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}"
+    with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), mode) as file:
+        os.chmod(temporary_path, 0o600)
+        dump(file)
+    os.replace(temporary_path, path)
@@ -0,0 +1,195 @@
+from enum import Enum
+from typing import Optional
+
+import pulumi
+import pulumi_aws as aws
+from botocore.exceptions import ClientError
+from pulumi import ResourceOptions
+
+from strongmind_deployment.aws_clients import get_client
+from strongmind_deployment.util import qualify_component_name
+
+DEFAULT_SCHEDULING_BUFFER_TIME = 300
+METRIC_PAIRS = {
+    "cpu": "ECSServiceCPUUtilization",
+    "memory": "ECSServiceMemoryUtilization",
+    "requests": "ALBRequestCount",
+}
+# Changing any of these means a different policy, not an update to the same one
+REPLACE_ON_CHANGE = ["policy_name", "service_namespace", "resource_id", "scalable_dimension"]
+
+
+class PredictiveScalingMode(str, Enum):
+    FORECAST_ONLY = "ForecastOnly"
+    """
+    Publish forecasts without acting on them, to check them against real load before trusting them.
+    """
+    FORECAST_AND_SCALE = "ForecastAndScale"
+    """
+    Raise the minimum capacity ahead of each forecast peak.
+    """
+
+    def __str__(self):
+        return self.value
+
+
+class MaxCapacityBreachBehavior(str, Enum):
+    HONOR_MAX_CAPACITY = "HonorMaxCapacity"
+    INCREASE_MAX_CAPACITY = "IncreaseMaxCapacity"
+
+    def __str__(self):
+        return self.value
+
+
+class PredictiveScalingConfiguration:
+    """
+    Forecast-driven scaling that launches tasks ahead of the daily peak. It only ever raises capacity, so the
+    reactive policies keep working alongside it and still handle scale-in and anything the forecast misses.
+
+    :param metric: The metric pair to forecast: "cpu", "memory" or "requests" (ALB requests, web only).
+        Defaults to "cpu".
+    :param target_value: The per-task value of the metric to plan capacity for, e.g. 60 (% CPU) or 1000 requests
+        per minute. Required.
+    :param mode: A PredictiveScalingMode (or its value). Defaults to ForecastOnly.
+    :param scheduling_buffer_time: Seconds before the forecast peak to launch tasks. Defaults to 300.
+    :param max_capacity_breach_behavior: A MaxCapacityBreachBehavior (or its value) for when the forecast is above
+        the target's max capacity. Defaults to HonorMaxCapacity.
+    :param max_capacity_buffer: The percentage above the forecast that max capacity may be raised to, with
+        IncreaseMaxCapacity. Defaults to None.
+    """
+    def __init__(self, target_value, metric="cpu", mode=PredictiveScalingMode.FORECAST_ONLY,
+                 scheduling_buffer_time=DEFAULT_SCHEDULING_BUFFER_TIME,
+                 max_capacity_breach_behavior=MaxCapacityBreachBehavior.HONOR_MAX_CAPACITY,
+                 max_capacity_buffer=None):
+        if metric not in METRIC_PAIRS:
+            raise ValueError(f"Predictive scaling metric must be one of {', '.join(METRIC_PAIRS)}, not {metric!r}")
+        if not target_value or target_value <= 0:
+            raise ValueError("Predictive scaling needs a positive target_value")
+        self.metric = metric
+        self.target_value = target_value
+        self.mode = PredictiveScalingMode(mode)
+        self.scheduling_buffer_time = scheduling_buffer_time
+        self.max_capacity_breach_behavior = MaxCapacityBreachBehavior(max_capacity_breach_behavior)
+        if max_capacity_buffer is not None and \
+                self.max_capacity_breach_behavior != MaxCapacityBreachBehavior.INCREASE_MAX_CAPACITY:
+            raise ValueError("max_capacity_buffer only applies with IncreaseMaxCapacity")
+        self.max_capacity_buffer = max_capacity_buffer
+
+    @classmethod
+    def from_kwarg(cls, value) -> Optional["PredictiveScalingConfiguration"]:
+        if not value:
+            return None
+        if isinstance(value, cls):
+            return value
+        return cls(**value)
+
+
+def scaling_policy_request(props) -> dict:
+    """
+    Builds the PutScalingPolicy arguments from the resource props. Numbers come back from the engine as floats,
+    so the integer fields are cast back.
+    """
+    metric_pair = {"PredefinedMetricType": METRIC_PAIRS[props["metric"]]}
+    if props.get("resource_label"):
+        metric_pair["ResourceLabel"] = props["resource_label"]
+    configuration = {
+        "MetricSpecifications": [{
+            "TargetValue": float(props["target_value"]),
+            "PredefinedMetricPairSpecification": metric_pair,
+        }],
+        "Mode": props["mode"],
+        "SchedulingBufferTime": int(props["scheduling_buffer_time"]),
+        "MaxCapacityBreachBehavior": props["max_capacity_breach_behavior"],
+    }
+    if props.get("max_capacity_buffer") is not None:
+        configuration["MaxCapacityBuffer"] = int(props["max_capacity_buffer"])
+    return {
+        "PolicyName": props["policy_name"],
+        "ServiceNamespace": props["service_namespace"],
+        "ResourceId": props["resource_id"],
+        "ScalableDimension": props["scalable_dimension"],
+        "PolicyType": "PredictiveScaling",
+        "PredictiveScalingPolicyConfiguration": configuration,
+    }
+
+
+class PredictiveScalingPolicyProvider(pulumi.dynamic.ResourceProvider):
+    """
+    Manages an Application Auto Scaling predictive scaling policy, which pulumi_aws cannot express yet.
+
+    As with the execution provider, the client is never part of the props; pass one only to substitute a stub.
+    """
+
+    def __init__(self, client=None):
+        super().__init__()
+        self.client = client
+
+    def _client(self):
+        return self.client or get_client('application-autoscaling')
+
+    def create(self, props):
+        response = self._client().put_scaling_policy(**scaling_policy_request(props))
+        return pulumi.dynamic.CreateResult(id_=props["policy_name"],
+                                           outs={**props, "policy_arn": response["PolicyARN"]})
+
+    def update(self, id, _olds, props):
+        response = self._client().put_scaling_policy(**scaling_policy_request(props))
+        return pulumi.dynamic.UpdateResult(outs={**props, "policy_arn": response["PolicyARN"]})
+
+    def diff(self, _id, olds, news):
+        changed = [key for key in news if key != "policy_arn" and olds.get(key) != news.get(key)]
+        replaces = [key for key in changed if key in REPLACE_ON_CHANGE]
+        return pulumi.dynamic.DiffResult(changes=bool(changed), replaces=replaces,
+                                         delete_before_replace=bool(replaces))
+
+    def delete(self, _id, props):
+        try:
+            self._client().delete_scaling_policy(PolicyName=props["policy_name"],
+                                                 ServiceNamespace=props["service_namespace"],
+                                                 ResourceId=props["resource_id"],
+                                                 ScalableDimension=props["scalable_dimension"])
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ObjectNotFoundException':
+                raise
+
+
+class PredictiveScalingPolicy(pulumi.dynamic.Resource):
+    policy_arn: pulumi.Output[str]
+
+    def __init__(self, name: str, props: dict, opts: Optional[ResourceOptions] = None):
+        super().__init__(PredictiveScalingPolicyProvider(), name, {**props, "policy_arn": None}, opts)
+
+
+def create_predictive_scaling_policy(key: str,
+                                     target: aws.appautoscaling.Target,
+                                     configuration: Optional[PredictiveScalingConfiguration],
+                                     namespace: str,
+                                     kwargs: dict,
+                                     parent: pulumi.Resource,
+                                     resource_label: pulumi.Input[str] = None) -> Optional[PredictiveScalingPolicy]:
+    """
+    Layer a predictive scaling policy over `target`'s existing reactive policies.
+
+    :param resource_label: The ALB resource label, required for the "requests" metric.
+    """
+    if not configuration:
+        return None
+    if configuration.metric == "requests" and resource_label is None:
+        raise ValueError(f"Predictive scaling on requests needs a load balancer in front of {key}")
+    return PredictiveScalingPolicy(
+        qualify_component_name(f"{key}_predictive_scaling_policy", kwargs),
+        {
+            "policy_name": f"{namespace}-{key}-predictive-scaling-policy",
+            "service_namespace": target.service_namespace,
+            "resource_id": target.resource_id,
+            "scalable_dimension": target.scalable_dimension,
+            "metric": configuration.metric,
+            "resource_label": resource_label if configuration.metric == "requests" else None,
+            "target_value": configuration.target_value,
+            "mode": configuration.mode.value,
+            "scheduling_buffer_time": configuration.scheduling_buffer_time,
+            "max_capacity_breach_behavior": configuration.max_capacity_breach_behavior.value,
+            "max_capacity_buffer": configuration.max_capacity_buffer,
+        },
+        opts=ResourceOptions(parent=parent, depends_on=[target]),
+    )
@@ -1,22 +1,27 @@
 import hashlib
+import json
 import os
-import subprocess
 
 import pulumi
 import pulumi_aws as aws
 import pulumi_random as random
 from pulumi import export, Output
-import boto3
-from botocore.exceptions import ClientError
 
 from strongmind_deployment import operations
+from strongmind_deployment.capacity_providers import create_cluster_capacity_providers
+from strongmind_deployment.capacity_schedule import create_database_schedules, database_capacity_windows
 from strongmind_deployment.container import ContainerComponent
-from strongmind_deployment.execution import ExecutionComponent, ExecutionResourceInputs
+from strongmind_deployment.context import get_project_context
+from strongmind_deployment.db_performance_profile import DbPerformanceProfile, create_parameter_groups
+from strongmind_deployment.rds_proxy import RdsProxyComponent
+from strongmind_deployment.execution import ExecutionComponent, ExecutionResourceInputs, DEFAULT_MAX_CONCURRENCY
 from strongmind_deployment.redis import RedisComponent, QueueComponent, CacheComponent
 from strongmind_deployment.secrets import SecretsComponent
+from strongmind_deployment.service_discovery import find_desired_count
 from strongmind_deployment.storage import StorageComponent
 from strongmind_deployment.dashboard import DashboardComponent
-from strongmind_deployment.util import create_ecs_cluster, qualify_component_name
+from strongmind_deployment.util import CpuArchitecture, create_ecs_cluster, qualify_component_name
+from strongmind_deployment.worker_pools import worker_pools
 
 
 def sidekiq_present():  # pragma: no cover
@@ -37,6 +42,18 @@ class RailsComponent(pulumi.ComponentResource):
         :key cache_redis: Either True to create a default cache Redis instance or a RedisComponent to use.
         :key execution_cmd: The command for the pre-deployment execution container. Defaults to `["sh", "-c",
                                       "bundle exec rails db:prepare db:migrate db:seed assets:precompile && echo 'Migrations complete'"]`.
+        :key skip_unchanged_execution: Only run the execution container when its image digest, command, task definition
+                                      revision or `execution_content_hash` changed since the last run. The image must
+                                      be pinned with `@sha256:` or tagged in ECR, or it runs every time. Defaults to False.
+        :key execution_content_hash: An extra value to fingerprint, such as `hash_directory('../db/migrate')`. Defaults to None.
+        :key force_execution: Run the execution container even when nothing changed. Defaults to False.
+        :key execution_steps: Named commands to run as separate execution tasks instead of `execution_cmd`, in parallel
+                              where their `depends_on` lists allow. For example
+                              `[{"name": "migrate", "command": ["sh", "-c", "bundle exec rails db:prepare db:migrate"]},
+                                {"name": "seed", "command": ["sh", "-c", "bundle exec rails db:seed"], "depends_on": ["migrate"]},
+                                {"name": "assets", "command": ["sh", "-c", "bundle exec rails assets:precompile"]}]`.
+                              Defaults to None.
+        :key execution_max_concurrency: The most execution steps to run at once. Defaults to 4.
         :key web_entry_point: The entry point for the web container. Defaults to the ENTRYPOINT in the Dockerfile.
         :key web_cmd: The command for the web container. Defaults to `["sh", "-c", "rails assets:precompile && rails server -b 0.0.0.0"]`.
         :key cpu: The number of CPU units to reserve for the web container. Defaults to 2048.
@@ -44,30 +61,96 @@ class RailsComponent(pulumi.ComponentResource):
         :key need_worker: Whether to create a worker container. Defaults to True if sidekiq is in the Gemfile.
         :key worker_entry_point: The entry point for the worker container. Defaults to the ENTRYPOINT in the Dockerfile. Requires need_worker to be True.
         :key worker_cmd: The command for the worker container. Defaults to `["sh", "-c", "bundle exec sidekiq"]`. Requires need_worker to be True.
+        :key worker_pools: Separate worker services for groups of Sidekiq queues, each scaling on its own queues'
+                           latency, instead of one worker for every queue. For example
+                           `[{"name": "critical", "queues": ["critical"], "min": 2, "latency_threshold": 5},
+                             {"name": "bulk", "queues": ["default", "backfill"], "max": 20, "cpu": 1024}]`.
+                           See worker_pools.WorkerPool. Defaults to None.
         :key worker_cpu: The number of CPU units to reserve for the worker container. Defaults to 2048.
         :key worker_memory: The amount of memory (in MiB) to allow the worker container to use. Defaults to 4096.
+        :key cpu_architecture: "X86_64" or "ARM64" (Graviton) for every task. The images must be built for it. Defaults
+                               to "X86_64".
+        :key web_cpu_architecture: Overrides cpu_architecture for the web container.
+        :key worker_cpu_architecture: Overrides cpu_architecture for the worker container.
+        :key migration_cpu_architecture: Overrides cpu_architecture for the migration (execution) task.
+        :key capacity_provider_strategy: How the web container's tasks are spread across FARGATE and FARGATE_SPOT. See
+                                         ContainerComponent. Defaults to None (on-demand only).
+        :key worker_capacity_provider_strategy: The same for the worker container, e.g.
+                                                capacity_providers.WORKER_CAPACITY_PROVIDER_STRATEGY for one on-demand
+                                                task, then three Spot tasks for every on-demand one. Defaults to None
+                                                (on-demand only). Opting an existing worker in replaces its ECS service:
+                                                the old service is deleted before the new one starts at
+                                                desired_worker_count, so no worker runs in between.
         :key worker_log_metric_filters: A list of log metric filters to create for the worker container. Defaults to `[]`.
         :key dynamo_tables: A list of DynamoDB tables to create. Defaults to `[]`. Each table is a DynamoComponent.
         :key md5_hash_db_password: Whether to MD5 hash the database password. Defaults to False.
         :key storage: Whether to create an S3 bucket for the Rails application. Defaults to False.
         :key storage_private: Sets the bucket to public when false. Defaults to True.
         :key custom_health_check_path: The path to use for the health check. Defaults to `/up`.
+        :key container_health_check: An ECS container health check for the web container, whose start_period also sets
+                                     the grace period. See ContainerComponent. Defaults to None.
+        :key worker_container_health_check: The same for the worker container, which needs a `command` such as
+                                            `["CMD-SHELL", "pgrep -f sidekiq || exit 1"]`. Defaults to None.
+        :key deployment_circuit_breaker: Whether ECS rolls back deploys whose tasks keep failing. Defaults to True.
+        :key rollout_profile: "standard" or "fast" target group drain, health check and slow start settings for the web
+                              container. See ContainerComponent. Defaults to "standard".
         :key snapshot_identifier: The snapshot identifier to use for the RDS cluster. Defaults to None.
         :key kms_key_id: The KMS key ID to use for the RDS cluster. Defaults to None.
         :key db_name: The name of the database. Defaults to app.
         :key db_username: The username for connecting to the app database. Defaults to project name and environment.
         :key autoscale: Whether to autoscale the web container. Defaults to True.
+        :key autoscale_mode: How the web container scales: "step" on response time, "target_tracking", or
+                             "target_tracking_with_step". See ContainerComponent for the target tracking keys
+                             (target_requests_per_task, target_cpu_utilization and friends). Defaults to "step".
         :key worker_autoscale: Whether to autoscale the worker container. Defaults to True.
         :key db_engine_version: The version of the database engine. Defaults to 15.4.
         :key desired_web_count: The number of instances of the web container to run. Defaults to 1.
         :key desired_worker_count: The number of instances of the worker container to run. Defaults to 1.
         :key rds_minimum_capacity: The minimum capacity of the RDS cluster. Defaults to 0.5.
         :key rds_maximum_capacity: The maximum capacity of the RDS cluster. Defaults to 16.
+        :key rds_reader_count: The number of serverless reader instances, whose reader endpoint is sent to the web
+                               and worker containers as DB_READER_HOST and DATABASE_REPLICA_URL. Defaults to 0.
+        :key rds_reader_max_count: Autoscale the readers up to this many on their average CPU. Needs an
+                                   rds_reader_count of at least 1. Defaults to rds_reader_count (no autoscaling).
+        :key rds_reader_target_cpu_utilization: The reader CPU utilization to autoscale to. Defaults to 60.
+        :key db_performance_profile: True, or a dictionary of cluster_parameters, instance_parameters and
+                                     storage_type ("aurora-iopt1" for I/O-Optimized), to tune the database with
+                                     parameter groups built on OLTP defaults (pg_stat_statements, auto_explain and
+                                     slow query logging). See db_performance_profile.DbPerformanceProfile. Defaults
+                                     to None (the default parameter groups and standard storage).
+        :key rds_performance_insights: Whether to turn on Performance Insights for every cluster instance, which also
+                                       adds DB load panels to the dashboard. Defaults to False.
+        :key rds_performance_insights_retention: Days to keep Performance Insights data: 7, 731, or a multiple of
+                                                 31. Defaults to 7 (the free tier).
+        :key rds_performance_insights_kms_key_id: The KMS key to encrypt Performance Insights data with. Defaults to
+                                                  the AWS managed key.
+        :key rds_monitoring_interval: Seconds between enhanced monitoring samples on every cluster instance: 1, 5,
+                                      10, 15, 30 or 60. Defaults to 0 (off).
+        :key rds_proxy: True, or a dictionary of RdsProxyComponent settings (connection_borrow_timeout,
+                        max_connections_percent, max_idle_connections_percent, idle_client_timeout, require_tls), to
+                        pool the web and worker database connections through an RDS Proxy. The migration task keeps
+                        the cluster endpoint. Defaults to None.
+        :key capacity_plan: Measured web throughput to derive its scaling limits from. See ContainerComponent.
+        :key worker_capacity_plan: Measured worker throughput to derive its scaling limits from. See
+                                   WorkerAutoscaleComponent.
+        :key capacity_schedule: A list of capacity windows (cron start/end with a timezone) that raise the "web" and
+                                "worker" min/max and the "database" ACU floor ahead of the school day. See
+                                capacity_schedule.CapacityWindow. With a "database" window the cluster ignores
+                                changes to its scaling configuration, so new rds_minimum_capacity and
+                                rds_maximum_capacity values apply at the end of the next window. Defaults to `[]`.
+        :key predictive_scaling: Forecast-driven scaling for the web container, layered on the reactive policies. See
+                                 predictive_scaling.PredictiveScalingConfiguration. Defaults to None.
+        :key worker_predictive_scaling: The same for the worker container, on "cpu" or "memory". Defaults to None.
+        :key worker_scale_to_zero: Whether the worker drops to 0 tasks after worker_idle_minutes without work and wakes
+                                   on worker_wake_metric_name. See WorkerAutoscaleComponent. Defaults to False.
+        :key ecs_client: The ECS client used to find the current web desired count. Defaults to a shared us-west-2 client.
+        :key desired_count_cache_ttl: Seconds to reuse the discovered web desired count between runs. Defaults to 0 (disabled).
         """
         super().__init__('strongmind:global_build:commons:rails', name, None, opts)
         self.container_security_groups = None
         self.execution = None
         self.ecs_cluster = None
+        self.cluster_capacity_providers = None
         self.migration_container = None
         self.queue_redis = None
         self.cache_redis = None
@@ -82,9 +165,15 @@ class RailsComponent(pulumi.ComponentResource):
         self.hashed_password = None
         self.web_container = None
         self.worker_container = None
+        self.worker_pool_containers = {}
         self.secret = None
         self.rds_serverless_cluster_instance = None
+        self.rds_reader_instances = []
+        self.rds_reader_autoscaling_target = None
+        self.rds_reader_autoscaling_policy = None
         self.rds_serverless_cluster = None
+        self.rds_proxy = None
+        self.database_capacity_schedules = []
         self.kwargs = kwargs
         self.worker_log_metric_filters = self.kwargs.get('worker_log_metric_filters', [])
         self.snapshot_identifier = self.kwargs.get('snapshot_identifier', None)
@@ -93,11 +182,32 @@ class RailsComponent(pulumi.ComponentResource):
         self.env_vars = self.kwargs.get('env_vars', {})
         self.autoscale = self.kwargs.get('autoscale', True)
         self.worker_autoscale = self.kwargs.get('worker_autoscale', True)
+        self.worker_pools = worker_pools(self.kwargs)
+        self.web_container_health_check = self.kwargs.get('container_health_check')
+        cpu_architecture = self.kwargs.get('cpu_architecture', CpuArchitecture.X86_64)
+        self.web_cpu_architecture = CpuArchitecture(self.kwargs.get('web_cpu_architecture', cpu_architecture))
+        self.worker_cpu_architecture = CpuArchitecture(self.kwargs.get('worker_cpu_architecture', cpu_architecture))
+        self.migration_cpu_architecture = CpuArchitecture(self.kwargs.get('migration_cpu_architecture',
+                                                                          cpu_architecture))
         self.engine_version = self.kwargs.get('db_engine_version', '15.4')
         self.desired_web_count = self.kwargs.get('desired_web_count', 2)
         self.desired_worker_count = self.kwargs.get('desired_worker_count', 1)
         self.rds_minimum_capacity = self.kwargs.get('rds_minimum_capacity', 1)
         self.rds_maximum_capacity = self.kwargs.get('rds_maximum_capacity', 128)
+        self.db_performance_profile = DbPerformanceProfile.from_kwarg(self.kwargs.get('db_performance_profile'))
+        self.rds_cluster_parameter_group = None
+        self.rds_instance_parameter_group = None
+        self.rds_monitoring_role = None
+        self.rds_monitoring_policy_attachment = None
+        self.rds_instance_monitoring = self.rds_instance_monitoring_settings()
+        self.rds_reader_count = self.kwargs.get('rds_reader_count', 0)
+        self.rds_reader_max_count = self.kwargs.get('rds_reader_max_count', self.rds_reader_count)
+        if self.rds_reader_max_count < self.rds_reader_count:
+            raise ValueError("rds_reader_max_count cannot be below rds_reader_count")
+        if self.rds_reader_max_count and self.rds_reader_count < 1:
+            # Aurora only autoscales readers on a cluster that already has one
+            raise ValueError("rds_reader_max_count needs an rds_reader_count of at least 1")
+        self.rds_proxy_settings = self.kwargs.get('rds_proxy')
         self.kwargs['sns_topic_arn'] = self.kwargs.get('sns_topic_arn',
                                                        operations.get_opsgenie_sns_topic_arn())
 
@@ -106,49 +216,19 @@ class RailsComponent(pulumi.ComponentResource):
         project = pulumi.get_project()
         stack = pulumi.get_stack()
         self.namespace = self.kwargs.get('namespace', f"{project}-{stack}")
-        path = subprocess.check_output(['git', 'rev-parse', '--show-toplevel']).decode('utf-8').strip()
-        file_path = f"{path}/CODEOWNERS"
-        with open(file_path, 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        self.tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+        self.tags = get_project_context().tags
         
-        ecs_client = kwargs.get('ecs_client') or boto3.client('ecs', region_name='us-west-2')
-
         possible_service_names = [
-            self.namespace,  
-            f"{self.namespace}-{self.namespace}-container", 
+            self.namespace,
+            f"{self.namespace}-{self.namespace}-container",
         ]
-
-        found_service = False
-        for service_name in possible_service_names:
-            try:
-                response = ecs_client.describe_services(
-                    cluster=self.namespace,
-                    services=[service_name]
-                )
-
-                if response.get('services') and len(response['services']) > 0:
-                    self.current_desired_count = response['services'][0]['desiredCount']
-                    pulumi.log.info(f"Found service {service_name} with desired count: {self.current_desired_count}")
-                    found_service = True
-                    break
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                if error_code in ['ClusterNotFoundException', 'ServiceNotFoundException']:
-                    pulumi.log.info(f"Service {service_name} not found: {e}")
-                    continue
-                else:
-                    pulumi.log.warn(f"Unexpected error checking service {service_name}: {str(e)}")
-                    continue
-
-        if not found_service:
+        found_service = find_desired_count(self.namespace,
+                                           possible_service_names,
+                                           ecs_client=kwargs.get('ecs_client'),
+                                           cache_ttl=kwargs.get('desired_count_cache_ttl', 0))
+        if found_service:
+            _, self.current_desired_count = found_service
+        else:
             pulumi.log.info("No existing services found, using default desired count")
             self.current_desired_count = self.desired_web_count
 
@@ -217,7 +297,9 @@ class RailsComponent(pulumi.ComponentResource):
 
     def ecs(self):
         self.ecs_cluster = create_ecs_cluster(self, self.namespace, self.kwargs)
+        self.cluster_capacity_providers = create_cluster_capacity_providers(self, self.ecs_cluster, self.kwargs)
         self.kwargs['ecs_cluster'] = self.ecs_cluster
+        self.kwargs['cluster_capacity_providers'] = self.cluster_capacity_providers
 
         container_image = os.environ['CONTAINER_IMAGE']
         master_key = os.environ['RAILS_MASTER_KEY']
@@ -235,6 +317,10 @@ class RailsComponent(pulumi.ComponentResource):
             'RAILS_ENV': 'production',
             'NAMESPACE': self.namespace
         }
+        if self.rds_reader_max_count:
+            additional_env_vars['DB_READER_HOST'] = self.rds_serverless_cluster.reader_endpoint
+            additional_env_vars['DATABASE_REPLICA_URL'] = self.get_database_url(
+                self.rds_serverless_cluster.reader_endpoint)
 
         self.env_vars.update(additional_env_vars)
         self.kwargs['env_vars'] = self.env_vars
@@ -256,6 +342,8 @@ class RailsComponent(pulumi.ComponentResource):
 
         self.kwargs['autoscale'] = False
         self.kwargs['worker_autoscale'] = False
+        self.kwargs['cpu_architecture'] = self.migration_cpu_architecture
+        self.kwargs['container_health_check'] = None
 
         self.migration_container = ContainerComponent(
             qualify_component_name("migration", self.kwargs),
@@ -266,23 +354,35 @@ class RailsComponent(pulumi.ComponentResource):
             **self.kwargs
         )
 
-        subnets = self.kwargs.get(
-            'container_subnets',
-            self.migration_container.fargate_service.service.network_configuration.subnets)  # pragma: no cover
-        self.container_security_groups = self.kwargs.get(
-            'container_security_groups',
-            self.migration_container.fargate_service.service.network_configuration.security_groups)  # pragma: no cover
+        subnets = self.kwargs.get('container_subnets')
+        if subnets is None:
+            subnets = self.migration_container.fargate_service.service.network_configuration.subnets  # pragma: no cover
+        self.container_security_groups = self.kwargs.get('container_security_groups')
+        if self.container_security_groups is None:
+            self.container_security_groups = \
+                self.migration_container.fargate_service.service.network_configuration.security_groups  # pragma: no cover
         execution_inputs = ExecutionResourceInputs(
             cluster=self.ecs_cluster.arn,
             family=self.migration_container.namespace,
             subnets=subnets,
             security_groups=self.container_security_groups,
+            image=container_image,
+            command=execution_cmd,
+            revision=self.migration_container.fargate_service.task_definition.revision,
+            content_hash=self.kwargs.get('execution_content_hash'),
+            skip_unchanged=self.kwargs.get('skip_unchanged_execution', False),
+            force=self.kwargs.get('force_execution', False),
+            steps=self.kwargs.get('execution_steps'),
+            max_concurrency=self.kwargs.get('execution_max_concurrency', DEFAULT_MAX_CONCURRENCY),
         )
         self.execution = ExecutionComponent(qualify_component_name("execution", self.kwargs),
                                             execution_inputs,
                                             opts=pulumi.ResourceOptions(parent=self,
                                                                         depends_on=[self.migration_container]))
 
+        if self.rds_proxy_settings:
+            self.setup_rds_proxy(subnets)
+
         web_entry_point = self.kwargs.get('web_entry_point')
         web_command = self.kwargs.get('web_cmd', ["sh", "-c", "rails assets:precompile && rails server -b 0.0.0.0"])
 
@@ -292,6 +392,8 @@ class RailsComponent(pulumi.ComponentResource):
         self.kwargs['desired_count'] = self.current_desired_count
         self.kwargs['autoscale'] = self.autoscale
         self.kwargs['worker_autoscale'] = False
+        self.kwargs['cpu_architecture'] = self.web_cpu_architecture
+        self.kwargs['container_health_check'] = self.web_container_health_check
         
         self.web_container = ContainerComponent(qualify_component_name("container", self.kwargs),
                                                 pulumi.ResourceOptions(parent=self,
@@ -326,15 +428,35 @@ class RailsComponent(pulumi.ComponentResource):
         self.kwargs['autoscale'] = False
         self.kwargs['worker_autoscale'] = self.worker_autoscale
         self.kwargs['deployment_maximum_percent'] = 200
-
-        self.worker_container = ContainerComponent(qualify_component_name("worker", self.kwargs),
-                                                   pulumi.ResourceOptions(parent=self,
-                                                                          depends_on=[self.execution]
-                                                                          ),
-                                                   **self.kwargs
-                                                   )
+        self.kwargs['cpu_architecture'] = self.worker_cpu_architecture
+        self.kwargs['container_health_check'] = self.kwargs.get('worker_container_health_check')
+        self.kwargs['capacity_provider_strategy'] = self.kwargs.get('worker_capacity_provider_strategy')
+
+        if self.worker_pools:
+            self.setup_worker_pools()
+        else:
+            self.worker_container = ContainerComponent(qualify_component_name("worker", self.kwargs),
+                                                       pulumi.ResourceOptions(parent=self,
+                                                                              depends_on=[self.execution]
+                                                                              ),
+                                                       **self.kwargs
+                                                       )
         self.kwargs['log_metric_filters'] = []
 
+    def setup_worker_pools(self):
+        for pool in self.worker_pools:
+            # get_secrets is a coroutine, which each task definition has to await on its own
+            self.kwargs['secrets'] = self.secret.get_secrets()  # pragma: no cover
+            self.worker_pool_containers[pool.name] = ContainerComponent(
+                qualify_component_name(pool.key, self.kwargs),
+                pulumi.ResourceOptions(parent=self,
+                                       depends_on=[self.execution]
+                                       ),
+                **{**self.kwargs, **pool.container_kwargs()}
+            )
+            # Log metric filters are named after their metric, so only the first pool can carry them
+            self.kwargs['log_metric_filters'] = []
+
     def secrets(self):
         self.secret = SecretsComponent(qualify_component_name("secrets", self.kwargs),
                                        pulumi.ResourceOptions(parent=self),
@@ -359,6 +481,22 @@ class RailsComponent(pulumi.ComponentResource):
         if self.kwargs.get('md5_hash_db_password'):
             master_db_password = self.hashed_password
 
+        if self.db_performance_profile:
+            self.rds_cluster_parameter_group, self.rds_instance_parameter_group = create_parameter_groups(
+                self.db_performance_profile, self.engine_version, self.namespace, self.kwargs, self.tags, self)
+
+        self.rds_cluster_ignore_changes = [
+            'masterPassword', ## Don't change
+            'snapshotIdentifier', #* results in replace
+            'clusterIdentifier', #*
+            'engineVersion', ### results in an outage
+            'masterUsername', #*,
+            'storageEncrypted'
+        ]
+        if database_capacity_windows(self.kwargs):
+            # The capacity schedules own the ACU range; see create_database_schedules
+            self.rds_cluster_ignore_changes.append('serverlessv2ScalingConfiguration')
+
         self.rds_serverless_cluster = aws.rds.Cluster(
             qualify_component_name('rds_serverless_cluster', self.kwargs),
             cluster_identifier=self.namespace,
@@ -380,18 +518,17 @@ class RailsComponent(pulumi.ComponentResource):
             snapshot_identifier=self.snapshot_identifier,
             kms_key_id=self.kms_key_id,
             storage_encrypted=bool(self.kms_key_id),
+            **self.rds_cluster_performance_args(),
             tags=self.tags,
             opts=pulumi.ResourceOptions(parent=self,  # pragma: no cover
                                         protect=True,
-                                        ignore_changes=[
-                                                        'masterPassword', ## Don't change
-                                                        'snapshotIdentifier', #* results in replace
-                                                        'clusterIdentifier', #*
-                                                        'engineVersion', ### results in an outage
-                                                        'masterUsername', #*,
-                                                        'storageEncrypted'
-                                                        ])
+                                        ignore_changes=self.rds_cluster_ignore_changes)
         )
+        self.database_capacity_schedules = create_database_schedules(self.rds_serverless_cluster,
+                                                                     self.rds_minimum_capacity,
+                                                                     self.rds_maximum_capacity,
+                                                                     self.namespace, self.kwargs, self.tags, self)
+        instance_monitoring_args = self.rds_instance_monitoring_args()
         self.rds_serverless_cluster_instance = aws.rds.ClusterInstance(
             qualify_component_name('rds_serverless_cluster_instance', self.kwargs),
             identifier=self.namespace,
@@ -402,8 +539,9 @@ class RailsComponent(pulumi.ComponentResource):
             apply_immediately=True,
             publicly_accessible=True,
             tags=self.tags,
+            **instance_monitoring_args,
             opts=pulumi.ResourceOptions(parent=self,
-                                        depends_on=[self.rds_serverless_cluster],
+                                        depends_on=self.rds_instance_dependencies(self.rds_serverless_cluster),
                                         protect=True,
                                         ignore_changes=[
                                             'masterPassword', ##
@@ -413,15 +551,170 @@ class RailsComponent(pulumi.ComponentResource):
                                         ]),
         )
 
+        if self.rds_reader_max_count:
+            self.rds_readers()
+
         export("db_endpoint", Output.concat(self.rds_serverless_cluster.endpoint))
 
-    def get_database_url(self):
+    def rds_instance_monitoring_settings(self):
+        settings = {
+            "performance_insights": self.kwargs.get('rds_performance_insights', False),
+            "performance_insights_retention": self.kwargs.get('rds_performance_insights_retention', 7),
+            "performance_insights_kms_key_id": self.kwargs.get('rds_performance_insights_kms_key_id'),
+            "monitoring_interval": self.kwargs.get('rds_monitoring_interval', 0),
+        }
+        retention = settings["performance_insights_retention"]
+        if retention not in (7, 731) and retention % 31:
+            raise ValueError("rds_performance_insights_retention must be 7, 731 or a multiple of 31 days")
+        if settings["monitoring_interval"] not in (0, 1, 5, 10, 15, 30, 60):
+            raise ValueError("rds_monitoring_interval must be one of 0, 1, 5, 10, 15, 30 or 60 seconds")
+        return settings
+
+    def rds_cluster_performance_args(self):
+        args = {}
+        if self.rds_cluster_parameter_group:
+            args['db_cluster_parameter_group_name'] = self.rds_cluster_parameter_group.name
+        if self.db_performance_profile and self.db_performance_profile.cluster_storage_type is not None:
+            args['storage_type'] = self.db_performance_profile.cluster_storage_type
+        return args
+
+    def rds_instance_monitoring_args(self):
+        """
+        The parameter group, Performance Insights and enhanced monitoring arguments every cluster instance shares.
+        """
+        settings = self.rds_instance_monitoring
+        args = {}
+        if self.rds_instance_parameter_group:
+            args['db_parameter_group_name'] = self.rds_instance_parameter_group.name
+        if settings["performance_insights"]:
+            args.update(
+                performance_insights_enabled=True,
+                performance_insights_retention_period=settings["performance_insights_retention"],
+                performance_insights_kms_key_id=settings["performance_insights_kms_key_id"],
+            )
+        if settings["monitoring_interval"]:
+            if not self.rds_monitoring_role:
+                self.rds_monitoring_role = aws.iam.Role(
+                    qualify_component_name('rds_monitoring_role', self.kwargs),
+                    name=f"{self.namespace}-rds-monitoring-role",
+                    assume_role_policy=json.dumps(
+                        {
+                            "Version": "2012-10-17",
+                            "Statement": [
+                                {
+                                    "Effect": "Allow",
+                                    "Principal": {"Service": "monitoring.rds.amazonaws.com"},
+                                    "Action": "sts:AssumeRole",
+                                }
+                            ],
+                        }
+                    ),
+                    tags=self.tags,
+                    opts=pulumi.ResourceOptions(parent=self),
+                )
+                self.rds_monitoring_policy_attachment = aws.iam.RolePolicyAttachment(
+                    qualify_component_name('rds_monitoring_policy_attachment', self.kwargs),
+                    role=self.rds_monitoring_role.name,
+                    policy_arn="arn:aws:iam::aws:policy/service-role/AmazonRDSEnhancedMonitoringRole",
+                    opts=pulumi.ResourceOptions(parent=self),
+                )
+            args.update(
+                monitoring_interval=settings["monitoring_interval"],
+                monitoring_role_arn=self.rds_monitoring_role.arn,
+            )
+        return args
+
+    def rds_instance_dependencies(self, *resources):
+        """
+        An instance with enhanced monitoring can only be created once its role has the monitoring policy attached.
+        """
+        if self.rds_monitoring_policy_attachment:
+            return [*resources, self.rds_monitoring_policy_attachment]
+        return list(resources)
+
+    def rds_readers(self):
+        instance_monitoring_args = self.rds_instance_monitoring_args()
+        for index in range(self.rds_reader_count):
+            self.rds_reader_instances.append(aws.rds.ClusterInstance(
+                qualify_component_name(f'rds_serverless_cluster_reader_{index}', self.kwargs),
+                identifier=f'{self.namespace}-reader-{index}',
+                cluster_identifier=self.rds_serverless_cluster.cluster_identifier,
+                instance_class='db.serverless',
+                engine=self.rds_serverless_cluster.engine,
+                engine_version=self.rds_serverless_cluster.engine_version,
+                apply_immediately=True,
+                publicly_accessible=True,
+                # Tiers 0 and 1 scale with the writer, so a reader can take over without warming up
+                promotion_tier=1,
+                tags=self.tags,
+                **instance_monitoring_args,
+                opts=pulumi.ResourceOptions(parent=self,
+                                            depends_on=self.rds_instance_dependencies(
+                                                self.rds_serverless_cluster_instance)),
+            ))
+
+        if self.rds_reader_max_count == self.rds_reader_count:
+            return
+        # Application Auto Scaling counts the readers above and adds or removes its own beyond them
+        self.rds_reader_autoscaling_target = aws.appautoscaling.Target(
+            qualify_component_name('rds_reader_autoscaling_target', self.kwargs),
+            min_capacity=self.rds_reader_count,
+            max_capacity=self.rds_reader_max_count,
+            resource_id=Output.concat("cluster:", self.rds_serverless_cluster.cluster_identifier),
+            scalable_dimension="rds:cluster:ReadReplicaCount",
+            service_namespace="rds",
+            opts=pulumi.ResourceOptions(parent=self,
+                                        depends_on=[self.rds_serverless_cluster_instance, *self.rds_reader_instances]),
+        )
+        self.rds_reader_autoscaling_policy = aws.appautoscaling.Policy(
+            qualify_component_name('rds_reader_autoscaling_policy', self.kwargs),
+            name=f"{self.namespace}-rds-reader-autoscaling-policy",
+            policy_type="TargetTrackingScaling",
+            resource_id=self.rds_reader_autoscaling_target.resource_id,
+            scalable_dimension=self.rds_reader_autoscaling_target.scalable_dimension,
+            service_namespace=self.rds_reader_autoscaling_target.service_namespace,
+            target_tracking_scaling_policy_configuration=aws.appautoscaling.
+            PolicyTargetTrackingScalingPolicyConfigurationArgs(
+                target_value=self.kwargs.get('rds_reader_target_cpu_utilization', 60),
+                scale_out_cooldown=300,
+                scale_in_cooldown=600,
+                predefined_metric_specification=aws.appautoscaling.
+                PolicyTargetTrackingScalingPolicyConfigurationPredefinedMetricSpecificationArgs(
+                    predefined_metric_type="RDSReaderAverageCPUUtilization",
+                ),
+            ),
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+
+    def setup_rds_proxy(self, subnets):
+        settings = self.rds_proxy_settings if isinstance(self.rds_proxy_settings, dict) else {}
+        proxy_kwargs = {'namespace': self.kwargs['namespace']} if 'namespace' in self.kwargs else {}
+        self.rds_proxy = RdsProxyComponent(qualify_component_name("rds-proxy", self.kwargs),
+                                           pulumi.ResourceOptions(parent=self,
+                                                                  depends_on=[self.rds_serverless_cluster_instance]),
+                                           cluster=self.rds_serverless_cluster,
+                                           db_username=self.db_username,
+                                           db_password=self.db_password.result,
+                                           subnet_ids=subnets,
+                                           md5_hash_db_password=self.kwargs.get('md5_hash_db_password', False),
+                                           **proxy_kwargs,
+                                           **settings)
+        # Everything after the migration connects through the proxy
+        self.kwargs['env_vars'] = {
+            **self.kwargs['env_vars'],
+            'DATABASE_HOST': self.rds_proxy.endpoint,
+            'DB_HOST': self.rds_proxy.endpoint,
+            'DATABASE_URL': self.get_database_url(self.rds_proxy.endpoint),
+        }
+        export("db_proxy_endpoint", self.rds_proxy.endpoint)
+
+    def get_database_url(self, host=None):
         return Output.concat('postgres://',
                              self.db_username,
                              ':',
                              self.db_password.result,
                              '@',
-                             self.rds_serverless_cluster.endpoint,
+                             host or self.rds_serverless_cluster.endpoint,
                              ':5432/',
                              self.db_name)
 
@@ -443,5 +736,7 @@ class RailsComponent(pulumi.ComponentResource):
             web_container=self.web_container,
             ecs_cluster=self.ecs_cluster,
             rds_serverless_cluster_instance=self.rds_serverless_cluster_instance,
+            rds_reader_instances=self.rds_reader_instances,
+            performance_insights=self.rds_instance_monitoring["performance_insights"],
                                             opts=pulumi.ResourceOptions(parent=self, depends_on=self.ecs_cluster),
         )
@@ -0,0 +1,167 @@
+import json
+
+import pulumi
+import pulumi_aws as aws
+from pulumi import Output
+
+from strongmind_deployment.context import get_project_context
+from strongmind_deployment.util import qualify_component_name
+
+RDS_PROXY_DEFAULTS = {
+    "connection_borrow_timeout": 120,
+    "max_connections_percent": 90,
+    "max_idle_connections_percent": 50,
+    "idle_client_timeout": 1800,
+    "require_tls": False,
+}
+
+
+class RdsProxyComponent(pulumi.ComponentResource):
+    def __init__(self, name, opts=None, **kwargs):
+        """
+        Resource that pools connections to an Aurora PostgreSQL cluster through an RDS Proxy, so every task's
+        Puma or Sidekiq pool shares a bounded set of database connections instead of opening its own.
+
+        Rails should set `prepared_statements: false` in database.yml behind the proxy; prepared statements pin
+        a client to one database connection and undo the pooling.
+
+        :param name: The _unique_ name of the resource.
+        :param opts: A bag of optional settings that control this resource's behavior.
+        :key cluster: The aws.rds.Cluster to pool connections to.
+        :key db_username: The database user the proxy connects as.
+        :key db_password: The database user's password.
+        :key subnet_ids: The subnets to run the proxy in, the same ones the tasks run in.
+        :key md5_hash_db_password: Whether clients authenticate with MD5 rather than SCRAM. Defaults to False.
+        :key connection_borrow_timeout: Seconds a client waits for a pooled connection when every one is busy.
+            Defaults to 120.
+        :key max_connections_percent: The share of the cluster's max_connections the proxy may open. Defaults to 90.
+        :key max_idle_connections_percent: The share of the cluster's max_connections the proxy keeps open while
+            idle. Defaults to 50.
+        :key idle_client_timeout: Seconds before the proxy closes an idle client connection. Defaults to 1800.
+        :key require_tls: Whether clients must connect over TLS. Defaults to False.
+        """
+        super().__init__('strongmind:global_build:commons:rds-proxy', name, None, opts)
+        self.kwargs = kwargs
+        self.settings = {key: kwargs.get(key, default) for key, default in RDS_PROXY_DEFAULTS.items()}
+        if not 0 < self.settings["max_connections_percent"] <= 100:
+            raise ValueError("max_connections_percent must be between 1 and 100")
+        if not 0 <= self.settings["max_idle_connections_percent"] <= self.settings["max_connections_percent"]:
+            raise ValueError("max_idle_connections_percent must be between 0 and max_connections_percent")
+        self.cluster = kwargs.get('cluster')
+
+        project = pulumi.get_project()
+        stack = pulumi.get_stack()
+        self.namespace = kwargs.get('namespace', f"{project}-{stack}")
+        self.tags = get_project_context().tags
+
+        self.secret = aws.secretsmanager.Secret(
+            qualify_component_name("rds_proxy_secret", self.kwargs),
+            name=f"{self.namespace}-rds-proxy",
+            tags=self.tags,
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+        self.secret_version = aws.secretsmanager.SecretVersion(
+            qualify_component_name("rds_proxy_secret_version", self.kwargs),
+            secret_id=self.secret.arn,
+            secret_string=Output.json_dumps({
+                "username": kwargs.get('db_username'),
+                "password": kwargs.get('db_password'),
+            }),
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+
+        self.role = aws.iam.Role(
+            qualify_component_name("rds_proxy_role", self.kwargs),
+            name=f"{self.namespace}-rds-proxy-role",
+            assume_role_policy=json.dumps(
+                {
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Effect": "Allow",
+                            "Principal": {"Service": "rds.amazonaws.com"},
+                            "Action": "sts:AssumeRole",
+                        }
+                    ],
+                }
+            ),
+            tags=self.tags,
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+        self.role_policy = aws.iam.RolePolicy(
+            qualify_component_name("rds_proxy_role_policy", self.kwargs),
+            name=f"{self.namespace}-rds-proxy-policy",
+            role=self.role.id,
+            policy=Output.json_dumps(
+                {
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Action": ["secretsmanager:GetSecretValue"],
+                            "Effect": "Allow",
+                            "Resource": [self.secret.arn],
+                        }
+                    ],
+                }
+            ),
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+
+        # The proxy shares the cluster's security group, which the tasks can already reach; it also has to
+        # reach the cluster through that group
+        security_group_id = self.cluster.vpc_security_group_ids[0]
+        self.security_group_rule = aws.ec2.SecurityGroupRule(
+            qualify_component_name("rds_proxy_security_group_rule", self.kwargs),
+            type='ingress',
+            from_port=5432,
+            to_port=5432,
+            protocol='tcp',
+            security_group_id=security_group_id,
+            opts=pulumi.ResourceOptions(parent=self),
+            **{"self": True},
+        )
+
+        self.proxy = aws.rds.Proxy(
+            qualify_component_name("rds_proxy", self.kwargs),
+            name=self.namespace,
+            engine_family="POSTGRESQL",
+            role_arn=self.role.arn,
+            vpc_subnet_ids=kwargs.get('subnet_ids'),
+            vpc_security_group_ids=[security_group_id],
+            require_tls=self.settings["require_tls"],
+            idle_client_timeout=self.settings["idle_client_timeout"],
+            auths=[aws.rds.ProxyAuthArgs(
+                auth_scheme="SECRETS",
+                iam_auth="DISABLED",
+                client_password_auth_type="POSTGRES_MD5" if kwargs.get('md5_hash_db_password')
+                else "POSTGRES_SCRAM_SHA_256",
+                secret_arn=self.secret.arn,
+            )],
+            tags=self.tags,
+            opts=pulumi.ResourceOptions(parent=self, depends_on=[self.role_policy, self.secret_version]),
+        )
+        self.default_target_group = aws.rds.ProxyDefaultTargetGroup(
+            qualify_component_name("rds_proxy_default_target_group", self.kwargs),
+            db_proxy_name=self.proxy.name,
+            connection_pool_config=aws.rds.ProxyDefaultTargetGroupConnectionPoolConfigArgs(
+                connection_borrow_timeout=self.settings["connection_borrow_timeout"],
+                max_connections_percent=self.settings["max_connections_percent"],
+                max_idle_connections_percent=self.settings["max_idle_connections_percent"],
+                # Rails sets session variables on every new connection; without this each one would be pinned
+                session_pinning_filters=["EXCLUDE_VARIABLE_SETS"],
+            ),
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+        self.target = aws.rds.ProxyTarget(
+            qualify_component_name("rds_proxy_target", self.kwargs),
+            db_proxy_name=self.proxy.name,
+            target_group_name=self.default_target_group.name,
+            db_cluster_identifier=self.cluster.cluster_identifier,
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+
+        self.register_outputs({})
+
+    @property
+    def endpoint(self):
+        return self.proxy.endpoint
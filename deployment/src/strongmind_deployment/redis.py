@@ -1,10 +1,11 @@
 import os
-import subprocess
 
 import pulumi
 import pulumi_aws as aws
 from pulumi import Output
 
+from strongmind_deployment.context import get_project_context
+
 
 class RedisComponent(pulumi.ComponentResource):
     def __init__(self, name, opts=None, **kwargs):
@@ -21,18 +22,7 @@ class RedisComponent(pulumi.ComponentResource):
         stack = pulumi.get_stack()
         self.namespace = self.kwargs.get('namespace', f"{project}-{stack}")
 
-        path = subprocess.check_output(['git', 'rev-parse', '--show-toplevel']).decode('utf-8').strip()
-        file_path = f"{path}/CODEOWNERS"
-        with open(file_path, 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        self.tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+        self.tags = get_project_context().tags
         dependencies = []
         if hasattr(self, 'parameter_group'):
             dependencies.append(self.parameter_group)
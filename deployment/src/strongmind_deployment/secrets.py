@@ -3,7 +3,8 @@ import pulumi_aws as aws
 from pulumi import Output
 import os
 import json
-import subprocess
+
+from strongmind_deployment.context import get_project_context
 
 
 class SecretsComponent(pulumi.ComponentResource):
@@ -24,18 +25,7 @@ class SecretsComponent(pulumi.ComponentResource):
         stack = pulumi.get_stack()
         self.namespace = kwargs.get('namespace', f"{project}-{stack}")
 
-        path = subprocess.check_output(['git', 'rev-parse', '--show-toplevel']).decode('utf-8').strip()
-        file_path = f"{path}/CODEOWNERS"
-        with open(file_path, 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        self.tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+        self.tags = get_project_context().tags
 
         self.sm_secret = aws.secretsmanager.Secret(
             f"{self.namespace}-secrets",
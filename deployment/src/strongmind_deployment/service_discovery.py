@@ -0,0 +1,85 @@
+import json
+import time
+from typing import List, Optional, Tuple
+
+import pulumi
+from botocore.exceptions import ClientError
+
+from strongmind_deployment.aws_clients import get_client
+from strongmind_deployment.local_cache import aws_scope, read_private, user_cache_path, write_private
+
+DESCRIBE_SERVICES_BATCH_SIZE = 10
+ECS_REGION = 'us-west-2'
+DEFAULT_CACHE_PATH = user_cache_path('desired_counts.json')
+
+
+def find_desired_count(cluster: str,
+                       service_names: List[str],
+                       ecs_client=None,
+                       cache_ttl: int = 0,
+                       cache_path: str = DEFAULT_CACHE_PATH) -> Optional[Tuple[str, int]]:
+    """
+    Looks up the desired count of the first existing service in `service_names`.
+
+    All candidates are described together, up to ten per `describe_services` call, so the
+    lookup costs one round trip instead of one per candidate.
+
+    :param cluster: The name or ARN of the ECS cluster.
+    :param service_names: Candidate service names in order of preference.
+    :param ecs_client: The ECS client to use. Defaults to the shared us-west-2 client.
+    :param cache_ttl: Seconds to reuse a previous answer from `cache_path`. Disabled when 0.
+    :param cache_path: The JSON file the answers are cached in, keyed by cluster, services, region and
+                       credentials. Only read when it belongs to the current user with mode 0600.
+    :return: A tuple of the service name and its desired count, or None if none exist.
+    """
+    ecs_client = ecs_client or get_client('ecs', ECS_REGION)
+    cache_key = json.dumps([cluster, service_names, ecs_client.meta.region_name, *aws_scope()])
+    if cache_ttl:
+        cached = _read_cache(cache_path).get(cache_key)
+        if cached and cached['expires_at'] > time.time():
+            pulumi.log.info(f"Using cached desired count for service {cached['service']}: {cached['desired_count']}")
+            return cached['service'], cached['desired_count']
+
+    found = {}
+    for start in range(0, len(service_names), DESCRIBE_SERVICES_BATCH_SIZE):
+        batch = service_names[start:start + DESCRIBE_SERVICES_BATCH_SIZE]
+        try:
+            response = ecs_client.describe_services(cluster=cluster, services=batch)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in ['ClusterNotFoundException', 'ServiceNotFoundException']:
+                pulumi.log.info(f"Services {batch} not found: {e}")
+            else:
+                pulumi.log.warn(f"Unexpected error checking services {batch}: {str(e)}")
+            continue
+        for service in response.get('services', []):
+            found[service['serviceName']] = service['desiredCount']
+
+    for service_name in service_names:
+        if service_name in found:
+            desired_count = found[service_name]
+            pulumi.log.info(f"Found service {service_name} with desired count: {desired_count}")
+            if cache_ttl:
+                _write_cache(cache_path, cache_key, {
+                    'service': service_name,
+                    'desired_count': desired_count,
+                    'expires_at': time.time() + cache_ttl,
+                })
+            return service_name, desired_count
+    return None
+
+
+def _read_cache(cache_path):
+    try:
+        return read_private(cache_path, json.load, 'r') or {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache_path, key, entry):
+    cache = {k: v for k, v in _read_cache(cache_path).items() if v['expires_at'] > time.time()}
+    cache[key] = entry
+    try:
+        write_private(cache_path, lambda file: json.dump(cache, file), 'w')
+    except OSError as e:
+        pulumi.log.warn(f"Could not write desired count cache {cache_path}: {e}")
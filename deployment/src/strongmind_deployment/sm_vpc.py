@@ -5,6 +5,8 @@ import re
 import os
 import ipaddress
 
+from strongmind_deployment.context import get_project_context
+
 class VpcComponent(pulumi.ComponentResource):
     def __init__(self, name, **kwargs):
         super().__init__("custom:module:VPC", name, {})
@@ -25,24 +27,11 @@ class VpcComponent(pulumi.ComponentResource):
         self.env_name = os.environ.get('ENVIRONMENT_NAME', 'stage')
         project = pulumi.get_project()
         stack = pulumi.get_stack()
-        with open('../CODEOWNERS', 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+        tags = get_project_context().tags
 
         def standard_tags(extra_tags:dict):
             return {
-                "product": project,
-                "repository": project,
-                "service": project,
-                "environment": self.env_name,
-                "owner": owning_team,
+                **tags,
                 **extra_tags,
             }
 
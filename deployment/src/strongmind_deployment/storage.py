@@ -1,10 +1,10 @@
 import os
-import subprocess
 
 import pulumi
 import pulumi_aws as aws
 import json
 
+from strongmind_deployment.context import get_project_context
 from strongmind_deployment.util import qualify_component_name
 
 
@@ -16,18 +16,8 @@ class StorageComponent(pulumi.ComponentResource):
         project = pulumi.get_project()
         stack = pulumi.get_stack()
         bucket_name = f"strongmind-{project}-{stack}"
-        path = subprocess.check_output(['git', 'rev-parse', '--show-toplevel']).decode('utf-8').strip()
-        file_path = f"{path}/CODEOWNERS"
-        with open(file_path, 'r') as file:
-            owning_team = [line.strip().split('@')[-1] for line in file if '@' in line][-1].split('/')[1]
-
-        tags = {
-            "product": project,
-            "repository": project,
-            "service": project,
-            "environment": self.env_name,
-            "owner": owning_team,
-        }
+
+        tags = get_project_context().tags
         self.bucket = aws.s3.BucketV2(qualify_component_name("bucket", self.kwargs),
                                       bucket=bucket_name,
                                       tags=tags
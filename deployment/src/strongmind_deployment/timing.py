@@ -0,0 +1,245 @@
+import atexit
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import pulumi
+
+
+class ResourceTiming:
+    """
+    What we know about how long one resource took, from the program and from the engine.
+
+    registration_seconds is the time the program spent between asking for this resource and asking for the
+    next one: the constructor, any blocking invokes and the kwargs plumbing around it. For a component it
+    covers everything up to its last descendant. provisioning_seconds is the time the engine spent on the
+    create or update step, and is only known once engine events have been recorded.
+    """
+    def __init__(self, type_: str, name: str, parent: Optional[str] = None, started_at: float = 0.0,
+                 is_component: bool = False):
+        self.type_ = type_
+        self.name = name
+        self.parent = parent
+        self.is_component = is_component
+        self.started_at = started_at
+        self.registration_seconds: Optional[float] = None
+        self.operation: Optional[str] = None
+        self.provisioning_seconds: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        return resource_key(self.type_, self.name)
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type_,
+            "name": self.name,
+            "parent": self.parent,
+            "registration_seconds": self.registration_seconds,
+            "operation": self.operation,
+            "provisioning_seconds": self.provisioning_seconds,
+        }
+
+
+def resource_key(type_: str, name: str) -> str:
+    return f"{type_}::{name}"
+
+
+def key_from_urn(urn: str) -> str:
+    """
+    Turn `urn:pulumi:stack::project::parent$type::name` into the `type::name` key used in reports.
+    """
+    qualified_type, name = urn.split("::")[2:4] if urn.count("::") >= 3 else ("", urn)
+    return resource_key(qualified_type.split("$")[-1], name)
+
+
+class TimingRecorder:
+    """
+    Records registration and provisioning durations for every resource in a stack.
+
+    Registration times come from a stack transformation, so they are recorded during `pulumi up` or
+    `pulumi preview` with no changes to components. Provisioning times come from engine events, which the
+    program never sees; feed them in from the automation API (`stack.up(on_event=recorder.on_event)`) or
+    from a `pulumi up --event-log` file with `load_event_log`.
+    """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.resources: Dict[str, ResourceTiming] = {}
+        self.order: List[str] = []
+        self.pending_steps: Dict[str, tuple] = {}
+
+    def transform(self, args: pulumi.ResourceTransformationArgs):
+        now = self.clock()
+        self.close_last_registration(now)
+        parent = None
+        if args.opts and args.opts.parent is not None and args.opts.parent._type != "pulumi:pulumi:Stack":
+            parent = resource_key(args.opts.parent._type, args.opts.parent._name)
+        timing = ResourceTiming(args.type_, args.name, parent, now,
+                                is_component=isinstance(args.resource, pulumi.ComponentResource))
+        self.resources[timing.key] = timing
+        self.order.append(timing.key)
+        return None
+
+    def close_last_registration(self, now: float):
+        if self.order:
+            last = self.resources[self.order[-1]]
+            if last.registration_seconds is None:
+                last.registration_seconds = now - last.started_at
+
+    def finish(self):
+        """
+        Close out the last registration and roll child time up into each component.
+        """
+        now = self.clock()
+        self.close_last_registration(now)
+        ends = {key: timing.started_at + (timing.registration_seconds or 0)
+                for key, timing in self.resources.items()}
+        for key in reversed(self.order):
+            timing = self.resources[key]
+            if timing.parent in ends:
+                ends[timing.parent] = max(ends[timing.parent], ends[key])
+        for key, timing in self.resources.items():
+            if timing.is_component:
+                timing.registration_seconds = ends[key] - timing.started_at
+
+    def on_event(self, event):
+        """
+        Record one engine event. Accepts automation API `EngineEvent`s and the dicts of an event log.
+        """
+        if not isinstance(event, dict):
+            event = _engine_event_to_dict(event)
+        pre = event.get("resourcePreEvent")
+        done = event.get("resOutputsEvent") or event.get("resOpFailedEvent")
+        if pre:
+            metadata = pre["metadata"]
+            self.pending_steps[metadata["urn"]] = (metadata["op"], event["timestamp"])
+        elif done and done["metadata"]["urn"] in self.pending_steps:
+            op, started = self.pending_steps.pop(done["metadata"]["urn"])
+            key = key_from_urn(done["metadata"]["urn"])
+            timing = self.resources.get(key)
+            if timing is None:
+                type_, name = key.split("::", 1)
+                timing = self.resources[key] = ResourceTiming(type_, name)
+                self.order.append(key)
+            timing.operation = op
+            timing.provisioning_seconds = event["timestamp"] - started
+
+    def load_event_log(self, path: str):
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    self.on_event(json.loads(line))
+
+    def report(self) -> dict:
+        resources = [self.resources[key] for key in self.order]
+        return {
+            "components": [t.to_dict() for t in resources if t.is_component],
+            "resources": [t.to_dict() for t in resources if not t.is_component],
+        }
+
+    def summary(self) -> str:
+        """
+        A plain text table of every timed resource, slowest first.
+        """
+        rows = []
+        for timing in self.resources.values():
+            rows.append((timing.provisioning_seconds or 0, timing.registration_seconds or 0, timing))
+        rows.sort(key=lambda row: (row[0], row[1]), reverse=True)
+        lines = [f"{'provision s':>12} {'register s':>11} {'operation':>10}  resource"]
+        for provisioning, registration, timing in rows:
+            lines.append(f"{provisioning:12.2f} {registration:11.3f} {timing.operation or '-':>10}  {timing.key}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Write the JSON report to `path` and the text summary next to it with a .txt extension.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2, sort_keys=True)
+        with open(f"{os.path.splitext(path)[0]}.txt", "w") as file:
+            file.write(self.summary())
+
+    @classmethod
+    def from_report(cls, report: dict) -> "TimingRecorder":
+        recorder = cls()
+        entries = [(entry, True) for entry in report["components"]] + \
+                  [(entry, False) for entry in report["resources"]]
+        for entry, is_component in entries:
+            timing = ResourceTiming(entry["type"], entry["name"], entry["parent"], is_component=is_component)
+            timing.registration_seconds = entry["registration_seconds"]
+            timing.operation = entry["operation"]
+            timing.provisioning_seconds = entry["provisioning_seconds"]
+            recorder.resources[timing.key] = timing
+            recorder.order.append(timing.key)
+        return recorder
+
+
+def _engine_event_to_dict(event) -> dict:
+    def step(inner):
+        return {"metadata": {"urn": inner.metadata.urn, "op": str(inner.metadata.op.value)}}
+
+    result = {"timestamp": event.timestamp}
+    if event.resource_pre_event:
+        result["resourcePreEvent"] = step(event.resource_pre_event)
+    if event.res_outputs_event:
+        result["resOutputsEvent"] = step(event.res_outputs_event)
+    if event.res_op_failed_event:
+        result["resOpFailedEvent"] = step(event.res_op_failed_event)
+    return result
+
+
+def register_timing(report_path: str = None) -> Optional[TimingRecorder]:
+    """
+    Opt-in entrypoint. Times the registration of every resource in the stack and writes a report when the
+    program exits. Register it next to the auto-tagging setup:
+
+    Example:
+    ```python
+        from strongmind_deployment import autotag, timing
+
+        autotag.add_standard_billing_tags(extra_tags)
+        timing.register_timing()
+    ```
+
+    :param report_path: Where to write the JSON report. Defaults to the STRONGMIND_TIMING_REPORT environment
+                        variable; nothing is recorded when neither is set.
+    """
+    report_path = report_path or os.environ.get("STRONGMIND_TIMING_REPORT")
+    if not report_path:
+        return None
+
+    recorder = TimingRecorder()
+    # A stack transformation runs inside each resource's constructor, while the program builds the stack.
+    # Resource transforms are engine callbacks that only run once the RPCs go out after the program body, so
+    # their timestamps would not say which resource was slow to register.
+    pulumi.runtime.register_stack_transformation(recorder.transform)
+
+    def write_report():
+        recorder.finish()
+        recorder.write(report_path)
+
+    atexit.register(write_report)
+    return recorder
+
+
+def merge_event_log(report_path: str, event_log_path: str, output_path: str = None):
+    """
+    Add the engine's create and update durations from a `pulumi up --event-log` file to a registration report.
+    """
+    with open(report_path) as file:
+        recorder = TimingRecorder.from_report(json.load(file))
+    recorder.load_event_log(event_log_path)
+    recorder.write(output_path or report_path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) not in (3, 4):
+        print("usage: python -m strongmind_deployment.timing REPORT.json EVENT_LOG.jsonl [OUTPUT.json]")
+        sys.exit(2)
+    merge_event_log(*sys.argv[1:])
@@ -1,6 +1,23 @@
+from enum import Enum
+
 import pulumi
 import pulumi_aws as aws
 
+from strongmind_deployment.invoke_cache import cached_invoke
+
+
+class CpuArchitecture(str, Enum):
+    """
+    The CPU architecture a Fargate task runs on. ARM64 runs on Graviton and needs an arm64 (or multi-arch) image.
+    """
+
+    X86_64 = "X86_64"
+    ARM64 = "ARM64"
+
+    def __str__(self):
+        return self.value
+
+
 def get_project_stack() -> str:
     """
     Typically used in pulumi logical and physical resource naming
@@ -21,7 +38,7 @@ def get_account_stack_name(force_stack: str = None) -> str:
     """
     Typically used to retrieve a Pulumi stack reference for the current account stack.
     """
-    alias = aws.iam.get_account_alias().account_alias
+    alias = cached_invoke(aws.iam.get_account_alias).account_alias
     account_stack_name = alias.replace("-","_")
     account_stack = force_stack or account_stack_name
     return f"organization/account/{account_stack}"
@@ -1,7 +1,8 @@
 from enum import Enum
 import pulumi
 import pulumi_aws as aws
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence
+from strongmind_deployment.invoke_cache import cached_invoke
 from strongmind_deployment.subnet import SubnetSpec, SubnetType
 
 
@@ -42,6 +43,7 @@ class VpcComponent(pulumi.ComponentResource):
     public_subnets: List[aws.ec2.Subnet] = []
     private_subnets: List[aws.ec2.Subnet] = []
     database_subnets: List[aws.ec2.Subnet] = []
+    subnet_ids_by_az: Dict[SubnetType, Dict[str, pulumi.Output[str]]]
 
     def __init__(self, name, args: VpcComponentArgs, opts=None):
         super().__init__("strongmind:global_build:commons:vpc", name, {}, opts)
@@ -49,7 +51,8 @@ class VpcComponent(pulumi.ComponentResource):
         self.vpc_name = name
         self.subnet_specs = SubnetSpec.get_standard_subnet_specs(args.cidr_block)
         self.args: VpcComponentArgs = args
-        self.azs = aws.get_availability_zones(state="available").names[:3]
+        self.subnet_ids_by_az = {}
+        self.azs = cached_invoke(aws.get_availability_zones, state="available").names[:3]
         self.validate_args()
         self.create_resources()
 
@@ -151,7 +154,8 @@ class VpcComponent(pulumi.ComponentResource):
             )
 
             public_subnets.append(public_subnet)
-            self.public_subnets = public_subnets
+            self.track_subnet(SubnetType.PUBLIC, az, public_subnet)
+        return public_subnets
 
     def create_private_subnets(self):
         private_subnets = []
@@ -182,9 +186,7 @@ class VpcComponent(pulumi.ComponentResource):
                 # However, this property will persist outside the for loop, and be assigned
                 # to other Subnets.
                 # get the public subnet for the same AZ
-                public_subnet_id = self.get_subnet_in_az(
-                    self.vpc.id, SubnetType.PUBLIC, az
-                )
+                public_subnet_id = self.subnet_ids_by_az[SubnetType.PUBLIC][az]
                 recently_created_nat_gateway = self.create_nat_gateway(
                     az=az,
                     public_subnet_id=public_subnet_id,
@@ -215,6 +217,7 @@ class VpcComponent(pulumi.ComponentResource):
                 )
 
             private_subnets.append(private_subnet.id)
+            self.track_subnet(SubnetType.PRIVATE, az, private_subnet)
         return private_subnets
 
     def create_nat_gateway(self, az, public_subnet_id):
@@ -259,8 +262,18 @@ class VpcComponent(pulumi.ComponentResource):
                 opts=self.child_opts,
             )
             database_subnets.append(database_subnet.id)
+            self.track_subnet(SubnetType.ISOLATED, az, database_subnet)
         return database_subnets
 
+    def track_subnet(self, placement: SubnetType, az: str, subnet: aws.ec2.Subnet):
+        self.subnet_ids_by_az.setdefault(placement, {})[az] = subnet.id
+
+    def subnet_ids(self, placement: SubnetType) -> List[pulumi.Output[str]]:
+        """
+        Get the ids of the subnets this component created for a given subnet type, in AZ order.
+        """
+        return list(self.subnet_ids_by_az.get(placement, {}).values())
+
     def create_vpce_security_group(self):
 
         vpce_sg = aws.ec2.SecurityGroup(
@@ -293,7 +306,7 @@ class VpcComponent(pulumi.ComponentResource):
         return self.create_private_link_interface(service_name, placement)
 
     def create_private_link_gateway(self, service_name: str) -> aws.ec2.VpcEndpoint:
-        region = aws.get_region().name
+        region = cached_invoke(aws.get_region).name
         return aws.ec2.VpcEndpoint(
             f"{service_name}-gateway",
             vpc_id=self.vpc.id,
@@ -309,8 +322,8 @@ class VpcComponent(pulumi.ComponentResource):
         service_name: str,
         subnet_type: SubnetType = SubnetType.PRIVATE,
     ) -> aws.ec2.VpcEndpoint:
-        region = aws.get_region().name
-        target_subnet_ids = self.get_subnets(self.vpc.id, subnet_type)
+        region = cached_invoke(aws.get_region).name
+        target_subnet_ids = self.subnet_ids(subnet_type)
         return aws.ec2.VpcEndpoint(
             f"{service_name}-interface",
             vpc_id=self.vpc.id,
@@ -326,11 +339,13 @@ class VpcComponent(pulumi.ComponentResource):
         )
 
     @staticmethod
-    def get_subnets(vpc_id: str, placement: SubnetType) -> Sequence[str]:
+    def get_subnets(vpc_id: pulumi.Input[str], placement: SubnetType) -> pulumi.Output[Sequence[str]]:
         """
-        Get the subnet ids for a given subnet type.
+        Get the subnet ids for a given subnet type in a VPC this component does not own.
+
+        The lookup resolves as an Output, so resources that take the ids register without waiting on it.
         """
-        subnets_result: aws.ec2.AwaitableGetSubnetsResult = aws.ec2.get_subnets(
+        subnets_result = aws.ec2.get_subnets_output(
             filters=[
                 aws.ec2.GetSubnetsFilterArgs(
                     name="vpc-id",
@@ -346,11 +361,11 @@ class VpcComponent(pulumi.ComponentResource):
         return subnets_result.ids
 
     @staticmethod
-    def get_subnet_in_az(vpc_id: str, placement: SubnetType, az: str) -> str:
+    def get_subnet_in_az(vpc_id: pulumi.Input[str], placement: SubnetType, az: str) -> pulumi.Output[str]:
         """
-        Get the subnet id for a given subnet type and availability zone.
+        Get the subnet id for a given subnet type and availability zone in a VPC this component does not own.
         """
-        subnets_result: aws.ec2.AwaitableGetSubnetsResult = aws.ec2.get_subnets(
+        subnets_result = aws.ec2.get_subnets_output(
             filters=[
                 aws.ec2.GetSubnetsFilterArgs(
                     name="vpc-id",
@@ -1,8 +1,17 @@
 import pulumi
 import pulumi_aws as aws
 
+from strongmind_deployment.capacity_plan import CapacityPlan
+from strongmind_deployment.capacity_schedule import create_scheduled_actions
+from strongmind_deployment.predictive_scaling import PredictiveScalingConfiguration, create_predictive_scaling_policy
 from strongmind_deployment.util import qualify_component_name
 
+# Scale-out tiers start where queue latency passes the threshold, then at 2x and 5x it
+SCALE_OUT_TIER_MULTIPLES = (0, 1, 4)
+DEFAULT_SCALE_OUT_STEPS = (1, 4, 10)
+DEFAULT_SCALE_OUT_PERCENTS = (25, 50, 100)
+SCALE_OUT_ADJUSTMENTS = ("tiered", "percent")
+
 
 class WorkerAutoscaleComponent(pulumi.ComponentResource):
     def __init__(self, name, opts=None, **kwargs):
@@ -10,6 +19,35 @@ class WorkerAutoscaleComponent(pulumi.ComponentResource):
         :key worker_max_number_of_instances: The maximum number of instances available in the scaling policy for the worker.
         :key worker_min_number_of_instances: The minimum number of instances available in the scaling policy for the worker.
         :key worker_autoscale_threshold: The threshold for the worker autoscaling policy. Default is 3.
+        :key capacity_schedule: A list of capacity windows that raise the "worker" min/max ahead of known traffic.
+            See capacity_schedule.CapacityWindow. Defaults to `[]`.
+        :key worker_capacity_plan: Measured throughput to derive the worker min/max capacity and scale-out step sizes
+            from: `{"per_task_jobs_per_second": 5, "peak_jobs_per_second": 200, "baseline_jobs_per_second": 10,
+            "headroom": 0.25}`. See capacity_plan.CapacityPlan. Defaults to None.
+        :key worker_scale_out_adjustment: "tiered" adds a fixed number of tasks per tier, "percent" grows the service by a
+            share of its size. The tiers start where queue latency passes max_queue_latency_threshold, then at 2x and
+            5x it. Defaults to "tiered".
+        :key worker_scale_out_steps: The tasks to add in each of the three tiers. Defaults to (1, 4, 10), or steps derived
+            from worker_capacity_plan.
+        :key worker_scale_out_percents: The percentages to grow by in each tier with "percent", adding at least the first
+            tiered step. Defaults to (25, 50, 100).
+        :key worker_scale_out_cooldown: Seconds between scale-outs. Defaults to 60.
+        :key worker_scale_in_step: The tasks to remove each time the queue is quiet. Defaults to 1.
+        :key worker_scale_in_cooldown: Seconds between scale-ins. Defaults to 60.
+        :key worker_scale_to_zero: Whether the worker drops to 0 tasks when the queue has been idle and wakes when work
+            arrives. The wake metric must be published from outside the worker, e.g. by the web container, since an
+            idle worker publishes nothing. Defaults to False.
+        :key worker_idle_minutes: How long the queue must be idle before the worker drops to 0. Defaults to 30.
+        :key worker_wake_metric_name: The queue metric, in the same namespace and dimensions as the scaling metric, that
+            wakes the worker when it is above worker_wake_threshold, e.g. "EnqueuedJobs". Required with
+            worker_scale_to_zero, since the scaling metric goes quiet with the worker.
+        :key worker_wake_threshold: The wake metric value above which there is work to do. Defaults to 0.
+        :key worker_pool: The name of the worker pool this service runs, which names its scaling resources and its
+            capacity window entry ("worker-<pool>"). See worker_pools.WorkerPool. Defaults to None.
+        :key worker_queues: The Sidekiq queues to scale on, each published as MaxQueueLatency with a QueueName
+            dimension. Several queues scale on the highest latency. Defaults to None (QueueName "AllQueues").
+        :key worker_predictive_scaling: A dictionary (or PredictiveScalingConfiguration) that adds a predictive scaling
+            policy on "cpu" or "memory" alongside the queue latency policies. Defaults to None.
         """
         super().__init__('strongmind:global_build:commons:worker-autoscale', name, None, opts)
         self.fargate_service = kwargs.get('fargate_service')
@@ -19,10 +57,38 @@ class WorkerAutoscaleComponent(pulumi.ComponentResource):
         self.worker_autoscaling_out_alarm = None
         self.worker_autoscaling_out_policy = None
         self.worker_autoscaling_target = None
+        self.worker_scheduled_actions = []
+        self.worker_predictive_scaling = PredictiveScalingConfiguration.from_kwarg(
+            kwargs.get('worker_predictive_scaling'))
+        self.worker_predictive_scaling_policy = None
         self.kwargs = kwargs
+        self.worker_pool = kwargs.get('worker_pool')
+        self.worker_key = f"worker-{self.worker_pool}" if self.worker_pool else "worker"
         self.namespace = kwargs.get("namespace", f"{pulumi.get_project()}-{pulumi.get_stack()}")
         self.worker_max_capacity = kwargs.get('worker_max_number_of_instances', 65)
         self.worker_min_capacity = kwargs.get('worker_min_number_of_instances', 1)
+        self.worker_scale_out_steps = DEFAULT_SCALE_OUT_STEPS
+        self.worker_capacity_plan = CapacityPlan.for_worker(kwargs.get('worker_capacity_plan'))
+        self.worker_capacity_summary = None
+        if self.worker_capacity_plan:
+            floor = self.worker_min_capacity
+            self.worker_capacity_summary = self.worker_capacity_plan.summary(self.worker_key, floor)
+            self.worker_min_capacity = self.worker_capacity_plan.min_capacity(floor)
+            self.worker_max_capacity = self.worker_capacity_plan.max_capacity(floor)
+            small, large = self.worker_capacity_plan.scale_out_steps(floor)
+            self.worker_scale_out_steps = (small, large, min(large * 2, self.worker_max_capacity))
+        self.worker_scale_out_steps = tuple(kwargs.get('worker_scale_out_steps', self.worker_scale_out_steps))
+        self.worker_scale_out_percents = tuple(kwargs.get('worker_scale_out_percents', DEFAULT_SCALE_OUT_PERCENTS))
+        self.worker_scale_out_adjustment = kwargs.get('worker_scale_out_adjustment', "tiered")
+        if self.worker_scale_out_adjustment not in SCALE_OUT_ADJUSTMENTS:
+            raise ValueError(f"worker_scale_out_adjustment must be one of {', '.join(SCALE_OUT_ADJUSTMENTS)}")
+        for name, steps in (("worker_scale_out_steps", self.worker_scale_out_steps),
+                            ("worker_scale_out_percents", self.worker_scale_out_percents)):
+            if len(steps) != len(SCALE_OUT_TIER_MULTIPLES) or min(steps) < 1:
+                raise ValueError(f"{name} needs {len(SCALE_OUT_TIER_MULTIPLES)} positive steps")
+        self.worker_scale_out_cooldown = kwargs.get('worker_scale_out_cooldown', 60)
+        self.worker_scale_in_step = kwargs.get('worker_scale_in_step', 1)
+        self.worker_scale_in_cooldown = kwargs.get('worker_scale_in_cooldown', 60)
         self.scaling_threshold = kwargs.get('max_queue_latency_threshold', 60)
         self.alert_threshold = kwargs.get('alert_threshold', 18000)
         self.sns_topic_arn = kwargs.get('sns_topic_arn')
@@ -30,6 +96,22 @@ class WorkerAutoscaleComponent(pulumi.ComponentResource):
         self.metric_name = "JobStaleness" if self.canvas else "MaxQueueLatency"
         self.dimensions = {'domain': f'{self.namespace}.strongmind.com'} if self.canvas else {"QueueName": "AllQueues"}
         self.alarm_namespace = "Canvas" if self.canvas else self.namespace
+        self.worker_queues = kwargs.get('worker_queues')
+        self.queue_dimensions = [{"QueueName": queue} for queue in self.worker_queues] if self.worker_queues \
+            else [self.dimensions]
+        self.worker_scale_to_zero = kwargs.get('worker_scale_to_zero', False)
+        self.worker_idle_minutes = kwargs.get('worker_idle_minutes', 30)
+        self.worker_wake_metric_name = kwargs.get('worker_wake_metric_name')
+        if self.worker_scale_to_zero and not self.worker_wake_metric_name:
+            raise ValueError("worker_scale_to_zero needs a worker_wake_metric_name published from outside the worker")
+        self.worker_wake_threshold = kwargs.get('worker_wake_threshold', 0)
+        # With scale to zero the target may go to 0, and worker_min_number_of_instances becomes the floor the queue
+        # latency policies scale between while the worker is awake
+        self.worker_target_min_capacity = 0 if self.worker_scale_to_zero else self.worker_min_capacity
+        self.worker_wake_alarm = None
+        self.worker_wake_policy = None
+        self.worker_idle_alarm = None
+        self.worker_idle_policy = None
         self.worker_autoscaling()
 
 
@@ -37,10 +119,13 @@ class WorkerAutoscaleComponent(pulumi.ComponentResource):
 
         fargate_service_id = self.fargate_service.service.id.apply(lambda x: x.split(":")[-1])
 
+        if self.worker_capacity_summary:
+            pulumi.log.info(self.worker_capacity_summary, resource=self)
+
         self.worker_autoscaling_target = aws.appautoscaling.Target(
-            qualify_component_name("worker_autoscaling_target", self.kwargs),
+            qualify_component_name(f"{self.worker_key}_autoscaling_target", self.kwargs),
             max_capacity=self.worker_max_capacity,
-            min_capacity=self.worker_min_capacity,
+            min_capacity=self.worker_target_min_capacity,
             resource_id=fargate_service_id,
             scalable_dimension="ecs:service:DesiredCount",
             service_namespace="ecs",
@@ -48,86 +133,67 @@ class WorkerAutoscaleComponent(pulumi.ComponentResource):
                 parent=self,
             )
         )
+        self.worker_scheduled_actions = create_scheduled_actions(self.worker_key, self.worker_autoscaling_target,
+                                                                 self.worker_target_min_capacity,
+                                                                 self.worker_max_capacity,
+                                                                 self.namespace, self.kwargs, self)
+        self.worker_predictive_scaling_policy = create_predictive_scaling_policy(
+            self.worker_key, self.worker_autoscaling_target, self.worker_predictive_scaling, self.namespace, self.kwargs, self)
         self.worker_autoscaling_out_policy = aws.appautoscaling.Policy(
-            qualify_component_name("worker_autoscaling_out_policy", self.kwargs),
-            name=f"{self.namespace}-worker-autoscaling-out-policy",
+            qualify_component_name(f"{self.worker_key}_autoscaling_out_policy", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-autoscaling-out-policy",
             policy_type="StepScaling",
             resource_id=self.worker_autoscaling_target.resource_id,
             scalable_dimension=self.worker_autoscaling_target.scalable_dimension,
             service_namespace=self.worker_autoscaling_target.service_namespace,
-            step_scaling_policy_configuration=aws.appautoscaling.PolicyStepScalingPolicyConfigurationArgs(
-                adjustment_type="ChangeInCapacity",
-                cooldown=60,
-                metric_aggregation_type="Maximum",
-                step_adjustments=[
-                    aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
-                        metric_interval_upper_bound="600",
-                        metric_interval_lower_bound="0",
-                        scaling_adjustment=1,
-                    ),
-                    aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
-                        metric_interval_lower_bound="600",
-                        scaling_adjustment=1,
-                    )
-                ],
-            ),
+            step_scaling_policy_configuration=self.scale_out_configuration(),
             opts=pulumi.ResourceOptions(
                 parent=self,
             )
         )
 
         self.worker_autoscaling_out_alarm = aws.cloudwatch.MetricAlarm(
-            qualify_component_name("worker_autoscaling_out_alarm", self.kwargs),
-            name=f"{self.namespace}-worker-auto-scaling-out-alarm",
+            qualify_component_name(f"{self.worker_key}_autoscaling_out_alarm", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-auto-scaling-out-alarm",
             comparison_operator="GreaterThanThreshold",
             evaluation_periods=1,
-            metric_name=self.metric_name,
-            unit="Seconds",
-            dimensions=self.dimensions,
-            namespace=self.alarm_namespace,
-            period=60,
-            statistic="Maximum",
             threshold=self.scaling_threshold,
             alarm_actions=[self.worker_autoscaling_out_policy.arn],
             opts=pulumi.ResourceOptions(
                 parent=self,
-            )
+            ),
+            **self.latency_metric()
         )
 
         self.worker_queue_latency_alarm = aws.cloudwatch.MetricAlarm(
-            qualify_component_name("worker_queue_latency_alarm", self.kwargs),
-            name=f"{self.namespace}-worker-queue-latency-alarm",
+            qualify_component_name(f"{self.worker_key}_queue_latency_alarm", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-queue-latency-alarm",
             comparison_operator="GreaterThanThreshold",
             evaluation_periods=1,
-            metric_name=self.metric_name,
-            unit="Seconds",
-            dimensions=self.dimensions,
-            namespace=self.alarm_namespace,
-            period=60,
-            statistic="Maximum",
             threshold=self.alert_threshold,
             alarm_actions=[self.sns_topic_arn],
             ok_actions=[self.sns_topic_arn],
             opts=pulumi.ResourceOptions(
                 parent=self,
-            )
+            ),
+            **self.latency_metric()
         )
 
         self.worker_autoscaling_in_policy = aws.appautoscaling.Policy(
-            qualify_component_name("worker_autoscaling_in_policy", self.kwargs),
-            name=f"{self.namespace}-worker-autoscaling-in-policy",
+            qualify_component_name(f"{self.worker_key}_autoscaling_in_policy", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-autoscaling-in-policy",
             policy_type="StepScaling",
             resource_id=self.worker_autoscaling_target.resource_id,
             scalable_dimension=self.worker_autoscaling_target.scalable_dimension,
             service_namespace=self.worker_autoscaling_target.service_namespace,
             step_scaling_policy_configuration=aws.appautoscaling.PolicyStepScalingPolicyConfigurationArgs(
                 adjustment_type="ChangeInCapacity",
-                cooldown=60,
+                cooldown=self.worker_scale_in_cooldown,
                 metric_aggregation_type="Maximum",
                 step_adjustments=[
                     aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
                         metric_interval_upper_bound="0",
-                        scaling_adjustment=-1,
+                        scaling_adjustment=-self.worker_scale_in_step,
                     )
                 ],
             ),
@@ -136,22 +202,209 @@ class WorkerAutoscaleComponent(pulumi.ComponentResource):
             )
         )
 
+        if self.worker_scale_to_zero:
+            # Only step in while above the floor; dropping to 0 is left to the idle alarm
+            scale_in_metric = dict(metric_queries=[
+                *self.queue_metric_queries("latency", self.metric_name, unit="Seconds"),
+                self.running_tasks_metric_query(),
+                aws.cloudwatch.MetricAlarmMetricQueryArgs(
+                    id="above_floor_latency",
+                    expression=f"IF(FILL(tasks, 0) > {self.worker_min_capacity}, latency, "
+                               f"{self.scaling_threshold + 1})",
+                    label="Queue latency while above the floor",
+                    return_data=True,
+                ),
+            ])
+        else:
+            scale_in_metric = self.latency_metric()
         self.worker_autoscaling_in_alarm = aws.cloudwatch.MetricAlarm(
-            qualify_component_name("worker_autoscaling_in_alarm", self.kwargs),
-            name=f"{self.namespace}-worker-auto-scaling-in-alarm",
+            qualify_component_name(f"{self.worker_key}_autoscaling_in_alarm", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-auto-scaling-in-alarm",
             comparison_operator="LessThanOrEqualToThreshold",
             evaluation_periods=5,
-            metric_name=self.metric_name,
-            unit="Seconds",
-            dimensions=self.dimensions,
-            namespace=self.alarm_namespace,
-            period=60,
-            statistic="Maximum",
             threshold=self.scaling_threshold,
             alarm_actions=[self.worker_autoscaling_in_policy.arn],
             opts=pulumi.ResourceOptions(
                 parent=self,
-            )
+            ),
+            **scale_in_metric
         )
 
+        if self.worker_scale_to_zero:
+            self.scale_to_zero()
+
         self.register_outputs({})
+
+    def latency_metric(self):
+        """
+        :return: The MetricAlarm arguments for the queue latency to scale and alert on.
+        """
+        if len(self.queue_dimensions) == 1:
+            return dict(metric_name=self.metric_name, unit="Seconds", dimensions=self.queue_dimensions[0],
+                        namespace=self.alarm_namespace, period=60, statistic="Maximum")
+        return dict(metric_queries=self.queue_metric_queries("latency", self.metric_name, unit="Seconds",
+                                                             return_data=True))
+
+    def queue_metric_queries(self, query_id, metric_name, unit=None, return_data=False):
+        """
+        :return: Metric queries whose `query_id` is `metric_name` on the worker's queue, or the highest of it across
+            the worker's queues.
+        """
+        def metric_query(metric_id, dimensions, data):
+            return aws.cloudwatch.MetricAlarmMetricQueryArgs(
+                id=metric_id,
+                metric=aws.cloudwatch.MetricAlarmMetricQueryMetricArgs(
+                    metric_name=metric_name,
+                    namespace=self.alarm_namespace,
+                    dimensions=dimensions,
+                    period=60,
+                    stat="Maximum",
+                    unit=unit,
+                ),
+                return_data=data,
+            )
+
+        if len(self.queue_dimensions) == 1:
+            return [metric_query(query_id, self.queue_dimensions[0], return_data)]
+        queue_ids = [f"{query_id}{index}" for index in range(len(self.queue_dimensions))]
+        return [metric_query(queue_id, dimensions, False)
+                for queue_id, dimensions in zip(queue_ids, self.queue_dimensions)] + [
+            aws.cloudwatch.MetricAlarmMetricQueryArgs(
+                id=query_id,
+                expression=f"MAX([{', '.join(queue_ids)}])",
+                label=f"Highest {metric_name} across {', '.join(self.worker_queues)}",
+                return_data=return_data,
+            )
+        ]
+
+    def running_tasks_metric_query(self):
+        return self.task_count_metric_query("tasks", "RunningTaskCount")
+
+    def desired_tasks_metric_query(self):
+        return self.task_count_metric_query("desired", "DesiredTaskCount")
+
+    def task_count_metric_query(self, query_id, metric_name):
+        return aws.cloudwatch.MetricAlarmMetricQueryArgs(
+            id=query_id,
+            metric=aws.cloudwatch.MetricAlarmMetricQueryMetricArgs(
+                metric_name=metric_name,
+                namespace="ECS/ContainerInsights",
+                dimensions={
+                    "ClusterName": self.kwargs.get('ecs_cluster_name'),
+                    "ServiceName": self.kwargs.get('ecs_service_name'),
+                },
+                period=60,
+                stat="Maximum",
+            ),
+            return_data=False,
+        )
+
+    def exact_capacity_policy(self, name, capacity):
+        return aws.appautoscaling.Policy(
+            qualify_component_name(f"{self.worker_key}_{name}_policy", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-{name}-policy",
+            policy_type="StepScaling",
+            resource_id=self.worker_autoscaling_target.resource_id,
+            scalable_dimension=self.worker_autoscaling_target.scalable_dimension,
+            service_namespace=self.worker_autoscaling_target.service_namespace,
+            step_scaling_policy_configuration=aws.appautoscaling.PolicyStepScalingPolicyConfigurationArgs(
+                adjustment_type="ExactCapacity",
+                cooldown=60,
+                metric_aggregation_type="Maximum",
+                step_adjustments=[
+                    aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
+                        metric_interval_lower_bound="0",
+                        scaling_adjustment=capacity,
+                    )
+                ],
+            ),
+            opts=pulumi.ResourceOptions(
+                parent=self,
+            )
+        )
+
+    def scale_to_zero(self):
+        """
+        Drops the worker to 0 tasks once the queue has been idle for worker_idle_minutes, and brings it back to
+        worker_min_number_of_instances as soon as the wake metric shows work. The idle alarm only acts while tasks
+        are running, and the wake alarm only while the desired count is 0, so it never sets the count back down to the
+        floor after the queue latency policies have raised it.
+        """
+        self.worker_idle_policy = self.exact_capacity_policy("idle", 0)
+        self.worker_idle_alarm = aws.cloudwatch.MetricAlarm(
+            qualify_component_name(f"{self.worker_key}_idle_alarm", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-idle-alarm",
+            comparison_operator="GreaterThanOrEqualToThreshold",
+            evaluation_periods=self.worker_idle_minutes,
+            threshold=1,
+            # An idle worker may stop publishing the queue metric altogether
+            treat_missing_data="breaching",
+            metric_queries=[
+                *self.queue_metric_queries("wake", self.worker_wake_metric_name),
+                self.running_tasks_metric_query(),
+                aws.cloudwatch.MetricAlarmMetricQueryArgs(
+                    id="idle",
+                    expression=f"IF(FILL(tasks, 0) > 0 AND FILL(wake, 0) <= {self.worker_wake_threshold}, 1, 0)",
+                    label="Awake with an idle queue",
+                    return_data=True,
+                ),
+            ],
+            alarm_actions=[self.worker_idle_policy.arn],
+            opts=pulumi.ResourceOptions(
+                parent=self,
+            )
+        )
+
+        self.worker_wake_policy = self.exact_capacity_policy("wake", self.worker_min_capacity)
+        self.worker_wake_alarm = aws.cloudwatch.MetricAlarm(
+            qualify_component_name(f"{self.worker_key}_wake_alarm", self.kwargs),
+            name=f"{self.namespace}-{self.worker_key}-wake-alarm",
+            comparison_operator="GreaterThanOrEqualToThreshold",
+            evaluation_periods=1,
+            threshold=1,
+            treat_missing_data="notBreaching",
+            metric_queries=[
+                *self.queue_metric_queries("wake", self.worker_wake_metric_name),
+                self.desired_tasks_metric_query(),
+                aws.cloudwatch.MetricAlarmMetricQueryArgs(
+                    id="asleep_with_work",
+                    expression=f"IF(FILL(desired, 0) == 0 AND wake > {self.worker_wake_threshold}, 1, 0)",
+                    label="Asleep with work waiting",
+                    return_data=True,
+                ),
+            ],
+            alarm_actions=[self.worker_wake_policy.arn],
+            opts=pulumi.ResourceOptions(
+                parent=self,
+            )
+        )
+
+    def scale_out_configuration(self):
+        """
+        Step adjustments that grow with how far queue latency is past the threshold, so a backlog spike gets enough
+        workers in a few minutes rather than one task per cooldown.
+        """
+        bounds = [str(multiple * self.scaling_threshold) for multiple in SCALE_OUT_TIER_MULTIPLES]
+        if self.worker_scale_out_adjustment == "percent":
+            adjustment_type = "PercentChangeInCapacity"
+            adjustments = self.worker_scale_out_percents
+            min_adjustment_magnitude = self.worker_scale_out_steps[0]
+        else:
+            adjustment_type = "ChangeInCapacity"
+            adjustments = self.worker_scale_out_steps
+            min_adjustment_magnitude = None
+
+        step_adjustments = []
+        for index, adjustment in enumerate(adjustments):
+            step_adjustments.append(aws.appautoscaling.PolicyStepScalingPolicyConfigurationStepAdjustmentArgs(
+                metric_interval_lower_bound=bounds[index],
+                metric_interval_upper_bound=bounds[index + 1] if index + 1 < len(bounds) else None,
+                scaling_adjustment=adjustment,
+            ))
+        return aws.appautoscaling.PolicyStepScalingPolicyConfigurationArgs(
+            adjustment_type=adjustment_type,
+            cooldown=self.worker_scale_out_cooldown,
+            metric_aggregation_type="Maximum",
+            min_adjustment_magnitude=min_adjustment_magnitude,
+            step_adjustments=step_adjustments,
+        )
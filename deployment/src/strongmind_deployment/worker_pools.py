@@ -0,0 +1,93 @@
+import re
+from typing import List, Optional
+
+POOL_NAME = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+
+class WorkerPool:
+    """
+    A Sidekiq worker service that serves its own queues and scales on their latency alone, so a flood of bulk jobs
+    cannot starve latency-critical queues.
+
+    Each pool is a dictionary in the `worker_pools` kwarg:
+
+        {
+            "name": "critical",
+            "queues": ["critical", "mailers"],
+            "cpu": 1024,                        # optional, defaults to worker_cpu
+            "memory": 2048,                     # optional, defaults to worker_memory
+            "command": ["sh", "-c", "..."],     # optional, defaults to sidekiq on the pool's queues in order
+            "min": 2,                           # optional, defaults to 1
+            "max": 20,                          # optional, defaults to 65
+            "latency_threshold": 5,             # optional, seconds of queue latency before scaling out
+        }
+
+    The application must publish MaxQueueLatency with a QueueName dimension for each queue; a pool serving several
+    queues scales on the highest of them.
+    """
+    def __init__(self, name: str, queues: List[str], cpu: int = None, memory: int = None, command: List[str] = None,
+                 min_capacity: int = None, max_capacity: int = None, latency_threshold: int = None):
+        self.name = name
+        self.queues = queues
+        self.cpu = cpu
+        self.memory = memory
+        self.command = command or ["sh", "-c", " ".join(["bundle exec sidekiq"] + [f"-q {queue}" for queue in queues])]
+        self.min_capacity = min_capacity
+        self.max_capacity = max_capacity
+        self.latency_threshold = latency_threshold
+
+    @classmethod
+    def from_dict(cls, pool: dict) -> "WorkerPool":
+        if not POOL_NAME.match(pool.get("name") or ""):
+            raise ValueError(f"Worker pool {pool} needs a lowercase 'name' of letters, digits and dashes")
+        if not pool.get("queues"):
+            raise ValueError(f"Worker pool '{pool['name']}' needs at least one queue")
+        if pool.get("min") is not None and pool.get("max") is not None and pool["min"] > pool["max"]:
+            raise ValueError(f"Worker pool '{pool['name']}' has a min above its max")
+        return cls(pool["name"], list(pool["queues"]),
+                   cpu=pool.get("cpu"),
+                   memory=pool.get("memory"),
+                   command=pool.get("command"),
+                   min_capacity=pool.get("min"),
+                   max_capacity=pool.get("max"),
+                   latency_threshold=pool.get("latency_threshold"))
+
+    @property
+    def key(self) -> str:
+        """
+        Names the pool's resources and its entry in a capacity window, e.g. "worker-critical".
+        """
+        return f"worker-{self.name}"
+
+    def container_kwargs(self) -> dict:
+        """
+        The ContainerComponent and WorkerAutoscaleComponent kwargs the pool overrides.
+        """
+        overrides = {
+            "command": self.command,
+            "worker_pool": self.name,
+            "worker_queues": self.queues,
+            "cpu": self.cpu,
+            "memory": self.memory,
+            "desired_count": self.min_capacity,
+            "worker_min_number_of_instances": self.min_capacity,
+            "worker_max_number_of_instances": self.max_capacity,
+            "max_queue_latency_threshold": self.latency_threshold,
+        }
+        return {key: value for key, value in overrides.items() if value is not None}
+
+
+def worker_pools(kwargs) -> Optional[List[WorkerPool]]:
+    """
+    :return: The pools in the `worker_pools` kwarg, or None to run a single worker on every queue.
+    """
+    if not kwargs.get("worker_pools"):
+        return None
+    pools = [WorkerPool.from_dict(pool) for pool in kwargs["worker_pools"]]
+    names = [pool.name for pool in pools]
+    if len(set(names)) != len(names):
+        raise ValueError("Worker pool names must be unique")
+    queues = [queue for pool in pools for queue in pool.queues]
+    if len(set(queues)) != len(queues):
+        raise ValueError("Each queue can only be served by one worker pool, or both pools would scale on it")
+    return pools
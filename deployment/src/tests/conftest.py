@@ -8,6 +8,7 @@ import pytest
 import boto3
 from moto import mock_aws
 
+from strongmind_deployment.invoke_cache import clear_invoke_cache
 from tests.mocks import ImmediateExecutor
 
 @pytest.fixture(scope="session", autouse=True)
@@ -46,3 +47,10 @@ def mock_boto():
     with mock_aws():
         ecs = boto3.client('ecs', region_name='us-west-2')
         yield ecs
+
+
+@pytest.fixture(autouse=True)
+def invoke_cache():
+    clear_invoke_cache()
+    yield
+    clear_invoke_cache()
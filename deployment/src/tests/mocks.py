@@ -23,34 +23,43 @@ def get_pulumi_mocks(faker, fake_password=None, secret_string="{}"):
                     "force_delete": args.inputs["forceDelete"],
                 }
             if args.typ == "awsx:ecs:FargateService":
-                class TaskDefinitionMock(dict):
-                    def __init__(self):
-                        super().__init__()
-                        self.family = "mock-task-family"
-                        self.revision = 1
-                        self.task_role_arn = "arn:aws:iam::123456789012:role/mock-task-role"
-                        self.execution_role_arn = "arn:aws:iam::123456789012:role/mock-execution-role"
-
                 service_name = args.inputs["name"]
                 ecs_service_mock = aws.ecs.Service(service_name)
+                task_definition_mock = aws.ecs.TaskDefinition(f"{service_name}-task-definition",
+                                                              family=service_name,
+                                                              container_definitions="[]")
 
                 outputs = {
                     **args.inputs,
                     "desired_count": args.inputs["desiredCount"],
                     "task_definition_args": args.inputs["taskDefinitionArgs"],
-                    "task_definition": TaskDefinitionMock(),
+                    "task_definition": task_definition_mock,
                     "propagate_tags": args.inputs.get("propagateTags"),
                     "enable_execute_command": args.inputs.get("enableExecuteCommand"),
                     "health_check_grace_period_seconds": args.inputs.get("healthCheckGracePeriodSeconds"),
                     "deployment_maximum_percent": args.inputs.get("deploymentMaximumPercent"),
+                    "deployment_minimum_healthy_percent": args.inputs.get("deploymentMinimumHealthyPercent"),
+                    "deployment_circuit_breaker": args.inputs.get("deploymentCircuitBreaker"),
+                    "continue_before_steady_state": args.inputs.get("continueBeforeSteadyState"),
                     "service": ecs_service_mock
                 }
             if args.typ == "aws:rds/cluster:Cluster":
                 outputs = {
                     **args.inputs,
                     "endpoint": f"{faker.domain_name()}.cluster-{faker.word()}.us-west-2.rds.amazonaws.com",
+                    "reader_endpoint": f"{faker.domain_name()}.cluster-ro-{faker.word()}.us-west-2.rds.amazonaws.com",
                     "vpc_security_group_ids": [faker.word()]
                 }
+            if args.typ == "aws:rds/proxy:Proxy":
+                outputs = {
+                    **args.inputs,
+                    "endpoint": f"{args.inputs['name']}.proxy-{faker.word()}.us-west-2.rds.amazonaws.com",
+                }
+            if args.typ == "aws:rds/proxyDefaultTargetGroup:ProxyDefaultTargetGroup":
+                outputs = {
+                    **args.inputs,
+                    "name": "default",
+                }
             if args.typ == "random:index/randomPassword:RandomPassword":
                 length = args.inputs["length"]
                 outputs = {
@@ -138,6 +147,14 @@ def get_pulumi_mocks(faker, fake_password=None, secret_string="{}"):
                     "arn": f"arn:aws:elasticloadbalancing:us-west-2:123456789012:loadbalancer/app/{faker.word()}",
                     "name": f"loadbalancer-{faker.word()}",
                 }
+            if args.typ == "aws:ecs/taskDefinition:TaskDefinition":
+                outputs = {
+                    **args.inputs,
+                    "arn": f"arn:aws:ecs:us-west-2:123456789012:task-definition/{args.inputs['family']}:1",
+                    "revision": 1,
+                    "task_role_arn": "arn:aws:iam::123456789012:role/mock-task-role",
+                    "execution_role_arn": "arn:aws:iam::123456789012:role/mock-execution-role",
+                }
             if args.typ == "aws:ecs/service:Service":
                 arn = f"arn:aws:ecs:us-west-2:123456789012:service/{args.name}/{args.name}"
                 outputs = {
@@ -192,8 +209,14 @@ def get_pulumi_mocks(faker, fake_password=None, secret_string="{}"):
                     raise Exception(f"Unknown response headers policy ID: {args.args.get('id')}")
 
             if args.token == "aws:ec2/getSubnets:getSubnets":
+                subnet_types = [f["values"][0] for f in args.args.get("filters", []) if f["name"] == "tag:SubnetType"]
+                if subnet_types:
+                    return {"ids": [f"subnet-{subnet_types[0].lower()}-{n}" for n in range(3)]}
                 return {"ids": ["subnet-12345", "subnet-67890"]}
             
+            if args.token == "aws:index/getAvailabilityZones:getAvailabilityZones":
+                return {"names": ["us-west-2a", "us-west-2b", "us-west-2c", "us-west-2d"]}
+
             if args.token == "aws:ec2/getVpc:getVpc":
                 return {"id": "vpc-12345"}
             
@@ -5,6 +5,7 @@ import pytest
 
 from strongmind_deployment.alb import AlbPlacement
 from tests.mocks import get_pulumi_mocks
+from tests.shared import assert_output_equals
 
 
 def describe_a_application_load_balancer_component():
@@ -89,4 +90,32 @@ def describe_a_application_load_balancer_component():
             return Alb(name, alb_args)
 
         def it_has_a_custom_namespace(sut, namespace):
-            assert sut.namespace == namespace
\ No newline at end of file
+            assert sut.namespace == namespace
+
+    def describe_without_subnets():
+        @pytest.fixture
+        def placement():
+            return AlbPlacement.EXTERNAL
+
+        @pytest.fixture
+        def alb_args(vpc_id, certificate_arn, placement):
+            from strongmind_deployment.alb import AlbArgs
+            return AlbArgs(
+                vpc_id=vpc_id,
+                certificate_arn=certificate_arn,
+                placement=placement,
+                tags={},
+            )
+
+        @pulumi.runtime.test
+        def it_places_an_external_alb_in_the_public_subnets(sut):
+            return assert_output_equals(sut.alb.subnets, [f"subnet-public-{n}" for n in range(3)])
+
+        def describe_when_internal():
+            @pytest.fixture
+            def placement():
+                return AlbPlacement.INTERNAL
+
+            @pulumi.runtime.test
+            def it_places_the_alb_in_the_private_subnets(sut):
+                return assert_output_equals(sut.alb.subnets, [f"subnet-private-{n}" for n in range(3)])
@@ -0,0 +1,86 @@
+import os
+import time
+
+import pulumi
+import pytest
+
+from strongmind_deployment.autotag import auto_tag
+from strongmind_deployment.taggable import TagShape, is_taggable, tag_shape, taggable_resource_types
+
+
+def _args(type_, props):
+    return pulumi.ResourceTransformArgs(custom=True, type_=type_, name="resource", props=props,
+                                        opts=pulumi.ResourceOptions())
+
+
+def describe_taggable_index():
+    @pytest.mark.parametrize("type_", [
+        "aws:s3/bucketV2:BucketV2",
+        "aws:batch/computeEnvironment:ComputeEnvironment",
+        "aws:batch/jobQueue:JobQueue",
+        "aws:elasticache/parameterGroup:ParameterGroup",
+        "aws:ecs/service:Service",
+    ])
+    def it_knows_the_types_our_components_create(type_):
+        assert is_taggable(type_)
+        assert tag_shape(type_) == TagShape.MAP
+
+    def it_knows_autoscaling_groups_take_a_list_of_tags():
+        assert tag_shape("aws:autoscaling/group:Group") == TagShape.KEY_VALUE_LIST
+
+    def it_skips_types_without_tags():
+        assert not is_taggable("aws:iam/rolePolicy:RolePolicy")
+        assert tag_shape("custom:module:RailsComponent") is None
+
+    def it_is_frozen():
+        assert isinstance(taggable_resource_types, frozenset)
+
+
+def describe_auto_tag():
+    @pytest.fixture
+    def auto_tags():
+        return {"owner": "binary-ops", "environment": "stage"}
+
+    def it_adds_tags_to_an_untagged_resource(auto_tags):
+        result = auto_tag(_args("aws:s3/bucketV2:BucketV2", {"bucket": "b"}), auto_tags)
+
+        assert result.props == {"bucket": "b", "tags": auto_tags}
+
+    def it_keeps_tags_set_on_the_resource(auto_tags):
+        result = auto_tag(_args("aws:s3/bucketV2:BucketV2", {"tags": {"owner": "someone-else"}}), auto_tags)
+
+        assert result.props["tags"] == {"owner": "someone-else", "environment": "stage"}
+
+    def it_leaves_a_fully_tagged_resource_alone(auto_tags):
+        assert auto_tag(_args("aws:s3/bucketV2:BucketV2", {"tags": dict(auto_tags)}), auto_tags) is None
+
+    def it_leaves_untaggable_resources_alone(auto_tags):
+        assert auto_tag(_args("aws:iam/rolePolicy:RolePolicy", {"policy": "{}"}), auto_tags) is None
+
+    def it_adds_propagating_tags_to_autoscaling_groups(auto_tags):
+        existing = [{"key": "owner", "value": "someone-else", "propagateAtLaunch": False}]
+
+        result = auto_tag(_args("aws:autoscaling/group:Group", {"tags": existing}), auto_tags)
+
+        assert result.props["tags"] == existing + [
+            {"key": "environment", "value": "stage", "propagateAtLaunch": True},
+        ]
+
+    # Wall-clock limits depend on the machine; checked with the synthesis benchmarks (see test_benchmarks.py)
+    @pytest.mark.skipif(not os.environ.get('STRONGMIND_BENCHMARK_TIMES'),
+                        reason="set STRONGMIND_BENCHMARK_TIMES=1 to check timings")
+    def it_stays_flat_as_the_stack_grows(auto_tags):
+        def per_resource_seconds(count):
+            resources = [_args("aws:s3/bucketV2:BucketV2", {"bucket": f"b{n}", "tags": {"Name": f"b{n}"}})
+                         for n in range(count)]
+            started = time.perf_counter()
+            for args in resources:
+                auto_tag(args, auto_tags)
+            return (time.perf_counter() - started) / count
+
+        per_resource_seconds(1_000)  # warm up
+        small = min(per_resource_seconds(1_000) for _ in range(3))
+        large = min(per_resource_seconds(10_000) for _ in range(3))
+
+        assert large < small * 2
+        assert large < 50e-6
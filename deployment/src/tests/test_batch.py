@@ -269,6 +269,29 @@ def describe_a_batch_component():
             expected_capabilities = ["FARGATE"]
             return sut.definition.platform_capabilities.apply(lambda capabilities: capabilities == expected_capabilities)
 
+        @pulumi.runtime.test
+        def it_runs_on_x86_by_default(sut):
+            def check_runtime_platform(container_properties):
+                assert json.loads(container_properties)["runtimePlatform"] == {
+                    "cpuArchitecture": "X86_64",
+                    "operatingSystemFamily": "LINUX",
+                }
+
+            return sut.definition.container_properties.apply(check_runtime_platform)
+
+        def describe_on_graviton():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs["cpu_architecture"] = "ARM64"
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_runs_on_arm64(sut):
+                def check_runtime_platform(container_properties):
+                    assert json.loads(container_properties)["runtimePlatform"]["cpuArchitecture"] == "ARM64"
+
+                return sut.definition.container_properties.apply(check_runtime_platform)
+
     def describe_event_rule():
         @pulumi.runtime.test
         def it_has_an_event_rule(sut):
@@ -0,0 +1,182 @@
+"""
+Synthesis benchmarks for the component library.
+
+Each benchmark builds a representative stack under the Pulumi mocks and records how long it took to
+resolve and how many resources it registered. A resource count that differs from benchmark_baseline.json
+fails the test. Wall-clock times depend on the machine, so they are only checked when asked for:
+
+    STRONGMIND_BENCHMARK_TIMES=1 python -m pytest tests/test_benchmarks.py
+
+which fails a build slower than TIME_TOLERANCE times the baseline (plus TIME_SLACK_SECONDS for noisy
+machines). After an intended change, refresh the baseline with
+
+    STRONGMIND_UPDATE_BENCHMARKS=1 python -m pytest tests/test_benchmarks.py
+"""
+import json
+import os
+import time
+
+import boto3
+import pulumi
+import pulumi.runtime
+import pytest
+from botocore.stub import Stubber
+
+from tests.mocks import get_pulumi_mocks
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+TIME_TOLERANCE = 3.0
+TIME_SLACK_SECONDS = 1.0
+
+
+class _FakeValidationOption:
+    def __init__(self, name, value, type):
+        self.resource_record_name = name
+        self.resource_record_value = value
+        self.resource_record_type = type
+
+
+def _read_baseline():
+    with open(BASELINE_PATH) as file:
+        return json.load(file)
+
+
+def _write_baseline(name, measured):
+    baseline = _read_baseline() if os.path.exists(BASELINE_PATH) else {}
+    baseline[name] = measured
+    with open(BASELINE_PATH, 'w') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def _synthesize(build, pulumi_mocks):
+    registered = []
+    new_resource = pulumi_mocks.new_resource
+
+    def count_resource(args):
+        registered.append(args.typ)
+        return new_resource(args)
+
+    pulumi_mocks.new_resource = count_resource
+
+    @pulumi.runtime.test
+    def run():
+        build()
+
+    started = time.perf_counter()
+    run()
+    return {
+        'seconds': round(time.perf_counter() - started, 3),
+        'resources': len(registered),
+    }
+
+
+def _check_against_baseline(name, measured):
+    if os.environ.get('STRONGMIND_UPDATE_BENCHMARKS'):
+        _write_baseline(name, measured)
+        return
+
+    expected = _read_baseline()[name]
+    assert measured['resources'] == expected['resources'], \
+        f"{name} registered {measured['resources']} resources, the baseline is {expected['resources']}"
+    if not os.environ.get('STRONGMIND_BENCHMARK_TIMES'):
+        return
+    allowed = expected['seconds'] * TIME_TOLERANCE + TIME_SLACK_SECONDS
+    assert measured['seconds'] <= allowed, \
+        f"{name} took {measured['seconds']}s to synthesize, more than {allowed:.2f}s " \
+        f"({TIME_TOLERANCE}x the {expected['seconds']}s baseline)"
+
+
+def describe_synthesis_benchmarks():
+    @pytest.fixture
+    def app_name():
+        return 'benchmark'
+
+    @pytest.fixture
+    def environment(monkeypatch):
+        monkeypatch.setenv('ENVIRONMENT_NAME', 'prod')
+        return 'prod'
+
+    @pytest.fixture
+    def stack(environment):
+        return environment
+
+    @pytest.fixture
+    def pulumi_mocks(faker):
+        return get_pulumi_mocks(faker, 'benchmark-password')
+
+    @pytest.fixture
+    def container_image(monkeypatch):
+        monkeypatch.setenv('CONTAINER_IMAGE', '123456789012.dkr.ecr.us-west-2.amazonaws.com/benchmark:latest')
+
+    @pytest.fixture
+    def ecs_client():
+        ecs_client = boto3.client('ecs', region_name='us-west-2')
+        stubber = Stubber(ecs_client)
+        stubber.add_client_error('describe_services', service_error_code='ClusterNotFoundException')
+        stubber.activate()
+        yield ecs_client
+        stubber.deactivate()
+
+    @pytest.fixture
+    def sidekiq_present(when):
+        from strongmind_deployment import rails
+        when(rails).sidekiq_present().thenReturn(True)
+
+    @pytest.fixture
+    def rails_master_key(monkeypatch):
+        monkeypatch.setenv('RAILS_MASTER_KEY', 'benchmark-master-key')
+
+    def it_builds_a_rails_app_with_worker_redis_storage_and_dashboard(pulumi_set_mocks, pulumi_mocks,
+                                                                     container_image, rails_master_key,
+                                                                     ecs_client, sidekiq_present):
+        from strongmind_deployment.rails import RailsComponent
+
+        def build():
+            RailsComponent("rails",
+                           container_port=3000,
+                           need_worker=True,
+                           cache_redis=True,
+                           storage=True,
+                           zone_id='zone',
+                           load_balancer_dns_name='lb.example.com',
+                           domain_validation_options=[_FakeValidationOption('name', 'value', 'CNAME')],
+                           env_vars={'ENVIRONMENT_NAME': 'prod'},
+                           container_subnets=['subnet-benchmark'],
+                           container_security_groups=['sg-benchmark'],
+                           ecs_client=ecs_client)
+
+        _check_against_baseline('rails', _synthesize(build, pulumi_mocks))
+
+    def it_builds_a_standalone_container(pulumi_set_mocks, pulumi_mocks, container_image):
+        from strongmind_deployment.container import ContainerComponent
+
+        def build():
+            ContainerComponent("container",
+                               container_port=3000,
+                               container_image=os.environ['CONTAINER_IMAGE'],
+                               zone_id='zone',
+                               load_balancer_dns_name='lb.example.com',
+                               domain_validation_options=[_FakeValidationOption('name', 'value', 'CNAME')],
+                               env_vars={'ENVIRONMENT_NAME': 'prod'})
+
+        _check_against_baseline('container', _synthesize(build, pulumi_mocks))
+
+    def it_builds_a_batch_job(pulumi_set_mocks, pulumi_mocks, container_image):
+        from strongmind_deployment.batch import BatchComponent
+
+        def build():
+            BatchComponent("batch", command=["bundle", "exec", "rake", "nightly"])
+
+        _check_against_baseline('batch', _synthesize(build, pulumi_mocks))
+
+    def it_builds_a_lambda(pulumi_set_mocks, pulumi_mocks):
+        from strongmind_deployment.lambda_component import LambdaArgs, LambdaComponent, LambdaEnvVariables
+
+        def build():
+            LambdaComponent("lambda",
+                            LambdaArgs(handler='app.handler', runtime='python3.11', timeout=30,
+                                       memory_size=256, layers=[]),
+                            LambdaEnvVariables(variables={'ENVIRONMENT_NAME': 'prod'}))
+
+        _check_against_baseline('lambda', _synthesize(build, pulumi_mocks))
@@ -0,0 +1,138 @@
+import pulumi
+import pytest
+from pytest_describe import behaves_like
+
+from strongmind_deployment.capacity_plan import CapacityPlan
+from tests.a_pulumi_containerized_app import a_pulumi_containerized_app
+from tests.shared import assert_output_equals
+
+
+def describe_capacity_plan():
+    @pytest.fixture
+    def plan():
+        return CapacityPlan.for_web({"per_task_rps": 40, "peak_rps": 1200, "baseline_rps": 100})
+
+    def it_sizes_the_maximum_for_the_peak_with_headroom(plan):
+        # 1200 rps * 1.25 / 40 rps per task
+        assert plan.max_capacity(floor=2) == 38
+
+    def it_sizes_the_minimum_for_the_baseline(plan):
+        assert plan.min_capacity(floor=2) == 4
+
+    def it_never_goes_below_the_floor(plan):
+        assert plan.min_capacity(floor=10) == 10
+
+    def it_keeps_the_floor_without_a_baseline():
+        plan = CapacityPlan.for_web({"per_task_rps": 40, "peak_rps": 1200})
+
+        assert plan.min_capacity(floor=2) == 2
+
+    def it_never_puts_the_maximum_below_the_minimum():
+        plan = CapacityPlan.for_web({"per_task_rps": 40, "peak_rps": 40})
+
+        assert plan.max_capacity(floor=5) == 5
+
+    def it_scales_out_in_proportion_to_the_maximum(plan):
+        assert plan.scale_out_steps(floor=2) == (2, 6)
+
+    def it_scales_out_at_least_one_task_at_a_time():
+        plan = CapacityPlan.for_web({"per_task_rps": 100, "peak_rps": 100})
+
+        assert plan.scale_out_steps(floor=1) == (1, 1)
+
+    def it_reads_worker_throughput_in_jobs():
+        plan = CapacityPlan.for_worker({"per_task_jobs_per_second": 5, "peak_jobs_per_second": 200,
+                                        "headroom": 0})
+
+        assert plan.max_capacity(floor=1) == 40
+        assert plan.unit == "jobs/sec"
+
+    def it_summarizes_the_envelope(plan):
+        assert plan.summary("web", floor=2) == (
+            "web capacity plan: 4-38 tasks at 40 requests/sec each for a 1200 requests/sec peak with 25% headroom "
+            "(serves up to 1520 requests/sec); scales out by 2 or 6 tasks")
+
+    def it_is_off_without_a_plan():
+        assert CapacityPlan.for_web(None) is None
+        assert CapacityPlan.for_worker({}) is None
+
+    @pytest.mark.parametrize("plan, message", [
+        ({"peak_rps": 100}, "per-task"),
+        ({"per_task_rps": 10}, "peak"),
+        ({"per_task_rps": 10, "peak_rps": 100, "baseline_rps": 200}, "baseline"),
+        ({"per_task_rps": 10, "peak_rps": 100, "headroom": -0.1}, "headroom"),
+    ])
+    def it_rejects_plans_that_do_not_add_up(plan, message):
+        with pytest.raises(ValueError, match=message):
+            CapacityPlan.for_web(plan)
+
+
+@behaves_like(a_pulumi_containerized_app)
+def describe_capacity_planned_scaling():
+    def describe_on_the_web_service():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs["autoscale"] = True
+            component_kwargs["capacity_plan"] = {"per_task_rps": 40, "peak_rps": 1200, "baseline_rps": 100}
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_derives_the_max_capacity(sut):
+            return assert_output_equals(sut.autoscaling_target.max_capacity, 38)
+
+        @pulumi.runtime.test
+        def it_derives_the_min_capacity(sut):
+            return assert_output_equals(sut.autoscaling_target.min_capacity, 4)
+
+        @pulumi.runtime.test
+        def it_derives_the_scale_out_steps(sut):
+            def check_steps(step_adjustments):
+                assert [step["scaling_adjustment"] for step in step_adjustments] == [2, 6]
+
+            return sut.autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments.apply(check_steps)
+
+        @pulumi.runtime.test
+        def it_alarms_at_the_derived_max(sut):
+            return assert_output_equals(sut.running_tasks_alarm.threshold, 38)
+
+        @pulumi.runtime.test
+        def it_describes_the_alarm_with_the_derived_max(sut):
+            return assert_output_equals(sut.running_tasks_alarm.alarm_description,
+                                        "Alarm when ECS service running tasks are at Max of 38")
+
+        @pulumi.runtime.test
+        def it_summarizes_the_envelope(sut):
+            assert sut.capacity_summary.startswith("web capacity plan: 4-38 tasks")
+
+    def describe_on_the_worker_service():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs["worker_autoscale"] = True
+            component_kwargs["worker_capacity_plan"] = {"per_task_jobs_per_second": 5, "peak_jobs_per_second": 200}
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_derives_the_max_capacity(sut):
+            return assert_output_equals(sut.worker_autoscaling.worker_autoscaling_target.max_capacity, 50)
+
+        @pulumi.runtime.test
+        def it_derives_the_scale_out_steps(sut):
+            def check_steps(step_adjustments):
+                assert [step["scaling_adjustment"] for step in step_adjustments] == [3, 8, 16]
+
+            configuration = sut.worker_autoscaling.worker_autoscaling_out_policy.step_scaling_policy_configuration
+            return configuration.step_adjustments.apply(check_steps)
+
+    def describe_without_a_plan():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs["autoscale"] = True
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_keeps_the_default_max_capacity_alarm(sut):
+            return assert_output_equals(sut.running_tasks_alarm.threshold, 100)
+
+        @pulumi.runtime.test
+        def it_keeps_the_default_steps(sut):
+            assert sut.scale_out_steps == (1, 3)
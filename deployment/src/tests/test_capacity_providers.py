@@ -0,0 +1,104 @@
+import pulumi
+import pytest
+from pytest_describe import behaves_like
+
+from strongmind_deployment.capacity_providers import capacity_provider_strategy, use_capacity_provider_strategy, \
+    WORKER_CAPACITY_PROVIDER_STRATEGY
+from tests.a_pulumi_containerized_app import a_pulumi_containerized_app
+from tests.shared import assert_output_equals, assert_outputs_equal
+
+
+def _args(type_, props):
+    return pulumi.ResourceTransformArgs(custom=True, type_=type_, name="service", props=props,
+                                        opts=pulumi.ResourceOptions())
+
+
+def describe_capacity_provider_strategy():
+    def it_fills_in_base_and_weight():
+        assert capacity_provider_strategy([{"capacity_provider": "FARGATE_SPOT", "weight": 1}]) == [
+            {"capacity_provider": "FARGATE_SPOT", "base": 0, "weight": 1},
+        ]
+
+    def it_runs_on_the_launch_type_without_a_strategy():
+        assert capacity_provider_strategy(None) is None
+        assert capacity_provider_strategy([]) is None
+
+    def it_rejects_unknown_providers():
+        with pytest.raises(ValueError, match="must be one of"):
+            capacity_provider_strategy([{"capacity_provider": "EC2", "weight": 1}])
+
+    def it_allows_only_one_base():
+        with pytest.raises(ValueError, match="Only one"):
+            capacity_provider_strategy([{"capacity_provider": "FARGATE", "base": 1, "weight": 1},
+                                        {"capacity_provider": "FARGATE_SPOT", "base": 1, "weight": 1}])
+
+    def it_needs_a_weight():
+        with pytest.raises(ValueError, match="at least one provider with a weight"):
+            capacity_provider_strategy([{"capacity_provider": "FARGATE", "base": 1}])
+
+    def it_accepts_the_worker_default():
+        assert capacity_provider_strategy(WORKER_CAPACITY_PROVIDER_STRATEGY)
+
+
+def describe_use_capacity_provider_strategy():
+    @pytest.fixture
+    def transform():
+        return use_capacity_provider_strategy(capacity_provider_strategy(WORKER_CAPACITY_PROVIDER_STRATEGY))
+
+    def it_moves_the_service_onto_the_strategy(transform):
+        result = transform(_args("aws:ecs/service:Service", {"name": "worker", "launchType": "FARGATE"}))
+
+        assert "launchType" not in result.props
+        assert result.props["capacityProviderStrategies"] == [
+            {"capacityProvider": "FARGATE", "base": 1, "weight": 1},
+            {"capacityProvider": "FARGATE_SPOT", "base": 0, "weight": 3},
+        ]
+
+    def it_redeploys_the_service(transform):
+        result = transform(_args("aws:ecs/service:Service", {"launchType": "FARGATE"}))
+
+        assert result.props["forceNewDeployment"] is True
+
+    def it_deletes_the_old_service_before_replacing_it(transform):
+        result = transform(_args("aws:ecs/service:Service", {"launchType": "FARGATE"}))
+
+        assert result.opts.delete_before_replace
+
+    def it_leaves_other_resources_alone(transform):
+        assert transform(_args("aws:ecs/taskDefinition:TaskDefinition", {"family": "worker"})) is None
+
+
+@behaves_like(a_pulumi_containerized_app)
+def describe_capacity_providers():
+    @pulumi.runtime.test
+    def it_registers_fargate_and_spot_with_its_cluster(sut):
+        return assert_output_equals(sut.cluster_capacity_providers.capacity_providers, ["FARGATE", "FARGATE_SPOT"])
+
+    @pulumi.runtime.test
+    def it_associates_them_with_its_cluster(sut):
+        return assert_outputs_equal(sut.cluster_capacity_providers.cluster_name, sut.ecs_cluster.name)
+
+    @pulumi.runtime.test
+    def it_keeps_services_on_demand_by_default(sut):
+        return assert_output_equals(
+            sut.cluster_capacity_providers.default_capacity_provider_strategies[0].capacity_provider, "FARGATE")
+
+    @pulumi.runtime.test
+    def it_runs_on_the_fargate_launch_type_by_default(sut):
+        assert sut.capacity_provider_strategy is None
+
+    def describe_with_a_strategy():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs["capacity_provider_strategy"] = [{"capacity_provider": "FARGATE_SPOT", "weight": 1}]
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_uses_it(sut):
+            assert sut.capacity_provider_strategy == [{"capacity_provider": "FARGATE_SPOT", "base": 0, "weight": 1}]
+
+        @pulumi.runtime.test
+        def it_transforms_the_service_after_the_providers_exist(sut):
+            opts = sut.fargate_service_options()
+            assert opts.depends_on == [sut.cluster_capacity_providers]
+            assert len(opts.transforms) == 1
@@ -0,0 +1,166 @@
+import pulumi
+import pytest
+from pytest_describe import behaves_like
+
+from strongmind_deployment.capacity_schedule import CapacityWindow
+from tests.a_pulumi_containerized_app import a_pulumi_containerized_app
+from tests.shared import assert_output_equals, assert_outputs_equal
+
+
+def _school_day(**capacities):
+    return {
+        "name": "school-day",
+        "start": "cron(0 7 ? * MON-FRI *)",
+        "end": "cron(0 16 ? * MON-FRI *)",
+        "timezone": "America/Phoenix",
+        **capacities,
+    }
+
+
+def describe_capacity_window():
+    def it_reads_a_window():
+        window = CapacityWindow.from_dict(_school_day(web={"min": 6}, until="2026-05-29T00:00:00Z"))
+
+        assert window.timezone == "America/Phoenix"
+        assert window.ends_on == "2026-05-29T00:00:00Z"
+        assert window.capacity_for("web") == {"min": 6}
+        assert window.capacity_for("worker") is None
+
+    def it_reads_worker_pools():
+        window = CapacityWindow.from_dict(_school_day(**{"worker-critical": {"min": 4}}))
+
+        assert window.capacity_for("worker-critical") == {"min": 4}
+
+    def it_defaults_to_utc():
+        window = _school_day(web={"min": 6})
+        window.pop("timezone")
+
+        assert CapacityWindow.from_dict(window).timezone == "UTC"
+
+    @pytest.mark.parametrize("key", ["name", "start", "end"])
+    def it_needs_a_name_and_both_edges(key):
+        window = _school_day(web={"min": 6})
+        window.pop(key)
+
+        with pytest.raises(ValueError, match=key):
+            CapacityWindow.from_dict(window)
+
+    def it_needs_a_capacity():
+        with pytest.raises(ValueError, match="min or max for web"):
+            CapacityWindow.from_dict(_school_day(web={}))
+
+    def it_rejects_a_min_above_the_max():
+        with pytest.raises(ValueError, match="min above its max"):
+            CapacityWindow.from_dict(_school_day(worker={"min": 10, "max": 2}))
+
+    def describe_capacity_range():
+        def it_falls_back_to_the_component_for_a_missing_bound():
+            window = CapacityWindow.from_dict(_school_day(web={"min": 6}))
+
+            assert window.capacity_range("web", 2, 100) == (6, 100)
+
+        def it_rejects_a_min_above_the_component_max():
+            window = CapacityWindow.from_dict(_school_day(database={"min": 4}))
+
+            with pytest.raises(ValueError, match="database min to 4, above its max of 2"):
+                window.capacity_range("database", 0.5, 2)
+
+        def it_rejects_a_max_below_the_component_min():
+            window = CapacityWindow.from_dict(_school_day(web={"max": 1}))
+
+            with pytest.raises(ValueError, match="web min to 2, above its max of 1"):
+                window.capacity_range("web", 2, 100)
+
+
+@behaves_like(a_pulumi_containerized_app)
+def describe_scheduled_capacity():
+    def describe_with_a_school_day_window():
+        @pytest.fixture
+        def capacity_schedule():
+            return [_school_day(web={"min": 6, "max": 40}, worker={"min": 3})]
+
+        @pytest.fixture
+        def component_kwargs(component_kwargs, capacity_schedule):
+            component_kwargs["autoscale"] = True
+            component_kwargs["worker_autoscale"] = True
+            component_kwargs["capacity_schedule"] = capacity_schedule
+            return component_kwargs
+
+        def describe_web():
+            @pytest.fixture
+            def start(sut):
+                return sut.scheduled_actions[0]
+
+            @pytest.fixture
+            def end(sut):
+                return sut.scheduled_actions[1]
+
+            @pulumi.runtime.test
+            def it_creates_a_start_and_end_action(sut):
+                assert len(sut.scheduled_actions) == 2
+
+            @pulumi.runtime.test
+            def it_is_named_after_the_window(start, app_name, stack):
+                return assert_output_equals(start.name, f"{app_name}-{stack}-web-school-day-start")
+
+            @pulumi.runtime.test
+            def it_starts_on_the_window_schedule(start):
+                return assert_output_equals(start.schedule, "cron(0 7 ? * MON-FRI *)")
+
+            @pulumi.runtime.test
+            def it_uses_the_window_timezone(start):
+                return assert_output_equals(start.timezone, "America/Phoenix")
+
+            @pulumi.runtime.test
+            def it_raises_the_floor_at_the_start(start):
+                return assert_output_equals(start.scalable_target_action.min_capacity, 6)
+
+            @pulumi.runtime.test
+            def it_sets_the_window_max_at_the_start(start):
+                return assert_output_equals(start.scalable_target_action.max_capacity, 40)
+
+            @pulumi.runtime.test
+            def it_ends_on_the_window_schedule(end):
+                return assert_output_equals(end.schedule, "cron(0 16 ? * MON-FRI *)")
+
+            @pulumi.runtime.test
+            def it_restores_the_normal_floor_at_the_end(end):
+                return assert_output_equals(end.scalable_target_action.min_capacity, 2)
+
+            @pulumi.runtime.test
+            def it_restores_the_normal_max_at_the_end(end):
+                return assert_output_equals(end.scalable_target_action.max_capacity, 100)
+
+            @pulumi.runtime.test
+            def it_targets_the_web_service(sut, start):
+                return assert_outputs_equal(sut.autoscaling_target.resource_id, start.resource_id)
+
+        def describe_worker():
+            @pytest.fixture
+            def start(sut):
+                return sut.worker_autoscaling.worker_scheduled_actions[0]
+
+            @pulumi.runtime.test
+            def it_raises_the_floor_at_the_start(start):
+                return assert_output_equals(start.scalable_target_action.min_capacity, 3)
+
+            @pulumi.runtime.test
+            def it_keeps_the_normal_max_when_the_window_has_none(start):
+                return assert_output_equals(start.scalable_target_action.max_capacity, 65)
+
+        def describe_with_a_floor_above_the_web_max():
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.container
+                component_kwargs["capacity_schedule"] = [_school_day(web={"min": 500})]
+                with pytest.raises(ValueError, match="web min to 500"):
+                    strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+        def describe_without_a_schedule():
+            @pytest.fixture
+            def capacity_schedule():
+                return None
+
+            @pulumi.runtime.test
+            def it_creates_no_actions(sut):
+                assert sut.scheduled_actions == []
+                assert sut.worker_autoscaling.worker_scheduled_actions == []
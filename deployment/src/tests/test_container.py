@@ -253,6 +253,111 @@ def describe_container():
                 def it_sets_the_target_group_health_check_timeout(sut):
                     return assert_output_equals(sut.target_group.health_check.timeout, 5)
 
+                @pulumi.runtime.test
+                def it_drains_for_the_default_300_seconds(sut):
+                    return assert_output_equals(sut.target_group.deregistration_delay, 300)
+
+                @pulumi.runtime.test
+                def it_does_not_slow_start_by_default(sut):
+                    return assert_output_equals(sut.target_group.slow_start, 0)
+
+                @pulumi.runtime.test
+                def it_routes_round_robin_by_default(sut):
+                    return assert_output_equals(sut.target_group.load_balancing_algorithm_type, "round_robin")
+
+                @pulumi.runtime.test
+                def it_gives_new_tasks_a_600_second_grace_period(sut):
+                    return assert_output_equals(sut.fargate_service.health_check_grace_period_seconds, 600)
+
+                def describe_with_the_fast_rollout_profile():
+                    @pytest.fixture
+                    def component_kwargs(component_kwargs):
+                        component_kwargs['rollout_profile'] = "fast"
+                        return component_kwargs
+
+                    @pulumi.runtime.test
+                    def it_drains_quickly(sut):
+                        return assert_output_equals(sut.target_group.deregistration_delay, 30)
+
+                    @pulumi.runtime.test
+                    def it_warms_new_tasks_up(sut):
+                        return assert_output_equals(sut.target_group.slow_start, 60)
+
+                    @pulumi.runtime.test
+                    def it_checks_health_every_10_seconds(sut):
+                        return assert_output_equals(sut.target_group.health_check.interval, 10)
+
+                    @pulumi.runtime.test
+                    def it_tolerates_one_more_failed_check(sut):
+                        return assert_output_equals(sut.target_group.health_check.unhealthy_threshold, 3)
+
+                    @pulumi.runtime.test
+                    def it_shortens_the_grace_period(sut):
+                        return assert_output_equals(sut.fargate_service.health_check_grace_period_seconds, 120)
+
+                def describe_with_a_grace_period_shorter_than_the_slow_start():
+                    @pytest.fixture
+                    def component_kwargs(component_kwargs):
+                        component_kwargs['rollout_profile'] = "fast"
+                        component_kwargs['health_check_grace_period_seconds'] = 45
+                        return component_kwargs
+
+                    @pulumi.runtime.test
+                    def it_caps_the_slow_start_at_the_grace_period(sut):
+                        return assert_output_equals(sut.target_group.slow_start, 45)
+
+                def describe_with_a_grace_period_below_the_shortest_slow_start():
+                    @pytest.fixture
+                    def component_kwargs(component_kwargs):
+                        component_kwargs['rollout_profile'] = "fast"
+                        component_kwargs['health_check_grace_period_seconds'] = 29
+                        return component_kwargs
+
+                    @pulumi.runtime.test
+                    def it_turns_slow_start_off(sut):
+                        return assert_output_equals(sut.target_group.slow_start, 0)
+
+                def describe_with_a_grace_period_of_the_shortest_slow_start():
+                    @pytest.fixture
+                    def component_kwargs(component_kwargs):
+                        component_kwargs['rollout_profile'] = "fast"
+                        component_kwargs['health_check_grace_period_seconds'] = 30
+                        return component_kwargs
+
+                    @pulumi.runtime.test
+                    def it_keeps_slow_start_on(sut):
+                        return assert_output_equals(sut.target_group.slow_start, 30)
+
+                def describe_with_a_slow_start_target_groups_reject():
+                    def it_refuses(component_kwargs, pulumi_set_mocks):
+                        import strongmind_deployment.container
+                        component_kwargs['slow_start'] = 15
+                        with pytest.raises(ValueError, match="slow_start must be 0 or between 30 and 900"):
+                            strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+                def describe_with_least_outstanding_requests():
+                    @pytest.fixture
+                    def component_kwargs(component_kwargs):
+                        component_kwargs['rollout_profile'] = "fast"
+                        component_kwargs['load_balancing_algorithm'] = "least_outstanding_requests"
+                        return component_kwargs
+
+                    @pulumi.runtime.test
+                    def it_routes_to_the_least_busy_task(sut):
+                        return assert_output_equals(sut.target_group.load_balancing_algorithm_type,
+                                                    "least_outstanding_requests")
+
+                    @pulumi.runtime.test
+                    def it_turns_slow_start_off(sut):
+                        return assert_output_equals(sut.target_group.slow_start, 0)
+
+                def describe_with_a_grace_period_too_short_to_pass_health_checks():
+                    def it_refuses(component_kwargs, pulumi_set_mocks):
+                        import strongmind_deployment.container
+                        component_kwargs['health_check_grace_period_seconds'] = 30
+                        with pytest.raises(ValueError, match="needs to pass its health checks"):
+                            strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
             def describe_the_load_balancer_listener_for_https():
                 @pytest.fixture
                 def listener(sut):
@@ -446,6 +551,33 @@ def describe_container():
 
                 return pulumi.Output.all(sut.fargate_service.task_definition_args).apply(check_task_definition)
 
+            @pulumi.runtime.test
+            def it_runs_on_x86_by_default(sut):
+                def check_runtime_platform(args):
+                    assert args[0]["runtimePlatform"] == {"cpuArchitecture": "X86_64",
+                                                          "operatingSystemFamily": "LINUX"}
+
+                return pulumi.Output.all(sut.fargate_service.task_definition_args).apply(check_runtime_platform)
+
+            def describe_on_graviton():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs['cpu_architecture'] = "ARM64"
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_runs_on_arm64(sut):
+                    def check_runtime_platform(args):
+                        assert args[0]["runtimePlatform"]["cpuArchitecture"] == "ARM64"
+
+                    return pulumi.Output.all(sut.fargate_service.task_definition_args).apply(check_runtime_platform)
+
+                def it_rejects_an_unknown_architecture(component_kwargs, pulumi_set_mocks):
+                    import strongmind_deployment.container
+                    component_kwargs['cpu_architecture'] = "RISCV"
+                    with pytest.raises(ValueError):
+                        strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
             @pulumi.runtime.test
             def it_sends_env_vars_to_the_task_definition(sut, env_vars):
                 def check_env_vars(args):
@@ -481,6 +613,88 @@ def describe_container():
             def it_sets_the_deployment_maximum_percent_to_200(sut):
                 return assert_output_equals(sut.fargate_service.deployment_maximum_percent, 200)
 
+            @pulumi.runtime.test
+            def it_keeps_every_desired_task_running_during_a_deploy(sut):
+                return assert_output_equals(sut.fargate_service.deployment_minimum_healthy_percent, 100)
+
+            @pulumi.runtime.test
+            def it_rolls_back_deploys_that_keep_failing(sut):
+                def check_circuit_breaker(circuit_breaker):
+                    assert circuit_breaker == {"enable": True, "rollback": True}
+
+                return sut.fargate_service.deployment_circuit_breaker.apply(check_circuit_breaker)
+
+            @pulumi.runtime.test
+            def it_does_not_wait_for_a_steady_state(sut):
+                return assert_output_equals(sut.fargate_service.continue_before_steady_state, True)
+
+            @pulumi.runtime.test
+            def it_has_no_container_health_check_by_default(sut):
+                def check_health_check(args):
+                    assert "healthCheck" not in args[0]["container"]
+
+                return pulumi.Output.all(sut.fargate_service.task_definition_args).apply(check_health_check)
+
+            def describe_with_deployment_overrides():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["deployment_minimum_healthy_percent"] = 50
+                    component_kwargs["deployment_circuit_breaker"] = False
+                    component_kwargs["wait_for_steady_state"] = True
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_sets_the_minimum_healthy_percent(sut):
+                    return assert_output_equals(sut.fargate_service.deployment_minimum_healthy_percent, 50)
+
+                @pulumi.runtime.test
+                def it_turns_the_circuit_breaker_off(sut):
+                    def check_circuit_breaker(circuit_breaker):
+                        assert circuit_breaker == {"enable": False, "rollback": False}
+
+                    return sut.fargate_service.deployment_circuit_breaker.apply(check_circuit_breaker)
+
+                @pulumi.runtime.test
+                def it_waits_for_a_steady_state(sut):
+                    return assert_output_equals(sut.fargate_service.continue_before_steady_state, False)
+
+            def describe_with_a_container_health_check():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["container_health_check"] = {"start_period": 90}
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_checks_the_health_check_path_from_inside_the_container(sut, container_port):
+                    def check_health_check(args):
+                        assert args[0]["container"]["healthCheck"] == {
+                            "command": ["CMD-SHELL", f"curl -f http://localhost:{container_port}/up || exit 1"],
+                            "interval": 10,
+                            "timeout": 5,
+                            "retries": 3,
+                            "startPeriod": 90,
+                        }
+
+                    return pulumi.Output.all(sut.fargate_service.task_definition_args).apply(check_health_check)
+
+                @pulumi.runtime.test
+                def it_takes_the_grace_period_from_the_start_period(sut):
+                    return assert_output_equals(sut.fargate_service.health_check_grace_period_seconds, 90)
+
+                def describe_without_a_load_balancer():
+                    def it_needs_a_command(component_kwargs, pulumi_set_mocks):
+                        import strongmind_deployment.container
+                        component_kwargs["need_load_balancer"] = False
+                        with pytest.raises(ValueError, match="needs a command"):
+                            strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+                def describe_with_a_start_period_over_five_minutes():
+                    def it_refuses(component_kwargs, pulumi_set_mocks):
+                        import strongmind_deployment.container
+                        component_kwargs["container_health_check"] = {"start_period": 600}
+                        with pytest.raises(ValueError, match="between 0 and 300"):
+                            strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
             def describe_desired_count():
                 @pytest.fixture
                 def desired_count():
@@ -404,3 +404,157 @@ def describe_autoscaling():
                 @pulumi.runtime.test
                 def it_scales_up_by_three_instances(step):
                     return assert_output_equals(step.scaling_adjustment, 3)
+
+    def describe_with_target_tracking():
+        @pytest.fixture
+        def autoscale_mode():
+            return "target_tracking"
+
+        @pytest.fixture
+        def component_kwargs(component_kwargs, autoscale_mode):
+            component_kwargs["autoscale"] = True
+            component_kwargs["autoscale_mode"] = autoscale_mode
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_does_not_step_scale(sut):
+            assert sut.autoscaling_out_policy is None
+            assert sut.autoscaling_in_policy is None
+
+        @pulumi.runtime.test
+        def it_does_not_track_request_count_by_default(sut):
+            assert sut.request_count_policy is None
+
+        @pulumi.runtime.test
+        def it_still_alarms_on_running_tasks(sut):
+            assert sut.running_tasks_alarm
+
+        def describe_cpu_policy():
+            @pulumi.runtime.test
+            def it_is_named_autoscaling_cpu_policy(sut, app_name, stack):
+                return assert_output_equals(sut.cpu_policy.name, f"{app_name}-{stack}-autoscaling-cpu-policy")
+
+            @pulumi.runtime.test
+            def it_has_a_target_tracking_policy_type(sut):
+                return assert_output_equals(sut.cpu_policy.policy_type, "TargetTrackingScaling")
+
+            @pulumi.runtime.test
+            def it_tracks_ecs_cpu(sut):
+                configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(
+                    configuration.predefined_metric_specification.predefined_metric_type,
+                    "ECSServiceAverageCPUUtilization")
+
+            @pulumi.runtime.test
+            def it_targets_60_percent(sut):
+                configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(configuration.target_value, 60)
+
+            @pulumi.runtime.test
+            def it_scales_in(sut):
+                configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(configuration.disable_scale_in, False)
+
+            @pulumi.runtime.test
+            def it_lets_new_tasks_warm_up_for_a_minute(sut):
+                configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(configuration.scale_out_cooldown, 60)
+
+            @pulumi.runtime.test
+            def it_waits_five_minutes_after_scaling_in(sut):
+                configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(configuration.scale_in_cooldown, 300)
+
+            def describe_with_overrides():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["target_cpu_utilization"] = 45
+                    component_kwargs["target_tracking_disable_scale_in"] = True
+                    component_kwargs["target_tracking_scale_out_cooldown"] = 120
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_uses_the_custom_target(sut):
+                    configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                    return assert_output_equals(configuration.target_value, 45)
+
+                @pulumi.runtime.test
+                def it_can_disable_scale_in(sut):
+                    configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                    return assert_output_equals(configuration.disable_scale_in, True)
+
+                @pulumi.runtime.test
+                def it_uses_the_custom_warmup(sut):
+                    configuration = sut.cpu_policy.target_tracking_scaling_policy_configuration
+                    return assert_output_equals(configuration.scale_out_cooldown, 120)
+
+        def describe_request_count_policy():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs["target_requests_per_task"] = 800
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_does_not_track_cpu_unless_asked(sut):
+                assert sut.cpu_policy is None
+
+            @pulumi.runtime.test
+            def it_tracks_requests_per_target(sut):
+                configuration = sut.request_count_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(
+                    configuration.predefined_metric_specification.predefined_metric_type,
+                    "ALBRequestCountPerTarget")
+
+            @pulumi.runtime.test
+            def it_targets_the_requested_count(sut):
+                configuration = sut.request_count_policy.target_tracking_scaling_policy_configuration
+                return assert_output_equals(configuration.target_value, 800)
+
+            @pulumi.runtime.test
+            def it_labels_the_metric_with_the_load_balancer_and_target_group(sut):
+                def check_resource_label(args):
+                    load_balancer_arn, target_group_arn, resource_label = args
+                    assert resource_label == \
+                        f"{load_balancer_arn.split('/', 1)[1]}/{target_group_arn.split(':')[-1]}"
+
+                configuration = sut.request_count_policy.target_tracking_scaling_policy_configuration
+                return pulumi.Output.all(sut.load_balancer.arn, sut.target_group.arn,
+                                         configuration.predefined_metric_specification.resource_label).apply(
+                    check_resource_label)
+
+            def describe_and_cpu():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["target_cpu_utilization"] = 70
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_tracks_both(sut):
+                    assert sut.request_count_policy
+                    assert sut.cpu_policy
+
+            def describe_without_a_load_balancer():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["need_load_balancer"] = False
+                    return component_kwargs
+
+                def it_refuses(component_kwargs, pulumi_set_mocks):
+                    import strongmind_deployment.container
+                    with pytest.raises(ValueError, match="needs a load balancer"):
+                        strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+        def describe_with_the_step_policy_as_a_safety_net():
+            @pytest.fixture
+            def autoscale_mode():
+                return "target_tracking_with_step"
+
+            @pulumi.runtime.test
+            def it_keeps_the_response_time_scale_out_policy(sut):
+                assert sut.autoscaling_out_policy
+                assert sut.autoscaling_out_alarm
+
+            @pulumi.runtime.test
+            def it_leaves_scale_in_to_target_tracking(sut):
+                assert sut.autoscaling_in_policy is None
+                assert sut.cpu_policy
@@ -0,0 +1,89 @@
+import os
+import subprocess
+
+import pytest
+from mockito import spy2, verify
+
+from strongmind_deployment import context
+from strongmind_deployment.context import ProjectContext, get_project_context, set_project_context, \
+    reset_project_context
+
+
+def describe_project_context():
+    @pytest.fixture(autouse=True)
+    def fresh_context():
+        reset_project_context()
+        yield
+        reset_project_context()
+
+    @pytest.fixture
+    def app_name(faker):
+        return faker.word()
+
+    @pytest.fixture
+    def stack(faker):
+        return faker.word()
+
+    @pytest.fixture
+    def environment(faker):
+        os.environ["ENVIRONMENT_NAME"] = faker.word()
+        return os.environ["ENVIRONMENT_NAME"]
+
+    @pytest.fixture
+    def pulumi_mocks(faker):
+        from tests.mocks import get_pulumi_mocks
+        return get_pulumi_mocks(faker)
+
+    @pytest.fixture
+    def sut(pulumi_set_mocks, environment):
+        return get_project_context()
+
+    def it_uses_the_pulumi_project_and_stack(sut, app_name, stack):
+        assert sut.project == app_name
+        assert sut.stack == stack
+        assert sut.namespace == f"{app_name}-{stack}"
+
+    def it_uses_the_environment_name(sut, environment):
+        assert sut.environment == environment
+
+    def it_reads_the_owning_team_from_codeowners(sut):
+        assert sut.owning_team == "binary-ops"
+
+    def it_has_standard_tags(sut, app_name, environment):
+        assert sut.tags == {
+            "product": app_name,
+            "repository": app_name,
+            "service": app_name,
+            "environment": environment,
+            "owner": "binary-ops",
+        }
+
+    def it_returns_a_copy_of_the_tags(sut):
+        sut.tags["extra"] = "value"
+        assert "extra" not in sut.tags
+
+    def it_is_shared_between_callers(sut):
+        assert get_project_context() is sut
+
+    def it_only_shells_out_to_git_once(sut, unstub):
+        sut.owning_team
+        spy2(subprocess.check_output)
+        get_project_context().owning_team
+        context.get_owning_team()
+        verify(subprocess, times=0).check_output(...)
+
+    def describe_when_overridden():
+        @pytest.fixture
+        def override():
+            return ProjectContext("project", "stack", "test", repo_root="/tmp", owning_team="team")
+
+        @pytest.fixture
+        def sut(pulumi_set_mocks, override):
+            set_project_context(override)
+            return get_project_context()
+
+        def it_returns_the_override(sut, override):
+            assert sut is override
+
+        def it_uses_the_overridden_owner(sut):
+            assert sut.tags["owner"] == "team"
@@ -1,3 +1,4 @@
+import json
 import os
 
 import pulumi.runtime
@@ -119,4 +120,68 @@ def describe_a_dashboard_component():
 
         @pulumi.runtime.test
         def it_has_a_custom_namespace(sut, namespace):
-            assert sut.namespace == namespace
\ No newline at end of file
+            assert sut.namespace == namespace
+    def describe_rds_query_performance():
+        @pytest.fixture
+        def performance_insights():
+            return False
+
+        @pytest.fixture
+        def sut(name, web_container, ecs_cluster, rds_serverless_cluster_instance, performance_insights,
+                pulumi_set_mocks):
+            from strongmind_deployment.dashboard import DashboardComponent
+            return DashboardComponent(name,
+                                      web_container=web_container,
+                                      ecs_cluster=ecs_cluster,
+                                      rds_serverless_cluster_instance=rds_serverless_cluster_instance,
+                                      performance_insights=performance_insights)
+
+        @pytest.fixture
+        def widgets(sut):
+            return sut.dashboard.dashboard_body.apply(lambda body: {
+                widget["properties"]["title"]: widget for widget in json.loads(body)["widgets"]
+            })
+
+        @pulumi.runtime.test
+        def it_shows_read_and_write_latency(widgets):
+            def check(widgets):
+                metrics = widgets["RDS Read/Write Latency"]["properties"]["metrics"]
+                assert [metric[1] for metric in metrics] == ["ReadLatency", "WriteLatency"]
+
+            return widgets.apply(check)
+
+        @pulumi.runtime.test
+        def it_shows_commit_latency(widgets, rds_serverless_cluster_instance):
+            def check(args):
+                widgets, identifier = args
+                assert widgets["RDS Commit Latency"]["properties"]["metrics"] == [
+                    ["AWS/RDS", "CommitLatency", "DBInstanceIdentifier", identifier]]
+
+            return pulumi.Output.all(widgets, rds_serverless_cluster_instance.identifier).apply(check)
+
+        @pulumi.runtime.test
+        def it_shows_the_worst_buffer_cache_hit_ratio(widgets):
+            def check(widgets):
+                assert widgets["RDS Buffer Cache Hit Ratio"]["properties"]["stat"] == "Minimum"
+
+            return widgets.apply(check)
+
+        @pulumi.runtime.test
+        def it_has_no_db_load_without_performance_insights(widgets):
+            def check(widgets):
+                assert "RDS DB Load by Wait Type" not in widgets
+
+            return widgets.apply(check)
+
+        def describe_with_performance_insights():
+            @pytest.fixture
+            def performance_insights():
+                return True
+
+            @pulumi.runtime.test
+            def it_shows_db_load_by_wait_type(widgets):
+                def check(widgets):
+                    metrics = widgets["RDS DB Load by Wait Type"]["properties"]["metrics"]
+                    assert [metric[1] for metric in metrics] == ["DBLoad", "DBLoadCPU", "DBLoadNonCPU"]
+
+                return widgets.apply(check)
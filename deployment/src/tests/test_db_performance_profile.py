@@ -0,0 +1,58 @@
+import pulumi_aws as aws
+import pytest
+
+from strongmind_deployment.db_performance_profile import DbPerformanceProfile, parameter_args, \
+    DEFAULT_CLUSTER_PARAMETERS
+
+
+def describe_db_performance_profile():
+    def it_uses_the_oltp_defaults():
+        profile = DbPerformanceProfile.from_kwarg(True)
+
+        assert profile.cluster_parameters == DEFAULT_CLUSTER_PARAMETERS
+        assert profile.instance_parameters["random_page_cost"] == 1.1
+
+    def it_is_off_without_a_profile():
+        assert DbPerformanceProfile.from_kwarg(None) is None
+
+    def it_merges_overrides_over_the_defaults():
+        profile = DbPerformanceProfile.from_kwarg({"instance_parameters": {"work_mem": 65536}})
+
+        assert profile.instance_parameters["work_mem"] == 65536
+        assert profile.instance_parameters["effective_io_concurrency"] == 200
+
+    def it_drops_defaults_set_to_none():
+        profile = DbPerformanceProfile.from_kwarg({"cluster_parameters": {"auto_explain.log_format": None}})
+
+        assert "auto_explain.log_format" not in profile.cluster_parameters
+
+    def it_leaves_the_storage_alone_by_default():
+        assert DbPerformanceProfile().cluster_storage_type is None
+
+    def it_uses_io_optimized_storage():
+        assert DbPerformanceProfile(storage_type="aurora-iopt1").cluster_storage_type == "aurora-iopt1"
+
+    def it_switches_back_to_standard_storage():
+        assert DbPerformanceProfile(storage_type="aurora").cluster_storage_type == ""
+
+    def it_rejects_other_storage_types():
+        with pytest.raises(ValueError, match="storage_type"):
+            DbPerformanceProfile(storage_type="gp3")
+
+    @pytest.mark.parametrize("engine_version, family", [
+        ("15.4", "aurora-postgresql15"),
+        ("16", "aurora-postgresql16"),
+    ])
+    def it_picks_the_family_from_the_major_version(engine_version, family):
+        assert DbPerformanceProfile.parameter_group_family(engine_version) == family
+
+
+def describe_parameter_args():
+    def it_applies_static_parameters_on_reboot():
+        args = parameter_args({"shared_preload_libraries": "pg_stat_statements", "work_mem": 4096},
+                              aws.rds.ParameterGroupParameterArgs)
+
+        assert [(arg.name, arg.value, arg.apply_method) for arg in args] == [
+            ("shared_preload_libraries", "pg_stat_statements", "pending-reboot"),
+            ("work_mem", "4096", "immediate"),
+        ]
@@ -1,32 +1,43 @@
+import threading
+import time
+
 import pulumi
 import pytest
 import boto3
 from botocore.stub import Stubber
 
-from strongmind_deployment.execution import ExecutionResourceProvider, ExecutionResourceInputs
+from pulumi.runtime import rpc
+
+from strongmind_deployment.execution import ExecutionResourceProvider, ExecutionResourceInputs, TaskWaiter, \
+    LogTail, execution_fingerprint, hash_directory
 
 
 def describe_an_execution_resource_provider():
     # region fixtures
     @pytest.fixture
-    def inputs(stubbed_ecs_client):
+    def inputs():
         return ExecutionResourceInputs(
             cluster="test_ecs_cluster",
             family="family",
             subnets=["subnets"],
             security_groups=["security_groups"],
-            ecs_client=stubbed_ecs_client
+            image="app@sha256:aaa",
         )
 
     @pytest.fixture
-    def sut(stubbed_ecs_client):
-        from strongmind_deployment.execution import ExecutionResourceProvider
-        return ExecutionResourceProvider()
+    def sut(stubbed_ecs_client, logs_client):
+        return ExecutionResourceProvider(ecs_client=stubbed_ecs_client,
+                                         logs_client=logs_client,
+                                         waiter=TaskWaiter(stubbed_ecs_client, sleep=lambda _: None))
 
     @pytest.fixture
     def ecs_client(aws_credentials):
         yield boto3.client('ecs')
 
+    @pytest.fixture
+    def logs_client(aws_credentials):
+        yield boto3.client('logs')
+
     @pytest.fixture
     def stubber(ecs_client):
         yield Stubber(ecs_client)
@@ -75,6 +86,9 @@ def describe_an_execution_resource_provider():
         # so that we always run the execution
         assert sut.diff("id", {}, {}).changes
 
+    def it_does_not_put_clients_in_the_inputs(inputs):
+        assert "ecs_client" not in vars(inputs)
+
     def describe_when_creating():
         @pytest.fixture
         def result(sut: ExecutionResourceProvider, stubbed_ecs_client, inputs):
@@ -86,15 +100,17 @@ def describe_an_execution_resource_provider():
         def it_returns_a_pulumi_create_result(result):
             assert isinstance(result, pulumi.dynamic.CreateResult)
 
+        def it_records_the_fingerprint(result, inputs):
+            assert result.outs["fingerprint"] == execution_fingerprint({**vars(inputs), "image": "sha256:aaa"})
+
         def describe_when_the_task_fails():
             @pytest.fixture
             def container_exit_code():
                 return 1
 
-            def it_raises_an_exception(sut):
-                with pytest.raises(Exception):
-                    sut.create({"cluster": "test_ecs_cluster", "family": "family", "subnets": ["subnets"],
-                                "security_groups": ["security_groups"]})
+            def it_raises_an_exception(sut, inputs):
+                with pytest.raises(Exception, match="exited with code 1"):
+                    sut.create({**vars(inputs)})
 
     def describe_when_updating():
         @pytest.fixture
@@ -112,6 +128,399 @@ def describe_an_execution_resource_provider():
             def container_exit_code():
                 return 1
 
-            def it_raises_an_exception(sut):
-                with pytest.raises(Exception):
-                    sut.update("id", {}, {})
+            def it_raises_an_exception(sut, inputs):
+                with pytest.raises(Exception, match="exited with code 1"):
+                    sut.update("id", {}, {**vars(inputs)})
+
+
+def describe_a_task_waiter():
+    @pytest.fixture
+    def ecs_client(aws_credentials):
+        yield boto3.client('ecs')
+
+    @pytest.fixture
+    def stubber(ecs_client):
+        stubber = Stubber(ecs_client)
+        yield stubber
+        stubber.deactivate()
+
+    @pytest.fixture
+    def sleeps():
+        return []
+
+    @pytest.fixture
+    def sut(ecs_client, sleeps):
+        return TaskWaiter(ecs_client, initial_delay=1, max_delay=4, backoff=2, sleep=sleeps.append)
+
+    def _add_task(stubber, status, exit_code=None):
+        container = {} if exit_code is None else {"exitCode": exit_code}
+        stubber.add_response('describe_tasks', {"tasks": [{"lastStatus": status, "containers": [container]}]},
+                             {"cluster": "cluster", "tasks": ["task"]})
+
+    def it_backs_off_while_the_task_runs(sut, stubber, sleeps):
+        for _ in range(5):
+            _add_task(stubber, "RUNNING")
+        _add_task(stubber, "STOPPED", 0)
+        stubber.activate()
+
+        sut.wait("cluster", "task")
+
+        assert sleeps == [1, 2, 4, 4, 4]
+
+    def it_resets_the_delay_when_the_status_changes(sut, stubber, sleeps):
+        _add_task(stubber, "PROVISIONING")
+        _add_task(stubber, "PROVISIONING")
+        _add_task(stubber, "RUNNING")
+        _add_task(stubber, "STOPPED", 0)
+        stubber.activate()
+
+        sut.wait("cluster", "task")
+
+        assert sleeps == [1, 2, 1]
+
+    def it_returns_as_soon_as_the_container_exits(sut, stubber, sleeps):
+        _add_task(stubber, "DEACTIVATING", 1)
+        stubber.activate()
+
+        task = sut.wait("cluster", "task")
+
+        assert task["containers"][0]["exitCode"] == 1
+        assert sleeps == []
+
+
+def describe_a_log_tail():
+    @pytest.fixture
+    def logs_client(aws_credentials):
+        yield boto3.client('logs')
+
+    @pytest.fixture
+    def stubber(logs_client):
+        stubber = Stubber(logs_client)
+        yield stubber
+        stubber.deactivate()
+
+    @pytest.fixture
+    def lines():
+        return []
+
+    @pytest.fixture
+    def sut(logs_client, lines):
+        return LogTail(logs_client, "group", "stream", output=lines.append)
+
+    def _expected_params(token=None):
+        params = {"logGroupName": "group", "logStreamName": "stream", "startFromHead": True}
+        if token:
+            params["nextToken"] = token
+        return params
+
+    def it_follows_the_forward_token_to_the_end_of_the_stream(sut, stubber, lines):
+        stubber.add_response('get_log_events',
+                             {"events": [{"message": "one"}], "nextForwardToken": "f/1"},
+                             _expected_params())
+        stubber.add_response('get_log_events',
+                             {"events": [{"message": "two"}], "nextForwardToken": "f/2"},
+                             _expected_params("f/1"))
+        stubber.add_response('get_log_events',
+                             {"events": [], "nextForwardToken": "f/2"},
+                             _expected_params("f/2"))
+        stubber.activate()
+
+        sut.poll()
+
+        assert lines == ["one", "two"]
+        stubber.assert_no_pending_responses()
+
+    def it_resumes_from_the_last_token(sut, stubber, lines):
+        stubber.add_response('get_log_events',
+                             {"events": [{"message": "one"}], "nextForwardToken": "f/1"},
+                             _expected_params())
+        stubber.add_response('get_log_events', {"events": [], "nextForwardToken": "f/1"}, _expected_params("f/1"))
+        stubber.add_response('get_log_events',
+                             {"events": [{"message": "two"}], "nextForwardToken": "f/2"},
+                             _expected_params("f/1"))
+        stubber.add_response('get_log_events', {"events": [], "nextForwardToken": "f/2"}, _expected_params("f/2"))
+        stubber.activate()
+
+        sut.poll()
+        sut.poll()
+
+        assert lines == ["one", "two"]
+
+    def it_waits_for_the_stream_to_exist(sut, stubber, lines):
+        stubber.add_client_error('get_log_events', service_error_code='ResourceNotFoundException')
+        stubber.activate()
+
+        sut.poll()
+
+        assert lines == []
+
+    def it_stops_tailing_on_other_errors(sut, stubber, lines, monkeypatch):
+        warnings = []
+        monkeypatch.setattr(pulumi.log, 'warn', warnings.append)
+        stubber.add_client_error('get_log_events', service_error_code='ThrottlingException')
+        stubber.activate()
+
+        sut.poll()
+        sut.stop()
+
+        assert lines == []
+        assert len(warnings) == 1
+        stubber.assert_no_pending_responses()
+
+
+def describe_execution_fingerprints():
+    @pytest.fixture
+    def sut():
+        return ExecutionResourceProvider()
+
+    @pytest.fixture
+    def props():
+        return {
+            "cluster": "cluster",
+            "family": "family",
+            "image": "image@sha256:aaa",
+            "command": ["sh", "-c", "bundle exec rails db:migrate"],
+            "revision": 3,
+            "content_hash": "abc123",
+            "skip_unchanged": True,
+            "force": False,
+        }
+
+    @pytest.fixture
+    def olds(sut, props):
+        return {"output": True, "fingerprint": sut.fingerprint(props)}
+
+    def it_skips_the_run_when_nothing_changed(sut, olds, props):
+        assert not sut.diff("id", olds, props).changes
+
+    @pytest.mark.parametrize("key,value", [
+        ("image", "image@sha256:bbb"),
+        ("command", ["sh", "-c", "bundle exec rails db:seed"]),
+        ("revision", 4),
+        ("content_hash", "def456"),
+    ])
+    def it_runs_when_a_fingerprinted_input_changes(sut, olds, props, key, value):
+        assert sut.diff("id", olds, {**props, key: value}).changes
+
+    def it_ignores_inputs_outside_the_fingerprint(sut, olds, props):
+        assert not sut.diff("id", olds, {**props, "cluster": "other"}).changes
+
+    def it_runs_when_an_input_is_not_yet_known(sut, olds, props):
+        assert sut.diff("id", olds, {**props, "revision": rpc.UNKNOWN}).changes
+
+    def it_runs_when_there_is_no_previous_fingerprint(sut, props):
+        assert sut.diff("id", {"output": True}, props).changes
+
+    def it_runs_when_forced(sut, olds, props):
+        assert sut.diff("id", olds, {**props, "force": True}).changes
+
+    def it_runs_every_time_unless_skipping_is_enabled(sut, olds, props):
+        assert sut.diff("id", olds, {**props, "skip_unchanged": False}).changes
+
+    def it_runs_when_the_image_digest_is_unknown(sut, props):
+        image = {**props, "image": "docker.io/library/app:latest"}
+        olds = {"output": True, "fingerprint": sut.fingerprint(image)}
+        assert sut.diff("id", olds, image).changes
+
+    def describe_with_a_reused_ecr_tag():
+        IMAGE = "123456789012.dkr.ecr.us-west-2.amazonaws.com/app:latest"
+
+        @pytest.fixture
+        def ecr_client(aws_credentials):
+            return boto3.client('ecr', region_name='us-west-2')
+
+        @pytest.fixture
+        def stubber(ecr_client):
+            stubber = Stubber(ecr_client)
+            yield stubber
+            stubber.deactivate()
+
+        @pytest.fixture
+        def sut(ecr_client):
+            return ExecutionResourceProvider(ecr_client=ecr_client)
+
+        @pytest.fixture
+        def props(props):
+            return {**props, "image": IMAGE}
+
+        def _describe(stubber, digest):
+            stubber.add_response('describe_images',
+                                 {"imageDetails": [{"imageDigest": digest}]},
+                                 {"registryId": "123456789012", "repositoryName": "app",
+                                  "imageIds": [{"imageTag": "latest"}]})
+
+        def it_runs_when_the_tag_points_at_new_code(sut, stubber, props):
+            _describe(stubber, "sha256:aaa")
+            _describe(stubber, "sha256:bbb")
+            stubber.activate()
+
+            olds = {"output": True, "fingerprint": sut.fingerprint(props)}
+
+            assert sut.diff("id", olds, props).changes
+
+        def it_skips_when_the_tag_still_points_at_the_same_image(sut, stubber, props):
+            _describe(stubber, "sha256:aaa")
+            _describe(stubber, "sha256:aaa")
+            stubber.activate()
+
+            olds = {"output": True, "fingerprint": sut.fingerprint(props)}
+
+            assert not sut.diff("id", olds, props).changes
+
+        def it_runs_when_the_tag_cannot_be_found(sut, stubber, props):
+            _describe(stubber, "sha256:aaa")
+            stubber.add_client_error('describe_images', service_error_code='ImageNotFoundException')
+            stubber.activate()
+
+            olds = {"output": True, "fingerprint": sut.fingerprint(props)}
+
+            assert sut.diff("id", olds, props).changes
+
+    def describe_hashing_a_directory():
+        @pytest.fixture
+        def migrations(tmp_path):
+            (tmp_path / "20240101_create_users.rb").write_text("create_table :users")
+            return tmp_path
+
+        def it_is_stable(migrations):
+            assert hash_directory(str(migrations)) == hash_directory(str(migrations))
+
+        def it_changes_when_a_file_is_added(migrations):
+            before = hash_directory(str(migrations))
+            (migrations / "20240102_add_email.rb").write_text("add_column :users, :email")
+            assert hash_directory(str(migrations)) != before
+
+        def it_changes_when_a_file_is_edited(migrations):
+            before = hash_directory(str(migrations))
+            (migrations / "20240101_create_users.rb").write_text("create_table :people")
+            assert hash_directory(str(migrations)) != before
+
+
+def describe_execution_steps():
+    class FakeEcsClient:
+        """Finishes each task immediately, failing those whose command is `fail`."""
+
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.started = []
+            self.commands = {}
+            self.running = 0
+            self.most_running = 0
+
+        def run_task(self, **kwargs):
+            command = kwargs['overrides']['containerOverrides'][0]['command']
+            with self.lock:
+                task_id = f"task-{len(self.started)}"
+                self.started.append(command)
+                self.commands[task_id] = command
+                self.running += 1
+                self.most_running = max(self.most_running, self.running)
+            return {"tasks": [{"taskArn": f"arn/{task_id}"}]}
+
+        def describe_tasks(self, cluster, tasks):
+            time.sleep(0.05)
+            with self.lock:
+                self.running -= 1
+            exit_code = 1 if self.commands[tasks[0]] == ["fail"] else 0
+            return {"tasks": [{"lastStatus": "STOPPED", "containers": [{"exitCode": exit_code}]}]}
+
+    @pytest.fixture
+    def ecs_client():
+        return FakeEcsClient()
+
+    @pytest.fixture
+    def logs_client(aws_credentials):
+        yield boto3.client('logs')
+
+    @pytest.fixture
+    def sut(ecs_client, logs_client):
+        return ExecutionResourceProvider(ecs_client=ecs_client, logs_client=logs_client)
+
+    @pytest.fixture
+    def max_concurrency():
+        return 4
+
+    @pytest.fixture
+    def steps():
+        return [
+            {"name": "migrate", "command": ["migrate"]},
+            {"name": "seed", "command": ["seed"], "depends_on": ["migrate"]},
+            {"name": "assets", "command": ["assets"]},
+        ]
+
+    @pytest.fixture
+    def inputs(steps, max_concurrency):
+        return ExecutionResourceInputs(
+            cluster="cluster",
+            family="family",
+            subnets=["subnets"],
+            security_groups=["security_groups"],
+            steps=steps,
+            max_concurrency=max_concurrency,
+        )
+
+    def it_runs_every_step(sut, inputs, ecs_client):
+        sut.create({**vars(inputs)})
+        assert sorted(ecs_client.started) == [["assets"], ["migrate"], ["seed"]]
+
+    def it_runs_independent_steps_in_parallel(sut, inputs, ecs_client):
+        sut.create({**vars(inputs)})
+        assert ecs_client.most_running == 2
+
+    def it_waits_for_dependencies(sut, inputs, ecs_client):
+        sut.create({**vars(inputs)})
+        assert ecs_client.started.index(["migrate"]) < ecs_client.started.index(["seed"])
+
+    def it_reports_how_long_each_step_took(sut, inputs):
+        result = sut.create({**vars(inputs)})
+        assert set(result.outs["durations"]) == {"migrate", "seed", "assets"}
+        assert all(duration > 0 for duration in result.outs["durations"].values())
+
+    def describe_with_a_concurrency_limit_of_one():
+        @pytest.fixture
+        def max_concurrency():
+            return 1
+
+        def it_runs_one_step_at_a_time(sut, inputs, ecs_client):
+            sut.create({**vars(inputs)})
+            assert ecs_client.most_running == 1
+
+    def describe_when_a_step_fails():
+        @pytest.fixture
+        def steps():
+            return [
+                {"name": "migrate", "command": ["fail"]},
+                {"name": "seed", "command": ["seed"], "depends_on": ["migrate"]},
+                {"name": "assets", "command": ["assets"]},
+            ]
+
+        def it_raises_naming_the_failed_and_skipped_steps(sut, inputs):
+            with pytest.raises(Exception, match="migrate: Task exited with code 1.*skipped seed"):
+                sut.create({**vars(inputs)})
+
+        def it_does_not_start_dependent_steps(sut, inputs, ecs_client):
+            with pytest.raises(Exception):
+                sut.create({**vars(inputs)})
+            assert ["seed"] not in ecs_client.started
+
+        def it_still_finishes_independent_steps(sut, inputs, ecs_client):
+            with pytest.raises(Exception):
+                sut.create({**vars(inputs)})
+            assert ["assets"] in ecs_client.started
+
+    def describe_validation():
+        @pytest.mark.parametrize("steps,message", [
+            ([{"command": ["a"]}], "needs a name"),
+            ([{"name": "a", "command": ["a"]}, {"name": "a", "command": ["b"]}], "unique"),
+            ([{"name": "a"}], "needs a command"),
+            ([{"name": "a", "command": ["a"], "depends_on": ["b"]}], "unknown step b"),
+            ([{"name": "a", "command": ["a"], "depends_on": ["b"]},
+              {"name": "b", "command": ["b"], "depends_on": ["a"]}], "cycle"),
+        ])
+        def it_rejects_invalid_steps(steps, message):
+            with pytest.raises(ValueError, match=message):
+                ExecutionResourceInputs("cluster", "family", [], [], steps=steps)
+
+        def it_rejects_a_non_positive_concurrency():
+            with pytest.raises(ValueError):
+                ExecutionResourceInputs("cluster", "family", [], [], max_concurrency=0)
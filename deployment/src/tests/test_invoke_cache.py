@@ -0,0 +1,108 @@
+import os
+import time
+
+import pytest
+
+from strongmind_deployment import invoke_cache
+from strongmind_deployment.invoke_cache import cached_invoke, clear_invoke_cache, configure_invoke_cache
+
+
+class _FilterArgs:
+    def __init__(self, name, values):
+        self.name = name
+        self.values = values
+
+
+def describe_cached_invoke():
+    @pytest.fixture
+    def lookup():
+        def get_policy(**kwargs):
+            get_policy.calls.append(kwargs)
+            return {'answer': len(get_policy.calls)}
+        get_policy.calls = []
+        return get_policy
+
+    @pytest.fixture(autouse=True)
+    def no_disk_cache():
+        configure_invoke_cache(ttl=0)
+        yield
+        configure_invoke_cache()
+
+    def it_calls_through_once_for_the_same_arguments(lookup):
+        first = cached_invoke(lookup, name="Managed-CachingOptimized")
+        second = cached_invoke(lookup, name="Managed-CachingOptimized")
+
+        assert first == second == {'answer': 1}
+        assert len(lookup.calls) == 1
+
+    def it_calls_again_for_different_arguments(lookup):
+        cached_invoke(lookup, name="Managed-CachingOptimized")
+        cached_invoke(lookup, name="Managed-AllViewer")
+
+        assert len(lookup.calls) == 2
+
+    def it_treats_equal_argument_objects_as_the_same(lookup):
+        cached_invoke(lookup, filters=[_FilterArgs("vpc-id", ["vpc-1"])])
+        cached_invoke(lookup, filters=[_FilterArgs("vpc-id", ["vpc-1"])])
+        cached_invoke(lookup, filters=[_FilterArgs("vpc-id", ["vpc-2"])])
+
+        assert len(lookup.calls) == 2
+
+    def describe_with_a_disk_ttl():
+        @pytest.fixture
+        def cache_path(tmp_path):
+            return str(tmp_path / 'invokes.pickle')
+
+        def it_reuses_answers_from_a_previous_run(lookup, cache_path):
+            configure_invoke_cache(ttl=60, path=cache_path)
+
+            cached_invoke(lookup, name="Managed-CachingOptimized")
+            clear_invoke_cache()
+            answer = cached_invoke(lookup, name="Managed-CachingOptimized")
+
+            assert answer == {'answer': 1}
+            assert len(lookup.calls) == 1
+
+        def it_ignores_expired_answers(lookup, cache_path, monkeypatch):
+            configure_invoke_cache(ttl=60, path=cache_path)
+
+            cached_invoke(lookup, name="Managed-CachingOptimized")
+            clear_invoke_cache()
+            later = time.time() + 120
+            monkeypatch.setattr(invoke_cache.time, 'time', lambda: later)
+            cached_invoke(lookup, name="Managed-CachingOptimized")
+
+            assert len(lookup.calls) == 2
+
+        def it_keeps_the_cache_private(lookup, cache_path):
+            configure_invoke_cache(ttl=60, path=cache_path)
+
+            cached_invoke(lookup, name="Managed-CachingOptimized")
+
+            assert os.stat(cache_path).st_mode & 0o777 == 0o600
+
+        def it_ignores_a_cache_others_can_write(lookup, cache_path):
+            configure_invoke_cache(ttl=60, path=cache_path)
+
+            cached_invoke(lookup, name="Managed-CachingOptimized")
+            os.chmod(cache_path, 0o666)
+            clear_invoke_cache()
+            cached_invoke(lookup, name="Managed-CachingOptimized")
+
+            assert len(lookup.calls) == 2
+
+    def describe_with_an_invalid_ttl_variable():
+        @pytest.fixture(autouse=True)
+        def ttl_variable(monkeypatch):
+            configure_invoke_cache()
+            monkeypatch.setenv('STRONGMIND_INVOKE_CACHE_TTL', 'an hour')
+
+        def it_warns_and_skips_the_disk(lookup, monkeypatch):
+            warnings = []
+            monkeypatch.setattr(invoke_cache.pulumi.log, 'warn', warnings.append)
+            monkeypatch.setitem(invoke_cache._settings, 'warned_ttl', False)
+
+            assert cached_invoke(lookup, name="Managed-CachingOptimized") == {'answer': 1}
+            assert warnings == [
+                "STRONGMIND_INVOKE_CACHE_TTL must be a number of seconds; not caching invokes on disk"
+            ]
@@ -0,0 +1,247 @@
+import boto3
+import pulumi
+import pytest
+from botocore.stub import Stubber
+from pytest_describe import behaves_like
+
+from strongmind_deployment.predictive_scaling import PredictiveScalingConfiguration, PredictiveScalingMode, \
+    PredictiveScalingPolicyProvider, scaling_policy_request
+from tests.a_pulumi_containerized_app import a_pulumi_containerized_app
+from tests.shared import assert_output_equals, assert_outputs_equal
+
+
+def _props(**overrides):
+    return {
+        "policy_name": "app-stage-web-predictive-scaling-policy",
+        "service_namespace": "ecs",
+        "resource_id": "service/cluster/app-stage",
+        "scalable_dimension": "ecs:service:DesiredCount",
+        "metric": "cpu",
+        "resource_label": None,
+        "target_value": 60.0,
+        "mode": "ForecastAndScale",
+        "scheduling_buffer_time": 300.0,
+        "max_capacity_breach_behavior": "HonorMaxCapacity",
+        "max_capacity_buffer": None,
+        **overrides,
+    }
+
+
+def describe_predictive_scaling_configuration():
+    def it_defaults_to_forecasting_cpu_only():
+        configuration = PredictiveScalingConfiguration.from_kwarg({"target_value": 60})
+
+        assert configuration.metric == "cpu"
+        assert configuration.mode == PredictiveScalingMode.FORECAST_ONLY
+        assert configuration.scheduling_buffer_time == 300
+
+    def it_is_off_without_a_configuration():
+        assert PredictiveScalingConfiguration.from_kwarg(None) is None
+
+    def it_rejects_an_unknown_metric():
+        with pytest.raises(ValueError, match="must be one of"):
+            PredictiveScalingConfiguration(target_value=60, metric="latency")
+
+    def it_needs_a_target_value():
+        with pytest.raises(ValueError, match="positive target_value"):
+            PredictiveScalingConfiguration(target_value=0)
+
+    def it_rejects_an_unknown_mode():
+        with pytest.raises(ValueError):
+            PredictiveScalingConfiguration(target_value=60, mode="Sometimes")
+
+    def it_only_buffers_max_capacity_when_it_may_increase():
+        with pytest.raises(ValueError, match="IncreaseMaxCapacity"):
+            PredictiveScalingConfiguration(target_value=60, max_capacity_buffer=10)
+
+
+def describe_scaling_policy_request():
+    def it_builds_a_predictive_policy():
+        request = scaling_policy_request(_props())
+
+        assert request["PolicyType"] == "PredictiveScaling"
+        assert request["PredictiveScalingPolicyConfiguration"] == {
+            "MetricSpecifications": [{
+                "TargetValue": 60.0,
+                "PredefinedMetricPairSpecification": {"PredefinedMetricType": "ECSServiceCPUUtilization"},
+            }],
+            "Mode": "ForecastAndScale",
+            "SchedulingBufferTime": 300,
+            "MaxCapacityBreachBehavior": "HonorMaxCapacity",
+        }
+
+    def it_casts_integers_back_from_the_engine():
+        configuration = scaling_policy_request(_props(max_capacity_breach_behavior="IncreaseMaxCapacity",
+                                                      max_capacity_buffer=10.0))["PredictiveScalingPolicyConfiguration"]
+
+        assert type(configuration["SchedulingBufferTime"]) is int
+        assert type(configuration["MaxCapacityBuffer"]) is int
+
+    def it_labels_the_request_metric():
+        request = scaling_policy_request(_props(metric="requests", resource_label="app/lb/1/targetgroup/tg/2"))
+
+        assert request["PredictiveScalingPolicyConfiguration"]["MetricSpecifications"][0][
+                   "PredefinedMetricPairSpecification"] == {
+                   "PredefinedMetricType": "ALBRequestCount",
+                   "ResourceLabel": "app/lb/1/targetgroup/tg/2",
+               }
+
+
+def describe_predictive_scaling_policy_provider():
+    @pytest.fixture
+    def client(aws_credentials):
+        return boto3.client('application-autoscaling')
+
+    @pytest.fixture
+    def stubber(client):
+        stubber = Stubber(client)
+        stubber.activate()
+        yield stubber
+        stubber.deactivate()
+
+    @pytest.fixture
+    def sut(client):
+        return PredictiveScalingPolicyProvider(client=client)
+
+    def it_is_a_dynamic_resource_provider(sut):
+        assert isinstance(sut, pulumi.dynamic.ResourceProvider)
+
+    def it_puts_the_policy_on_create(sut, stubber):
+        stubber.add_response('put_scaling_policy', {"PolicyARN": "arn:policy"}, scaling_policy_request(_props()))
+
+        result = sut.create(_props())
+
+        stubber.assert_no_pending_responses()
+        assert result.id == "app-stage-web-predictive-scaling-policy"
+        assert result.outs["policy_arn"] == "arn:policy"
+
+    def it_puts_the_policy_again_on_update(sut, stubber):
+        stubber.add_response('put_scaling_policy', {"PolicyARN": "arn:policy"},
+                             scaling_policy_request(_props(target_value=70.0)))
+
+        result = sut.update("id", _props(), _props(target_value=70.0))
+
+        stubber.assert_no_pending_responses()
+        assert result.outs["policy_arn"] == "arn:policy"
+
+    def it_deletes_the_policy(sut, stubber):
+        stubber.add_response('delete_scaling_policy', {}, {
+            "PolicyName": "app-stage-web-predictive-scaling-policy",
+            "ServiceNamespace": "ecs",
+            "ResourceId": "service/cluster/app-stage",
+            "ScalableDimension": "ecs:service:DesiredCount",
+        })
+
+        sut.delete("id", _props())
+
+        stubber.assert_no_pending_responses()
+
+    def it_ignores_a_policy_that_is_already_gone(sut, stubber):
+        stubber.add_client_error('delete_scaling_policy', service_error_code='ObjectNotFoundException')
+
+        sut.delete("id", _props())
+
+    def it_updates_in_place_when_the_forecast_changes(sut):
+        result = sut.diff("id", {**_props(), "policy_arn": "arn:policy"}, _props(mode="ForecastOnly"))
+
+        assert result.changes
+        assert not result.replaces
+
+    def it_replaces_the_policy_when_its_target_changes(sut):
+        result = sut.diff("id", _props(), _props(resource_id="service/cluster/other"))
+
+        assert result.replaces == ["resource_id"]
+
+    def it_sees_no_change_when_nothing_changed(sut):
+        assert not sut.diff("id", {**_props(), "policy_arn": "arn:policy"}, _props()).changes
+
+
+@behaves_like(a_pulumi_containerized_app)
+def describe_predictive_scaling():
+    def describe_on_the_web_service():
+        @pytest.fixture
+        def predictive_scaling():
+            return {"metric": "requests", "target_value": 1000, "mode": "ForecastAndScale",
+                    "scheduling_buffer_time": 600}
+
+        @pytest.fixture
+        def component_kwargs(component_kwargs, predictive_scaling):
+            component_kwargs["autoscale"] = True
+            component_kwargs["predictive_scaling"] = predictive_scaling
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_keeps_the_reactive_policies(sut):
+            assert sut.autoscaling_out_policy
+            assert sut.autoscaling_in_policy
+
+        @pulumi.runtime.test
+        def it_is_named_after_the_service(sut, app_name, stack):
+            return assert_output_equals(sut.predictive_scaling_policy.policy_name,
+                                        f"{app_name}-{stack}-web-predictive-scaling-policy")
+
+        @pulumi.runtime.test
+        def it_targets_the_web_service(sut):
+            return assert_outputs_equal(sut.autoscaling_target.resource_id,
+                                        sut.predictive_scaling_policy.resource_id)
+
+        @pulumi.runtime.test
+        def it_forecasts_and_scales(sut):
+            return assert_output_equals(sut.predictive_scaling_policy.mode, "ForecastAndScale")
+
+        @pulumi.runtime.test
+        def it_launches_ahead_of_the_peak(sut):
+            return assert_output_equals(sut.predictive_scaling_policy.scheduling_buffer_time, 600)
+
+        @pulumi.runtime.test
+        def it_labels_the_metric_with_the_load_balancer_and_target_group(sut):
+            def check_resource_label(args):
+                load_balancer_arn, target_group_arn, resource_label = args
+                assert resource_label == f"{load_balancer_arn.split('/', 1)[1]}/{target_group_arn.split(':')[-1]}"
+
+            return pulumi.Output.all(sut.load_balancer.arn, sut.target_group.arn,
+                                     sut.predictive_scaling_policy.resource_label).apply(check_resource_label)
+
+        def describe_without_a_load_balancer():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs["need_load_balancer"] = False
+                return component_kwargs
+
+            def it_refuses_to_forecast_requests(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.container
+                with pytest.raises(ValueError, match="needs a load balancer"):
+                    strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+        def describe_when_not_configured():
+            @pytest.fixture
+            def predictive_scaling():
+                return None
+
+            @pulumi.runtime.test
+            def it_has_no_policy(sut):
+                assert sut.predictive_scaling_policy is None
+
+    def describe_on_the_worker_service():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs["worker_autoscale"] = True
+            component_kwargs["worker_predictive_scaling"] = {"metric": "cpu", "target_value": 50}
+            return component_kwargs
+
+        @pytest.fixture
+        def policy(sut):
+            return sut.worker_autoscaling.worker_predictive_scaling_policy
+
+        @pulumi.runtime.test
+        def it_is_named_after_the_worker(policy, app_name, stack):
+            return assert_output_equals(policy.policy_name, f"{app_name}-{stack}-worker-predictive-scaling-policy")
+
+        @pulumi.runtime.test
+        def it_targets_the_worker_service(sut, policy):
+            return assert_outputs_equal(sut.worker_autoscaling.worker_autoscaling_target.resource_id,
+                                        policy.resource_id)
+
+        @pulumi.runtime.test
+        def it_only_forecasts_by_default(policy):
+            return assert_output_equals(policy.mode, "ForecastOnly")
@@ -194,27 +194,22 @@ def a_pulumi_rails_app():
         ecs_client = boto3.client('ecs')
         stubber = Stubber(ecs_client)
 
-        # First attempt - standard case (will fail)
-        stubber.add_client_error(
-            'describe_services',
-            service_error_code='ServiceNotFoundException',
-            expected_params={
-                'cluster': namespace,
-                'services': [namespace]
-            }
-        )
-
-        # Second attempt - edge case (will succeed)
+        # Both candidate names are described in one batched call; only the edge case exists
         stubber.add_response(
             'describe_services',
             {
                 'services': [{
+                    'serviceName': f"{namespace}-{namespace}-container",
                     'desiredCount': default_desired_count,
+                }],
+                'failures': [{
+                    'arn': namespace,
+                    'reason': 'MISSING',
                 }]
             },
             {
                 'cluster': namespace,
-                'services': [f"{namespace}-{namespace}-container"]
+                'services': [namespace, f"{namespace}-{namespace}-container"]
             }
         )
 
@@ -234,6 +229,41 @@ def a_pulumi_rails_app():
     def it_asks_the_web_container_to_automatically_scale(sut):
         assert sut.web_container.autoscaling
 
+    def describe_with_cpu_architectures():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs['need_worker'] = True
+            component_kwargs['cpu_architecture'] = "ARM64"
+            component_kwargs['migration_cpu_architecture'] = "X86_64"
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_runs_the_web_on_the_shared_architecture(sut):
+            assert sut.web_container.cpu_architecture == "ARM64"
+
+        @pulumi.runtime.test
+        def it_runs_the_worker_on_the_shared_architecture(sut):
+            assert sut.worker_container.cpu_architecture == "ARM64"
+
+        @pulumi.runtime.test
+        def it_lets_the_migration_choose_its_own(sut):
+            assert sut.migration_container.cpu_architecture == "X86_64"
+
+    def describe_with_only_the_worker_on_graviton():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs['need_worker'] = True
+            component_kwargs['worker_cpu_architecture'] = "ARM64"
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_keeps_the_web_on_x86(sut):
+            assert sut.web_container.cpu_architecture == "X86_64"
+
+        @pulumi.runtime.test
+        def it_moves_the_worker(sut):
+            assert sut.worker_container.cpu_architecture == "ARM64"
+
     def describe_with_no_memory_or_cpu_passed_to_kwargs():
         @pytest.fixture
         def component_kwargs(component_kwargs):
@@ -531,6 +561,25 @@ def describe_a_pulumi_rails_component():
                 sut.db_password.result
             ).apply(check_ecs_environment)
 
+        @pulumi.runtime.test
+        def it_connects_directly_without_a_proxy(sut):
+            assert sut.rds_proxy is None
+
+        @pulumi.runtime.test
+        def it_uses_the_default_parameter_groups(sut):
+            assert sut.rds_cluster_parameter_group is None
+            assert sut.rds_instance_parameter_group is None
+
+        @pulumi.runtime.test
+        def it_has_no_enhanced_monitoring_by_default(sut):
+            assert sut.rds_monitoring_role is None
+            assert sut.rds_instance_dependencies(sut.rds_serverless_cluster) == [sut.rds_serverless_cluster]
+
+        @pulumi.runtime.test
+        def it_has_no_readers_by_default(sut):
+            assert sut.rds_reader_instances == []
+            assert "DB_READER_HOST" not in sut.web_container.env_vars
+
         @pulumi.runtime.test
         def it_has_a_default_db_name(sut):
             return sut.db_name == "app"
@@ -607,6 +656,312 @@ def describe_a_pulumi_rails_component():
                 def it_should_set_the_db_username(sut, db_username):
                     return assert_output_equals(sut.rds_serverless_cluster.master_username, db_username)
 
+    def describe_with_aurora_readers():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs['rds_reader_count'] = 2
+            component_kwargs['rds_reader_max_count'] = 5
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_creates_the_readers(sut):
+            assert len(sut.rds_reader_instances) == 2
+
+        @pulumi.runtime.test
+        def it_names_the_readers(sut, namespace):
+            return assert_output_equals(sut.rds_reader_instances[1].identifier, f"{namespace}-reader-1")
+
+        @pulumi.runtime.test
+        def it_makes_them_serverless(sut):
+            return assert_output_equals(sut.rds_reader_instances[0].instance_class, "db.serverless")
+
+        @pulumi.runtime.test
+        def it_adds_them_to_the_cluster(sut):
+            return assert_outputs_equal(sut.rds_reader_instances[0].cluster_identifier,
+                                        sut.rds_serverless_cluster.cluster_identifier)
+
+        @pulumi.runtime.test
+        def it_autoscales_the_replica_count(sut):
+            return assert_output_equals(sut.rds_reader_autoscaling_target.scalable_dimension,
+                                        "rds:cluster:ReadReplicaCount")
+
+        @pulumi.runtime.test
+        def it_autoscales_the_cluster(sut, namespace):
+            return assert_output_equals(sut.rds_reader_autoscaling_target.resource_id, f"cluster:{namespace}")
+
+        @pulumi.runtime.test
+        def it_autoscales_between_the_reader_counts(sut):
+            def check_capacities(capacities):
+                assert capacities == [2, 5]
+
+            return pulumi.Output.all(sut.rds_reader_autoscaling_target.min_capacity,
+                                     sut.rds_reader_autoscaling_target.max_capacity).apply(check_capacities)
+
+        @pulumi.runtime.test
+        def it_tracks_reader_cpu(sut):
+            def check_configuration(configuration):
+                assert configuration["target_value"] == 60
+                assert configuration["predefined_metric_specification"]["predefined_metric_type"] == \
+                       "RDSReaderAverageCPUUtilization"
+
+            return sut.rds_reader_autoscaling_policy.target_tracking_scaling_policy_configuration.apply(
+                check_configuration)
+
+        @pulumi.runtime.test
+        def it_sends_the_reader_endpoint_to_the_web_environment(sut):
+            return assert_outputs_equal(sut.web_container.env_vars["DB_READER_HOST"],
+                                        sut.rds_serverless_cluster.reader_endpoint)
+
+        @pulumi.runtime.test
+        def it_sends_the_replica_url_to_the_web_environment(sut):
+            def check_ecs_environment(args):
+                replica_url, reader_endpoint = args
+                assert f"@{reader_endpoint}:5432/" in replica_url
+
+            return pulumi.Output.all(
+                sut.web_container.env_vars["DATABASE_REPLICA_URL"],
+                sut.rds_serverless_cluster.reader_endpoint
+            ).apply(check_ecs_environment)
+
+        def describe_with_a_fixed_reader_count():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['rds_reader_count'] = 1
+                component_kwargs['rds_reader_max_count'] = 1
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_does_not_autoscale(sut):
+                assert len(sut.rds_reader_instances) == 1
+                assert sut.rds_reader_autoscaling_target is None
+
+        def describe_with_a_max_below_the_count():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['rds_reader_count'] = 3
+                component_kwargs['rds_reader_max_count'] = 1
+                return component_kwargs
+
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.rails
+                with pytest.raises(ValueError, match="rds_reader_max_count"):
+                    strongmind_deployment.rails.RailsComponent("rails", **component_kwargs)
+
+        def describe_with_a_max_but_no_readers():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['rds_reader_count'] = 0
+                component_kwargs['rds_reader_max_count'] = 3
+                return component_kwargs
+
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.rails
+                with pytest.raises(ValueError, match="rds_reader_count of at least 1"):
+                    strongmind_deployment.rails.RailsComponent("rails", **component_kwargs)
+
+    def describe_with_a_db_performance_profile():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs['db_performance_profile'] = {
+                "cluster_parameters": {"log_min_duration_statement": 500},
+                "storage_type": "aurora-iopt1",
+            }
+            component_kwargs['rds_reader_count'] = 1
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_creates_a_cluster_parameter_group_for_the_engine(sut):
+            return assert_output_equals(sut.rds_cluster_parameter_group.family, "aurora-postgresql15")
+
+        @pulumi.runtime.test
+        def it_sets_the_cluster_parameters(sut):
+            def check(parameters):
+                values = {parameter["name"]: parameter["value"] for parameter in parameters}
+                assert values["log_min_duration_statement"] == "500"
+                assert values["shared_preload_libraries"] == "pg_stat_statements,auto_explain"
+
+            return sut.rds_cluster_parameter_group.parameters.apply(check)
+
+        @pulumi.runtime.test
+        def it_wires_the_cluster_parameter_group_into_the_cluster(sut):
+            return assert_outputs_equal(sut.rds_serverless_cluster.db_cluster_parameter_group_name,
+                                        sut.rds_cluster_parameter_group.name)
+
+        @pulumi.runtime.test
+        def it_wires_the_instance_parameter_group_into_every_instance(sut):
+            def check(names):
+                assert len(set(names)) == 1
+
+            return pulumi.Output.all(sut.rds_instance_parameter_group.name,
+                                     sut.rds_serverless_cluster_instance.db_parameter_group_name,
+                                     *[reader.db_parameter_group_name for reader in sut.rds_reader_instances]
+                                     ).apply(check)
+
+        @pulumi.runtime.test
+        def it_uses_io_optimized_storage(sut):
+            return assert_output_equals(sut.rds_serverless_cluster.storage_type, "aurora-iopt1")
+
+    def describe_with_database_monitoring():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs['rds_performance_insights'] = True
+            component_kwargs['rds_performance_insights_retention'] = 31
+            component_kwargs['rds_monitoring_interval'] = 15
+            component_kwargs['rds_reader_count'] = 1
+            return component_kwargs
+
+        @pytest.fixture
+        def instances(sut):
+            return [sut.rds_serverless_cluster_instance, *sut.rds_reader_instances]
+
+        @pulumi.runtime.test
+        def it_turns_on_performance_insights_for_every_instance(instances):
+            def check(args):
+                assert args == [True, 31, True, 31]
+
+            return pulumi.Output.all(*[output for instance in instances
+                                       for output in (instance.performance_insights_enabled,
+                                                      instance.performance_insights_retention_period)]).apply(check)
+
+        @pulumi.runtime.test
+        def it_turns_on_enhanced_monitoring_for_every_instance(instances):
+            def check(intervals):
+                assert intervals == [15, 15]
+
+            return pulumi.Output.all(*[instance.monitoring_interval for instance in instances]).apply(check)
+
+        @pulumi.runtime.test
+        def it_shares_one_monitoring_role(sut, instances):
+            def check(arns):
+                assert len(set(arns)) == 1
+
+            return pulumi.Output.all(sut.rds_monitoring_role.arn,
+                                     *[instance.monitoring_role_arn for instance in instances]).apply(check)
+
+        @pulumi.runtime.test
+        def it_lets_rds_publish_os_metrics(sut):
+            return assert_output_equals(sut.rds_monitoring_policy_attachment.policy_arn,
+                                        "arn:aws:iam::aws:policy/service-role/AmazonRDSEnhancedMonitoringRole")
+
+        @pulumi.runtime.test
+        def it_waits_for_the_monitoring_policy_before_creating_instances(sut):
+            assert sut.rds_instance_dependencies(sut.rds_serverless_cluster) == [
+                sut.rds_serverless_cluster, sut.rds_monitoring_policy_attachment]
+
+        def describe_with_an_unsupported_retention():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['rds_performance_insights_retention'] = 30
+                return component_kwargs
+
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.rails
+                with pytest.raises(ValueError, match="rds_performance_insights_retention"):
+                    strongmind_deployment.rails.RailsComponent("rails", **component_kwargs)
+
+        def describe_with_an_unsupported_interval():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['rds_monitoring_interval'] = 20
+                return component_kwargs
+
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.rails
+                with pytest.raises(ValueError, match="rds_monitoring_interval"):
+                    strongmind_deployment.rails.RailsComponent("rails", **component_kwargs)
+
+    def describe_with_an_rds_proxy():
+        @pytest.fixture
+        def rds_proxy():
+            return True
+
+        @pytest.fixture
+        def component_kwargs(component_kwargs, rds_proxy):
+            component_kwargs['rds_proxy'] = rds_proxy
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_pools_connections_to_the_cluster(sut):
+            return assert_outputs_equal(sut.rds_proxy.target.db_cluster_identifier,
+                                        sut.rds_serverless_cluster.cluster_identifier)
+
+        @pulumi.runtime.test
+        def it_sends_the_proxy_endpoint_to_the_web_environment(sut):
+            def check_ecs_environment(args):
+                actual_host, actual_db_host, expected_endpoint = args
+                assert actual_host == actual_db_host == expected_endpoint
+
+            return pulumi.Output.all(
+                sut.web_container.env_vars["DATABASE_HOST"],
+                sut.web_container.env_vars["DB_HOST"],
+                sut.rds_proxy.endpoint
+            ).apply(check_ecs_environment)
+
+        @pulumi.runtime.test
+        def it_sends_the_proxy_url_to_the_web_environment(sut):
+            def check_ecs_environment(args):
+                postgres_url, endpoint = args
+                assert f"@{endpoint}:5432/" in postgres_url
+
+            return pulumi.Output.all(
+                sut.web_container.env_vars["DATABASE_URL"],
+                sut.rds_proxy.endpoint
+            ).apply(check_ecs_environment)
+
+        @pulumi.runtime.test
+        def it_migrates_through_the_cluster_endpoint(sut):
+            return assert_outputs_equal(sut.migration_container.env_vars["DATABASE_HOST"],
+                                        sut.rds_serverless_cluster.endpoint)
+
+        @pulumi.runtime.test
+        def it_authenticates_with_the_database_user(sut):
+            def check_secret(args):
+                secret_string, username, password = args
+                assert json.loads(secret_string) == {"username": username, "password": password}
+
+            return pulumi.Output.all(
+                sut.rds_proxy.secret_version.secret_string,
+                sut.rds_serverless_cluster.master_username,
+                sut.db_password.result
+            ).apply(check_secret)
+
+        @pulumi.runtime.test
+        def it_runs_in_the_task_subnets(sut, ecs_subnets):
+            return assert_output_equals(sut.rds_proxy.proxy.vpc_subnet_ids, ecs_subnets)
+
+        @pulumi.runtime.test
+        def it_uses_the_default_pool_settings(sut):
+            def check_pool(pool):
+                assert pool["connection_borrow_timeout"] == 120
+                assert pool["max_connections_percent"] == 90
+                assert pool["max_idle_connections_percent"] == 50
+                assert pool["session_pinning_filters"] == ["EXCLUDE_VARIABLE_SETS"]
+
+            return sut.rds_proxy.default_target_group.connection_pool_config.apply(check_pool)
+
+        def describe_with_pool_settings():
+            @pytest.fixture
+            def rds_proxy():
+                return {"connection_borrow_timeout": 5, "max_connections_percent": 60}
+
+            @pulumi.runtime.test
+            def it_uses_them(sut):
+                def check_pool(pool):
+                    assert pool["connection_borrow_timeout"] == 5
+                    assert pool["max_connections_percent"] == 60
+
+                return sut.rds_proxy.default_target_group.connection_pool_config.apply(check_pool)
+
+        def describe_with_more_idle_than_total_connections():
+            @pytest.fixture
+            def rds_proxy():
+                return {"max_connections_percent": 40, "max_idle_connections_percent": 50}
+
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.rails
+                with pytest.raises(ValueError, match="max_idle_connections_percent"):
+                    strongmind_deployment.rails.RailsComponent("rails", **component_kwargs)
+
     def describe_when_given_a_kms_key_to_restore_from():
         @pytest.fixture
         def kms_key(faker):
@@ -972,6 +1327,81 @@ def describe_a_pulumi_rails_component():
         def it_sends_the_bucket_name_to_the_ecs_environment(sut):
             return assert_outputs_equal(sut.env_vars["S3_BUCKET_NAME"], sut.storage.bucket.bucket)
 
+    def describe_with_a_capacity_schedule():
+        @pytest.fixture
+        def component_kwargs(component_kwargs):
+            component_kwargs['capacity_schedule'] = [{
+                "name": "school-day",
+                "start": "cron(0 7 ? * MON-FRI *)",
+                "end": "cron(0 16 ? * MON-FRI *)",
+                "timezone": "America/Phoenix",
+                "web": {"min": 6},
+                "database": {"min": 4},
+            }]
+            return component_kwargs
+
+        @pulumi.runtime.test
+        def it_schedules_the_web_floor(sut):
+            assert len(sut.web_container.scheduled_actions) == 2
+
+        @pulumi.runtime.test
+        def it_schedules_the_database_floor_at_both_edges(sut):
+            assert len(sut.database_capacity_schedules) == 2
+
+        @pulumi.runtime.test
+        def it_raises_the_acu_floor_at_the_start(sut):
+            def check_input(target_input):
+                request = json.loads(target_input)
+                assert request["ServerlessV2ScalingConfiguration"] == {"MinCapacity": 4, "MaxCapacity": 128}
+                assert request["ApplyImmediately"] is True
+
+            return sut.database_capacity_schedules[0].target.input.apply(check_input)
+
+        @pulumi.runtime.test
+        def it_restores_the_acu_floor_at_the_end(sut):
+            def check_input(target_input):
+                request = json.loads(target_input)
+                assert request["ServerlessV2ScalingConfiguration"] == {"MinCapacity": 1, "MaxCapacity": 128}
+
+            return sut.database_capacity_schedules[1].target.input.apply(check_input)
+
+        @pulumi.runtime.test
+        def it_calls_modify_db_cluster(sut):
+            return assert_output_equals(sut.database_capacity_schedules[0].target.arn,
+                                        "arn:aws:scheduler:::aws-sdk:rds:modifyDBCluster")
+
+        @pulumi.runtime.test
+        def it_uses_the_window_timezone(sut):
+            return assert_output_equals(sut.database_capacity_schedules[0].schedule_expression_timezone,
+                                        "America/Phoenix")
+
+        @pulumi.runtime.test
+        def it_leaves_the_acu_range_to_the_schedules(sut):
+            assert 'serverlessv2ScalingConfiguration' in sut.rds_cluster_ignore_changes
+
+        def describe_with_a_floor_above_the_database_max():
+            def it_refuses(component_kwargs, pulumi_set_mocks):
+                import strongmind_deployment.rails
+                component_kwargs['rds_maximum_capacity'] = 2
+                with pytest.raises(ValueError, match="database min to 4, above its max of 2"):
+                    strongmind_deployment.rails.RailsComponent("rails", **component_kwargs)
+
+        def describe_without_a_database_window():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['capacity_schedule'] = [{
+                    "name": "school-day",
+                    "start": "cron(0 7 ? * MON-FRI *)",
+                    "end": "cron(0 16 ? * MON-FRI *)",
+                    "web": {"min": 6},
+                }]
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_keeps_managing_the_acu_range(sut):
+                assert sut.database_capacity_schedules == []
+                assert 'serverlessv2ScalingConfiguration' not in sut.rds_cluster_ignore_changes
+
     def describe_with_autoscale_off():
         @pytest.fixture
         def component_kwargs(component_kwargs):
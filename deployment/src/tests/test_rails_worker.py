@@ -2,6 +2,7 @@ import pulumi
 import pytest
 from pytest_describe import behaves_like
 
+from strongmind_deployment.capacity_providers import WORKER_CAPACITY_PROVIDER_STRATEGY
 from tests.shared import assert_output_equals
 from tests.test_rails import a_pulumi_rails_app
 
@@ -56,6 +57,129 @@ def describe_a_pulumi_rails_app():
         def it_uses_cluster_from_web_container(sut):
             assert sut.worker_container.ecs_cluster_arn == sut.web_container.ecs_cluster_arn
 
+        @pulumi.runtime.test
+        def it_shares_the_cluster_capacity_providers(sut):
+            assert sut.worker_container.cluster_capacity_providers is sut.cluster_capacity_providers
+
+        @pulumi.runtime.test
+        def it_keeps_the_worker_on_demand(sut):
+            assert sut.worker_container.capacity_provider_strategy is None
+
+        @pulumi.runtime.test
+        def it_keeps_the_web_on_demand(sut):
+            assert sut.web_container.capacity_provider_strategy is None
+
+        def describe_with_container_health_checks():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['container_health_check'] = {"start_period": 90}
+                component_kwargs['worker_container_health_check'] = {"command": ["CMD-SHELL", "pgrep -f sidekiq"]}
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_checks_the_web_with_its_own_health_check(sut):
+                assert sut.web_container.container_health_check["start_period"] == 90
+
+            @pulumi.runtime.test
+            def it_checks_the_worker_with_its_command(sut):
+                assert sut.worker_container.container_health_check["command"] == ["CMD-SHELL", "pgrep -f sidekiq"]
+
+            @pulumi.runtime.test
+            def it_does_not_check_the_migration(sut):
+                assert sut.migration_container.container_health_check is None
+
+        def describe_with_the_worker_on_spot():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['worker_capacity_provider_strategy'] = WORKER_CAPACITY_PROVIDER_STRATEGY
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_bursts_the_worker_onto_spot(sut):
+                assert sut.worker_container.capacity_provider_strategy == [
+                    {"capacity_provider": "FARGATE", "base": 1, "weight": 1},
+                    {"capacity_provider": "FARGATE_SPOT", "base": 0, "weight": 3},
+                ]
+
+            @pulumi.runtime.test
+            def it_keeps_the_web_on_demand(sut):
+                assert sut.web_container.capacity_provider_strategy is None
+
+        def describe_with_an_empty_worker_strategy():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['worker_capacity_provider_strategy'] = []
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_runs_the_worker_on_the_launch_type(sut):
+                assert sut.worker_container.capacity_provider_strategy is None
+
+        def describe_with_worker_pools():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs['worker_pools'] = [
+                    {"name": "critical", "queues": ["critical"], "min": 2, "latency_threshold": 5},
+                    {"name": "bulk", "queues": ["default", "backfill"], "max": 20, "cpu": 1024, "memory": 2048},
+                ]
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_creates_a_worker_service_per_pool(sut):
+                assert list(sut.worker_pool_containers) == ["critical", "bulk"]
+                assert sut.worker_container is None
+
+            @pulumi.runtime.test
+            def it_names_the_services_after_the_pools(sut, app_name, stack):
+                assert sut.worker_pool_containers["critical"].namespace == f"{app_name}-{stack}-worker-critical"
+
+            @pulumi.runtime.test
+            def it_runs_sidekiq_on_the_pools_queues(sut):
+                assert sut.worker_pool_containers["bulk"].command == [
+                    "sh", "-c", "bundle exec sidekiq -q default -q backfill"]
+
+            @pulumi.runtime.test
+            def it_sizes_each_pool(sut):
+                assert sut.worker_pool_containers["bulk"].cpu == 1024
+                assert sut.worker_pool_containers["bulk"].memory == 2048
+
+            @pulumi.runtime.test
+            def it_scales_each_pool_on_its_own_queue(sut):
+                autoscaling = sut.worker_pool_containers["critical"].worker_autoscaling
+                return assert_output_equals(autoscaling.worker_autoscaling_out_alarm.dimensions,
+                                            {"QueueName": "critical"})
+
+            @pulumi.runtime.test
+            def it_uses_the_pools_latency_threshold(sut):
+                autoscaling = sut.worker_pool_containers["critical"].worker_autoscaling
+                return assert_output_equals(autoscaling.worker_autoscaling_out_alarm.threshold, 5)
+
+            @pulumi.runtime.test
+            def it_uses_the_pools_capacity(sut):
+                def check_capacities(capacities):
+                    assert capacities == [2, 20]
+
+                critical = sut.worker_pool_containers["critical"].worker_autoscaling.worker_autoscaling_target
+                bulk = sut.worker_pool_containers["bulk"].worker_autoscaling.worker_autoscaling_target
+                return pulumi.Output.all(critical.min_capacity, bulk.max_capacity).apply(check_capacities)
+
+            @pulumi.runtime.test
+            def it_scales_a_pool_on_the_highest_latency_of_its_queues(sut):
+                def check_queries(queries):
+                    assert [query["metric"]["dimensions"] for query in queries[:2]] == [
+                        {"QueueName": "default"}, {"QueueName": "backfill"}]
+                    assert queries[2]["expression"] == "MAX([latency0, latency1])"
+                    assert queries[2]["return_data"] is True
+
+                autoscaling = sut.worker_pool_containers["bulk"].worker_autoscaling
+                return autoscaling.worker_autoscaling_out_alarm.metric_queries.apply(check_queries)
+
+            @pulumi.runtime.test
+            def it_names_the_alarms_after_the_pool(sut, app_name, stack):
+                autoscaling = sut.worker_pool_containers["bulk"].worker_autoscaling
+                return assert_output_equals(autoscaling.worker_autoscaling_out_alarm.name,
+                                            f"{app_name}-{stack}-worker-bulk-auto-scaling-out-alarm")
+
         def describe_worker_log_metric_filters():
             @pytest.fixture
             def worker_log_metric_filters(faker):
@@ -0,0 +1,151 @@
+import os
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from strongmind_deployment.aws_clients import get_client, reset_clients
+from strongmind_deployment.service_discovery import find_desired_count
+
+
+def describe_the_shared_client_pool():
+    @pytest.fixture(autouse=True)
+    def fresh_pool():
+        reset_clients()
+        yield
+        reset_clients()
+
+    def it_reuses_clients_for_the_same_service_and_region():
+        assert get_client('ecs', 'us-west-2') is get_client('ecs', 'us-west-2')
+
+    def it_follows_the_session_region_by_default():
+        assert get_client('ecs').meta.region_name == 'us-east-1'
+
+    def it_keeps_regions_apart():
+        assert get_client('ecs', 'us-west-2') is not get_client('ecs')
+
+
+def describe_find_desired_count():
+    @pytest.fixture
+    def cluster(faker):
+        return faker.word()
+
+    @pytest.fixture
+    def service_names(faker):
+        return [f"{faker.word()}-{n}" for n in range(3)]
+
+    @pytest.fixture
+    def ecs_client():
+        return boto3.client('ecs', region_name='us-west-2')
+
+    @pytest.fixture
+    def stubber(ecs_client):
+        stubber = Stubber(ecs_client)
+        yield stubber
+        stubber.deactivate()
+
+    @pytest.fixture
+    def cache_path(tmp_path):
+        return str(tmp_path / 'desired_counts.json')
+
+    def it_describes_all_candidates_in_one_call(cluster, service_names, ecs_client, stubber):
+        stubber.add_response('describe_services',
+                             {'services': [{'serviceName': service_names[1], 'desiredCount': 4}]},
+                             {'cluster': cluster, 'services': service_names})
+        stubber.activate()
+
+        assert find_desired_count(cluster, service_names, ecs_client=ecs_client) == (service_names[1], 4)
+        stubber.assert_no_pending_responses()
+
+    def it_prefers_candidates_in_order(cluster, service_names, ecs_client, stubber):
+        stubber.add_response('describe_services',
+                             {'services': [{'serviceName': service_names[2], 'desiredCount': 7},
+                                           {'serviceName': service_names[1], 'desiredCount': 4}]},
+                             {'cluster': cluster, 'services': service_names})
+        stubber.activate()
+
+        assert find_desired_count(cluster, service_names, ecs_client=ecs_client) == (service_names[1], 4)
+
+    def it_batches_at_most_ten_services_per_call(cluster, ecs_client, stubber):
+        service_names = [f"service-{n}" for n in range(12)]
+        stubber.add_response('describe_services', {'services': []},
+                             {'cluster': cluster, 'services': service_names[:10]})
+        stubber.add_response('describe_services',
+                             {'services': [{'serviceName': 'service-11', 'desiredCount': 3}]},
+                             {'cluster': cluster, 'services': service_names[10:]})
+        stubber.activate()
+
+        assert find_desired_count(cluster, service_names, ecs_client=ecs_client) == ('service-11', 3)
+        stubber.assert_no_pending_responses()
+
+    def it_returns_none_when_the_cluster_does_not_exist(cluster, service_names, ecs_client, stubber):
+        stubber.add_client_error('describe_services', service_error_code='ClusterNotFoundException')
+        stubber.activate()
+
+        assert find_desired_count(cluster, service_names, ecs_client=ecs_client) is None
+
+    def describe_with_a_cache_ttl():
+        def it_reuses_the_previous_answer(cluster, service_names, ecs_client, stubber, cache_path):
+            stubber.add_response('describe_services',
+                                 {'services': [{'serviceName': service_names[0], 'desiredCount': 5}]},
+                                 {'cluster': cluster, 'services': service_names})
+            stubber.activate()
+
+            first = find_desired_count(cluster, service_names, ecs_client=ecs_client,
+                                       cache_ttl=60, cache_path=cache_path)
+            second = find_desired_count(cluster, service_names, ecs_client=ecs_client,
+                                        cache_ttl=60, cache_path=cache_path)
+
+            assert first == second == (service_names[0], 5)
+            stubber.assert_no_pending_responses()
+
+        def it_does_not_cache_when_disabled(cluster, service_names, ecs_client, stubber, cache_path):
+            for _ in range(2):
+                stubber.add_response('describe_services',
+                                     {'services': [{'serviceName': service_names[0], 'desiredCount': 5}]},
+                                     {'cluster': cluster, 'services': service_names})
+            stubber.activate()
+
+            find_desired_count(cluster, service_names, ecs_client=ecs_client, cache_path=cache_path)
+            find_desired_count(cluster, service_names, ecs_client=ecs_client, cache_path=cache_path)
+
+            stubber.assert_no_pending_responses()
+
+        def it_keeps_the_cache_private(cluster, service_names, ecs_client, stubber, cache_path):
+            stubber.add_response('describe_services',
+                                 {'services': [{'serviceName': service_names[0], 'desiredCount': 5}]},
+                                 {'cluster': cluster, 'services': service_names})
+            stubber.activate()
+
+            find_desired_count(cluster, service_names, ecs_client=ecs_client, cache_ttl=60, cache_path=cache_path)
+
+            assert os.stat(cache_path).st_mode & 0o777 == 0o600
+
+        def it_ignores_answers_for_other_credentials(cluster, service_names, ecs_client, stubber, cache_path,
+                                                      monkeypatch):
+            for desired_count in (5, 2):
+                stubber.add_response('describe_services',
+                                     {'services': [{'serviceName': service_names[0], 'desiredCount': desired_count}]},
+                                     {'cluster': cluster, 'services': service_names})
+            stubber.activate()
+
+            find_desired_count(cluster, service_names, ecs_client=ecs_client, cache_ttl=60, cache_path=cache_path)
+            monkeypatch.setenv('AWS_PROFILE', 'another-account')
+            answer = find_desired_count(cluster, service_names, ecs_client=ecs_client,
+                                        cache_ttl=60, cache_path=cache_path)
+
+            assert answer == (service_names[0], 2)
+            stubber.assert_no_pending_responses()
+
+        def it_ignores_a_cache_others_can_write(cluster, service_names, ecs_client, stubber, cache_path):
+            for _ in range(2):
+                stubber.add_response('describe_services',
+                                     {'services': [{'serviceName': service_names[0], 'desiredCount': 5}]},
+                                     {'cluster': cluster, 'services': service_names})
+            stubber.activate()
+
+            find_desired_count(cluster, service_names, ecs_client=ecs_client, cache_ttl=60, cache_path=cache_path)
+            os.chmod(cache_path, 0o666)
+            find_desired_count(cluster, service_names, ecs_client=ecs_client, cache_ttl=60, cache_path=cache_path)
+
+            stubber.assert_no_pending_responses()
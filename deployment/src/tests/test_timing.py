@@ -0,0 +1,152 @@
+import json
+
+import pulumi
+import pulumi.runtime
+import pulumi_aws as aws
+import pytest
+
+from strongmind_deployment import timing
+from strongmind_deployment.timing import TimingRecorder, key_from_urn, merge_event_log, register_timing
+from tests.mocks import get_pulumi_mocks
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def _step(kind, urn, timestamp, op="create"):
+    return {"timestamp": timestamp, kind: {"metadata": {"urn": urn, "op": op}}}
+
+
+BUCKET_URN = "urn:pulumi:stage::app::custom:module:Thing$aws:s3/bucketV2:BucketV2::thing-bucket"
+
+
+class _Thing(pulumi.ComponentResource):
+    def __init__(self, name, opts=None):
+        super().__init__("custom:module:Thing", name, {}, opts)
+        aws.s3.BucketV2(f"{name}-bucket", opts=pulumi.ResourceOptions(parent=self))
+        aws.s3.BucketV2(f"{name}-logs", opts=pulumi.ResourceOptions(parent=self))
+
+
+def describe_timing():
+    def describe_key_from_urn():
+        def it_drops_the_parent_type_chain():
+            assert key_from_urn(BUCKET_URN) == "aws:s3/bucketV2:BucketV2::thing-bucket"
+
+    def describe_registration():
+        @pytest.fixture
+        def app_name(faker):
+            return faker.word()
+
+        @pytest.fixture
+        def stack(faker):
+            return faker.word()
+
+        @pytest.fixture
+        def pulumi_mocks(faker):
+            return get_pulumi_mocks(faker)
+
+        @pytest.fixture
+        def recorder(pulumi_set_mocks):
+            recorder = TimingRecorder(clock=_Clock())
+            _Thing("thing", pulumi.ResourceOptions(transformations=[recorder.transform]))
+            recorder.finish()
+            return recorder
+
+        @pulumi.runtime.test
+        def it_times_each_resource_until_the_next_one(recorder):
+            bucket = recorder.resources["aws:s3/bucketV2:BucketV2::thing-bucket"]
+            assert bucket.parent == "custom:module:Thing::thing"
+            assert bucket.registration_seconds == 1.0
+
+        @pulumi.runtime.test
+        def it_rolls_children_up_into_their_component(recorder):
+            report = recorder.report()
+            assert [c["name"] for c in report["components"]] == ["thing"]
+            assert report["components"][0]["registration_seconds"] == 3.0
+            assert [r["name"] for r in report["resources"]] == ["thing-bucket", "thing-logs"]
+
+        def describe_register_timing():
+            @pytest.fixture
+            def report_path(tmp_path):
+                return str(tmp_path / "report.json")
+
+            @pytest.fixture
+            def exit_hooks(monkeypatch):
+                hooks = []
+                monkeypatch.setattr(timing.atexit, "register", hooks.append)
+                return hooks
+
+            @pytest.fixture
+            def recorder(pulumi_set_mocks, report_path, exit_hooks, monkeypatch):
+                # Keep the transformation off the root stack the other tests share
+                root = pulumi.runtime.get_root_resource()
+                monkeypatch.setattr(root, "_transformations", list(root._transformations))
+                recorder = register_timing(report_path)
+                _Thing("thing")
+                return recorder
+
+            @pulumi.runtime.test
+            def it_records_resources_as_the_program_registers_them(recorder):
+                assert list(recorder.resources) == ["custom:module:Thing::thing",
+                                                    "aws:s3/bucketV2:BucketV2::thing-bucket",
+                                                    "aws:s3/bucketV2:BucketV2::thing-logs"]
+                assert recorder.resources["aws:s3/bucketV2:BucketV2::thing-logs"].parent == \
+                    "custom:module:Thing::thing"
+
+            @pulumi.runtime.test
+            def it_writes_the_report_when_the_program_exits(recorder, exit_hooks, report_path):
+                exit_hooks[0]()
+
+                with open(report_path) as file:
+                    report = json.load(file)
+                assert [c["name"] for c in report["components"]] == ["thing"]
+                assert [r["name"] for r in report["resources"]] == ["thing-bucket", "thing-logs"]
+
+    def describe_provisioning():
+        @pytest.fixture
+        def recorder():
+            recorder = TimingRecorder()
+            recorder.on_event(_step("resourcePreEvent", BUCKET_URN, 100))
+            recorder.on_event({"timestamp": 101, "diagnosticEvent": {"message": "working"}})
+            recorder.on_event(_step("resOutputsEvent", BUCKET_URN, 130))
+            return recorder
+
+        def it_records_the_step_duration_and_operation(recorder):
+            bucket = recorder.resources["aws:s3/bucketV2:BucketV2::thing-bucket"]
+            assert bucket.operation == "create"
+            assert bucket.provisioning_seconds == 30
+
+        def it_sorts_the_summary_slowest_first(recorder):
+            recorder.on_event(_step("resourcePreEvent", "urn:pulumi:stage::app::aws:rds/instance:Instance::db", 100))
+            recorder.on_event(_step("resOutputsEvent", "urn:pulumi:stage::app::aws:rds/instance:Instance::db", 700))
+            lines = recorder.summary().splitlines()
+            assert lines[1].endswith("aws:rds/instance:Instance::db")
+            assert lines[2].endswith("aws:s3/bucketV2:BucketV2::thing-bucket")
+
+    def describe_merge_event_log():
+        def it_adds_engine_durations_to_a_registration_report(tmp_path):
+            report_path = str(tmp_path / "timing.json")
+            event_log_path = str(tmp_path / "events.jsonl")
+            with open(report_path, "w") as file:
+                json.dump({"components": [], "resources": [{
+                    "type": "aws:s3/bucketV2:BucketV2", "name": "thing-bucket", "parent": None,
+                    "registration_seconds": 0.5, "operation": None, "provisioning_seconds": None,
+                }]}, file)
+            with open(event_log_path, "w") as file:
+                file.write(json.dumps(_step("resourcePreEvent", BUCKET_URN, 10, op="update")) + "\n")
+                file.write(json.dumps(_step("resOutputsEvent", BUCKET_URN, 14, op="update")) + "\n")
+
+            merge_event_log(report_path, event_log_path)
+
+            with open(report_path) as file:
+                bucket = json.load(file)["resources"][0]
+            assert bucket["registration_seconds"] == 0.5
+            assert bucket["provisioning_seconds"] == 4
+            assert bucket["operation"] == "update"
+            assert (tmp_path / "timing.txt").exists()
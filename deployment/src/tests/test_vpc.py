@@ -0,0 +1,62 @@
+import pulumi.runtime
+import pytest
+
+from strongmind_deployment.subnet import SubnetType
+from tests.mocks import get_pulumi_mocks
+from tests.shared import assert_output_equals
+
+AZS = ["us-west-2a", "us-west-2b", "us-west-2c"]
+
+
+def describe_a_vpc_component():
+    @pytest.fixture
+    def app_name(faker):
+        return faker.word()
+
+    @pytest.fixture
+    def stack(faker):
+        return faker.word()
+
+    @pytest.fixture
+    def pulumi_mocks(faker):
+        return get_pulumi_mocks(faker)
+
+    @pytest.fixture
+    def nat_gateway_strategy():
+        from strongmind_deployment.vpc import NatGatewayStrategy
+        return NatGatewayStrategy.SINGLE
+
+    @pytest.fixture
+    def sut(pulumi_set_mocks, nat_gateway_strategy):
+        from strongmind_deployment.vpc import VpcComponent, VpcComponentArgs
+        return VpcComponent("test-vpc", VpcComponentArgs(cidr_block="10.0.0.0/16",
+                                                         nat_gateway_strategy=nat_gateway_strategy))
+
+    @pulumi.runtime.test
+    def it_uses_the_first_three_availability_zones(sut):
+        assert sut.azs == AZS
+
+    @pulumi.runtime.test
+    def it_keeps_the_public_subnets(sut):
+        assert len(sut.public_subnets) == 3
+
+    @pulumi.runtime.test
+    def it_tracks_the_subnets_it_creates_by_type_and_az(sut):
+        assert list(sut.subnet_ids_by_az[SubnetType.PUBLIC]) == AZS
+        assert list(sut.subnet_ids_by_az[SubnetType.PRIVATE]) == AZS
+        assert list(sut.subnet_ids_by_az[SubnetType.ISOLATED]) == AZS
+
+    @pulumi.runtime.test
+    def it_puts_the_nat_gateway_in_the_public_subnet_it_created(sut):
+        nat_gateway = [child for child in sut._childResources
+                       if child._name == "test-vpc-natGateway-us-west-2a"][0]
+        return assert_output_equals(nat_gateway.subnet_id, "pub-subnet-us-west-2a_id")
+
+    def describe_a_private_link_interface():
+        @pytest.fixture
+        def endpoint(sut):
+            return sut.create_private_link("ecr.api")
+
+        @pulumi.runtime.test
+        def it_uses_the_private_subnets_it_created(endpoint):
+            return assert_output_equals(endpoint.subnet_ids, [f"pri-subnet-{az}_id" for az in AZS])
@@ -315,6 +315,22 @@ def describe_worker_autoscaling():
                 def it_scales_down_by_one_instance(step):
                     return assert_output_equals(step.scaling_adjustment, -1)
 
+            def describe_with_a_custom_scale_in_rate():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["worker_scale_in_step"] = 2
+                    component_kwargs["worker_scale_in_cooldown"] = 120
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_removes_that_many_tasks(autoscaling_in_policy):
+                    step = autoscaling_in_policy.step_scaling_policy_configuration.step_adjustments[0]
+                    return assert_output_equals(step.scaling_adjustment, -2)
+
+                @pulumi.runtime.test
+                def it_waits_that_long_between_scale_ins(autoscaling_in_policy):
+                    return assert_output_equals(autoscaling_in_policy.step_scaling_policy_configuration.cooldown, 120)
+
         def describe_autoscaling_out_policy():
             def it_exists(sut):
                 assert sut.worker_autoscaling.worker_autoscaling_out_policy
@@ -377,8 +393,8 @@ def describe_worker_autoscaling():
                     return assert_output_equals(step.metric_interval_lower_bound, "0")
 
                 @pulumi.runtime.test
-                def it_triggers_when_it_exceeds_the_alarm_threshold_by_up_to_ten(step):
-                    return assert_output_equals(step.metric_interval_upper_bound, "600")
+                def it_triggers_until_latency_is_double_the_threshold(step):
+                    return assert_output_equals(step.metric_interval_upper_bound, "60")
 
                 @pulumi.runtime.test
                 def it_scales_up_by_one_instance(step):
@@ -386,23 +402,216 @@ def describe_worker_autoscaling():
 
             def describe_second_step():
                 @pytest.fixture
-                def step(sut):
-                    return \
-                    sut.worker_autoscaling.worker_autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments[
-                        1]
+                def step(autoscaling_out_policy):
+                    return autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments[1]
+
+                @pulumi.runtime.test
+                def it_triggers_at_double_the_threshold(step):
+                    return assert_output_equals(step.metric_interval_lower_bound, "60")
 
                 @pulumi.runtime.test
-                def it_triggers_when_it_exceeds_the_alarm_threshold_by_more_than_600(step):
-                    return assert_output_equals(step.metric_interval_lower_bound, "600")
+                def it_triggers_until_latency_is_five_times_the_threshold(step):
+                    return assert_output_equals(step.metric_interval_upper_bound, "240")
 
                 @pulumi.runtime.test
-                def it_triggers_at_all_higher_values_than_600(step):
+                def it_scales_up_by_four_instances(step):
+                    return assert_output_equals(step.scaling_adjustment, 4)
+
+            def describe_third_step():
+                @pytest.fixture
+                def step(autoscaling_out_policy):
+                    return autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments[2]
+
+                @pulumi.runtime.test
+                def it_triggers_at_five_times_the_threshold(step):
+                    return assert_output_equals(step.metric_interval_lower_bound, "240")
+
+                @pulumi.runtime.test
+                def it_triggers_at_all_higher_values(step):
                     return assert_output_equals(step.metric_interval_upper_bound, None)
 
                 @pulumi.runtime.test
-                def It_step_scales_by_one_instance(step):
-                    return assert_output_equals(step.scaling_adjustment, 1)
+                def it_scales_up_by_ten_instances(step):
+                    return assert_output_equals(step.scaling_adjustment, 10)
 
+            def describe_with_a_custom_threshold_and_steps():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["max_queue_latency_threshold"] = 30
+                    component_kwargs["worker_scale_out_steps"] = [2, 6, 20]
+                    component_kwargs["worker_scale_out_cooldown"] = 30
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_keys_the_tiers_off_the_threshold(autoscaling_out_policy):
+                    def check_bounds(step_adjustments):
+                        assert [(step["metric_interval_lower_bound"], step.get("metric_interval_upper_bound"))
+                                for step in step_adjustments] == [("0", "30"), ("30", "120"), ("120", None)]
+
+                    return autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments.apply(
+                        check_bounds)
+
+                @pulumi.runtime.test
+                def it_uses_the_steps(autoscaling_out_policy):
+                    def check_steps(step_adjustments):
+                        assert [step["scaling_adjustment"] for step in step_adjustments] == [2, 6, 20]
+
+                    return autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments.apply(
+                        check_steps)
+
+                @pulumi.runtime.test
+                def it_uses_the_cooldown(autoscaling_out_policy):
+                    return assert_output_equals(autoscaling_out_policy.step_scaling_policy_configuration.cooldown, 30)
+
+            def describe_with_percent_adjustments():
+                @pytest.fixture
+                def component_kwargs(component_kwargs):
+                    component_kwargs["worker_scale_out_adjustment"] = "percent"
+                    return component_kwargs
+
+                @pulumi.runtime.test
+                def it_changes_capacity_by_percent(autoscaling_out_policy):
+                    return assert_output_equals(
+                        autoscaling_out_policy.step_scaling_policy_configuration.adjustment_type,
+                        "PercentChangeInCapacity")
+
+                @pulumi.runtime.test
+                def it_grows_faster_the_further_latency_is_past_the_threshold(autoscaling_out_policy):
+                    def check_steps(step_adjustments):
+                        assert [step["scaling_adjustment"] for step in step_adjustments] == [25, 50, 100]
+
+                    return autoscaling_out_policy.step_scaling_policy_configuration.step_adjustments.apply(
+                        check_steps)
+
+                @pulumi.runtime.test
+                def it_adds_at_least_one_task(autoscaling_out_policy):
+                    return assert_output_equals(
+                        autoscaling_out_policy.step_scaling_policy_configuration.min_adjustment_magnitude, 1)
+
+            def describe_with_an_unknown_adjustment():
+                def it_refuses(component_kwargs, pulumi_set_mocks):
+                    import strongmind_deployment.container
+                    component_kwargs["worker_scale_out_adjustment"] = "exponential"
+                    with pytest.raises(ValueError, match="worker_scale_out_adjustment"):
+                        strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+            def describe_with_too_few_steps():
+                def it_refuses(component_kwargs, pulumi_set_mocks):
+                    import strongmind_deployment.container
+                    component_kwargs["worker_scale_out_steps"] = [1, 2]
+                    with pytest.raises(ValueError, match="needs 3 positive steps"):
+                        strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+        def describe_scale_to_zero():
+            @pytest.fixture
+            def component_kwargs(component_kwargs):
+                component_kwargs["worker_scale_to_zero"] = True
+                component_kwargs["worker_min_number_of_instances"] = 2
+                component_kwargs["worker_idle_minutes"] = 45
+                component_kwargs["worker_wake_metric_name"] = "EnqueuedJobs"
+                return component_kwargs
+
+            @pulumi.runtime.test
+            def it_lets_the_target_go_to_zero(autoscaling_target):
+                return assert_output_equals(autoscaling_target.min_capacity, 0)
+
+            @pulumi.runtime.test
+            def it_drops_to_zero_when_idle(sut):
+                policy = sut.worker_autoscaling.worker_idle_policy
+                return assert_output_equals(
+                    policy.step_scaling_policy_configuration.step_adjustments[0].scaling_adjustment, 0)
+
+            @pulumi.runtime.test
+            def it_waits_for_the_idle_window(sut):
+                return assert_output_equals(sut.worker_autoscaling.worker_idle_alarm.evaluation_periods, 45)
+
+            @pulumi.runtime.test
+            def it_triggers_the_idle_policy(sut):
+                return assert_outputs_equal(sut.worker_autoscaling.worker_idle_alarm.alarm_actions,
+                                            [sut.worker_autoscaling.worker_idle_policy.arn])
+
+            @pulumi.runtime.test
+            def it_wakes_to_the_floor(sut):
+                policy = sut.worker_autoscaling.worker_wake_policy
+                return assert_output_equals(
+                    policy.step_scaling_policy_configuration.step_adjustments[0].scaling_adjustment, 2)
+
+            @pulumi.runtime.test
+            def it_sets_an_exact_capacity_on_wake(sut):
+                policy = sut.worker_autoscaling.worker_wake_policy
+                return assert_output_equals(policy.step_scaling_policy_configuration.adjustment_type,
+                                            "ExactCapacity")
+
+            @pulumi.runtime.test
+            def it_wakes_on_the_wake_metric(sut):
+                def check_queries(queries):
+                    assert queries[0]["metric"]["metric_name"] == "EnqueuedJobs"
+                    assert queries[2]["expression"] == "IF(FILL(desired, 0) == 0 AND wake > 0, 1, 0)"
+
+                return sut.worker_autoscaling.worker_wake_alarm.metric_queries.apply(check_queries)
+
+            @pulumi.runtime.test
+            def it_counts_desired_tasks_in_the_worker_service(sut):
+                def check_dimensions(args):
+                    queries, cluster_name = args
+                    assert queries[1]["metric"]["metric_name"] == "DesiredTaskCount"
+                    assert queries[1]["metric"]["dimensions"] == {"ClusterName": cluster_name,
+                                                                 "ServiceName": sut.worker_autoscaling.namespace}
+
+                return pulumi.Output.all(sut.worker_autoscaling.worker_wake_alarm.metric_queries,
+                                         sut.ecs_cluster.name).apply(check_dimensions)
+
+            @pulumi.runtime.test
+            def it_counts_running_tasks_in_the_worker_service(sut):
+                def check_dimensions(args):
+                    queries, cluster_name = args
+                    assert queries[1]["metric"]["metric_name"] == "RunningTaskCount"
+                    assert queries[1]["metric"]["dimensions"] == {"ClusterName": cluster_name,
+                                                                 "ServiceName": sut.worker_autoscaling.namespace}
+
+                return pulumi.Output.all(sut.worker_autoscaling.worker_idle_alarm.metric_queries,
+                                         sut.ecs_cluster.name).apply(check_dimensions)
+
+            def describe_waking_with_a_backlog():
+                @pytest.fixture
+                def wake_queries(sut):
+                    return sut.worker_autoscaling.worker_wake_alarm.metric_queries
+
+                @pulumi.runtime.test
+                def it_only_wakes_a_worker_with_nothing_desired(wake_queries):
+                    # A backlog the latency policies already scaled out to 6 tasks, with 1 running so far, must not
+                    # be set back to the floor of 2
+                    def check_queries(queries):
+                        assert queries[2]["expression"].startswith("IF(FILL(desired, 0) == 0 AND ")
+
+                    return wake_queries.apply(check_queries)
+
+                @pulumi.runtime.test
+                def it_ignores_the_lagging_running_count(wake_queries):
+                    def check_queries(queries):
+                        assert "tasks" not in [query["id"] for query in queries]
+
+                    return wake_queries.apply(check_queries)
+
+            def describe_without_a_wake_metric():
+                def it_refuses_to_guess_one(component_kwargs, pulumi_set_mocks):
+                    import strongmind_deployment.container
+                    component_kwargs.pop("worker_wake_metric_name")
+                    with pytest.raises(ValueError, match="worker_wake_metric_name"):
+                        strongmind_deployment.container.ContainerComponent("container", **component_kwargs)
+
+            @pulumi.runtime.test
+            def it_only_steps_in_while_above_the_floor(sut):
+                def check_queries(queries):
+                    assert queries[2]["expression"] == "IF(FILL(tasks, 0) > 2, latency, 61)"
+
+                return sut.worker_autoscaling.worker_autoscaling_in_alarm.metric_queries.apply(check_queries)
+
+        def describe_without_scale_to_zero():
+            @pulumi.runtime.test
+            def it_has_no_idle_or_wake_alarms(sut):
+                assert sut.worker_autoscaling.worker_idle_alarm is None
+                assert sut.worker_autoscaling.worker_wake_alarm is None
 
         def describe_when_given_a_custom_namespace():
             @pytest.fixture
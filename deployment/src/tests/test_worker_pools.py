@@ -0,0 +1,60 @@
+import pytest
+
+from strongmind_deployment.worker_pools import WorkerPool, worker_pools
+
+
+def describe_worker_pool():
+    def it_runs_sidekiq_on_its_queues_in_order():
+        pool = WorkerPool.from_dict({"name": "critical", "queues": ["critical", "mailers"]})
+
+        assert pool.command == ["sh", "-c", "bundle exec sidekiq -q critical -q mailers"]
+
+    def it_keeps_a_custom_command():
+        pool = WorkerPool.from_dict({"name": "bulk", "queues": ["bulk"], "command": ["sh", "-c", "bin/worker"]})
+
+        assert pool.command == ["sh", "-c", "bin/worker"]
+
+    def it_is_keyed_as_a_worker():
+        assert WorkerPool.from_dict({"name": "bulk", "queues": ["bulk"]}).key == "worker-bulk"
+
+    def it_only_overrides_what_it_sets():
+        pool = WorkerPool.from_dict({"name": "critical", "queues": ["critical"], "min": 2, "latency_threshold": 5})
+
+        assert pool.container_kwargs() == {
+            "command": ["sh", "-c", "bundle exec sidekiq -q critical"],
+            "worker_pool": "critical",
+            "worker_queues": ["critical"],
+            "desired_count": 2,
+            "worker_min_number_of_instances": 2,
+            "max_queue_latency_threshold": 5,
+        }
+
+    @pytest.mark.parametrize("pool, message", [
+        ({"queues": ["critical"]}, "name"),
+        ({"name": "Critical Jobs", "queues": ["critical"]}, "name"),
+        ({"name": "critical"}, "at least one queue"),
+        ({"name": "critical", "queues": ["critical"], "min": 5, "max": 2}, "min above its max"),
+    ])
+    def it_rejects_pools_that_do_not_add_up(pool, message):
+        with pytest.raises(ValueError, match=message):
+            WorkerPool.from_dict(pool)
+
+
+def describe_worker_pools():
+    def it_is_off_without_pools():
+        assert worker_pools({}) is None
+
+    def it_reads_every_pool():
+        pools = worker_pools({"worker_pools": [{"name": "critical", "queues": ["critical"]},
+                                               {"name": "bulk", "queues": ["default"]}]})
+
+        assert [pool.name for pool in pools] == ["critical", "bulk"]
+
+    def it_needs_unique_names():
+        with pytest.raises(ValueError, match="unique"):
+            worker_pools({"worker_pools": [{"name": "bulk", "queues": ["a"]}, {"name": "bulk", "queues": ["b"]}]})
+
+    def it_serves_each_queue_from_one_pool():
+        with pytest.raises(ValueError, match="only be served by one worker pool"):
+            worker_pools({"worker_pools": [{"name": "critical", "queues": ["critical", "default"]},
+                                           {"name": "bulk", "queues": ["default"]}]})